@@ -0,0 +1,256 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from .XlsxOperationException import XlsxOperationException
+from .CopyOnWriteSheets import CopyOnWriteSheets
+
+
+class CellSpecPlan:
+    """
+    This class holds the cell specifications among the names of the
+    project parameters, such as 'rsmeans/Excavation/Daily output', parsed
+    and resolved against the project data sheets. See
+    XlsxReader.modify_project_data_and_project_list() for how the cell
+    specifications are interpreted.
+
+    Every project of a sweep has the same parameter names and the same
+    project data file, so the plan is compiled once: the specifications are
+    split, the rows are found by scanning the first column of each sheet and
+    the columns are found by name. Each project then writes its values at
+    the integer row and column positions of the plan.
+
+    A specification that does not resolve is not an error until a project
+    gives it a value, because the columns of the extended project list hold
+    the specifications of all the projects. The error is kept in the plan,
+    raised by apply() for projects that give the specification a value, and
+    raised by validate() for checks made before any project runs.
+
+    Like ErectionPriceBook, this class holds a class level cache of plans.
+    Plans are keyed by the parameter names and are only reused for sheets
+    that have the same columns and the same first column values as the
+    sheets the plan was compiled from.
+    """
+
+    # This is a regex to match a parameter name that specifies a change to
+    # make to a cell.
+    cell_spec_re = re.compile('^.*/.*/.*$')
+
+    # _cache is a class attribute that holds plans keyed by the tuple of
+    # parameter names they were compiled for.
+    _cache = {}
+
+    # The maximum number of plans held at once. When it is reached, the
+    # oldest plan is evicted.
+    _max_entries = 32
+
+    def __init__(self, project_data_dataframes, parameter_names):
+        """
+        Compiles the plan.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys are sheet names and values are the project data dataframes.
+
+        parameter_names : list
+            The names of the project parameters, such as the index of the
+            project parameters series.
+        """
+        parameter_names = list(parameter_names)
+
+        # Keys are the cell specifications and values are tuples of the
+        # project list column name, or of the sheet name, row positions and
+        # column position. Cells are in the order of the parameter names.
+        self.project_list_cells = dict()
+        self.sheet_cells = dict()
+
+        # Keys are the cell specifications that do not resolve and values
+        # are the exceptions to raise.
+        self.errors = dict()
+
+        # The cell specifications in the order of the parameter names.
+        self.cell_specifications = []
+
+        # Keys are the names of the sheets the plan was compiled from. Values
+        # are their column names and first column values, or None for sheets
+        # that are missing.
+        self.sheet_keys = dict()
+
+        # Keys are sheet names and values are dicts of row names to row
+        # positions, so each sheet is scanned once.
+        row_positions = dict()
+
+        for cell_specification in parameter_names:
+            if not self.cell_spec_re.match(cell_specification):
+                continue
+            self.cell_specifications.append(cell_specification)
+
+            try:
+                dataframe_name, row_name, column_name = cell_specification.split('/')
+            except ValueError as error:
+                self.errors[cell_specification] = error
+                continue
+
+            if dataframe_name == 'project list':
+                if column_name not in parameter_names:
+                    self.errors[cell_specification] = XlsxOperationException(
+                        f'Column {column_name} not found in project parameters'
+                    )
+                else:
+                    self.project_list_cells[cell_specification] = column_name
+                continue
+
+            if dataframe_name not in project_data_dataframes:
+                self.sheet_keys[dataframe_name] = None
+                self.errors[cell_specification] = XlsxOperationException(
+                    f'Datframe {dataframe_name} not found. Please check the project_data spreadsheet and project_list.')
+                continue
+
+            df = project_data_dataframes[dataframe_name]
+            if dataframe_name not in row_positions:
+                self.sheet_keys[dataframe_name] = self.sheet_key(df)
+                row_positions[dataframe_name] = dict()
+            sheet_rows = row_positions[dataframe_name]
+            if row_name not in sheet_rows:
+                sheet_rows[row_name] = np.flatnonzero(df[df.columns[0]].to_numpy() == row_name)
+            positions = sheet_rows[row_name]
+
+            if len(positions) == 0:
+                self.errors[cell_specification] = XlsxOperationException(
+                    f'Row {row_name} not found in dataframe {dataframe_name}. '
+                    'Please check the project_data spreadsheet and project_list.')
+            elif column_name not in df.columns:
+                self.errors[cell_specification] = XlsxOperationException(
+                    f'Column {column_name} not found in dataframe {dataframe_name}. '
+                    'Please check the project_data spreadsheet and project_list.')
+            else:
+                self.sheet_cells[cell_specification] = (dataframe_name, positions, df.columns.get_loc(column_name))
+
+    @staticmethod
+    def sheet_key(df):
+        """
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            A project data sheet.
+
+        Returns
+        -------
+        tuple
+            The column names and first column values of the sheet, which are
+            all that the positions in a plan depend on.
+        """
+        return tuple(df.columns), tuple(df[df.columns[0]].tolist())
+
+    @classmethod
+    def for_project(cls, project_data_dataframes, parameter_names):
+        """
+        Returns the plan for the parameter names, compiling and caching it
+        unless a plan compiled from equivalent sheets is in the cache.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys are sheet names and values are the project data dataframes.
+
+        parameter_names : list
+            The names of the project parameters.
+
+        Returns
+        -------
+        CellSpecPlan
+            The plan.
+        """
+        key = tuple(parameter_names)
+        plan = cls._cache.get(key)
+        if plan is not None and plan.matches(project_data_dataframes):
+            return plan
+
+        plan = cls(project_data_dataframes, key)
+        cls._cache.pop(key, None)
+        if len(cls._cache) >= cls._max_entries:
+            cls._cache.pop(next(iter(cls._cache)))
+        cls._cache[key] = plan
+        return plan
+
+    def matches(self, project_data_dataframes):
+        """
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys are sheet names and values are the project data dataframes.
+
+        Returns
+        -------
+        bool
+            True if the sheets resolve the cell specifications to the same
+            positions as the sheets the plan was compiled from.
+        """
+        for dataframe_name, sheet_key in self.sheet_keys.items():
+            if dataframe_name not in project_data_dataframes:
+                if sheet_key is not None:
+                    return False
+            elif sheet_key is None or self.sheet_key(project_data_dataframes[dataframe_name]) != sheet_key:
+                return False
+        return True
+
+    def validate(self, cell_specifications=None):
+        """
+        Raises the error of the first cell specification that does not
+        resolve.
+
+        Parameters
+        ----------
+        cell_specifications : list
+            The cell specifications to check, or None to check all of them.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a sheet, row or column is not found.
+        """
+        if cell_specifications is None:
+            cell_specifications = self.cell_specifications
+        for cell_specification in cell_specifications:
+            if cell_specification in self.errors:
+                raise self.errors[cell_specification]
+
+    def apply(self, project_data_dataframes, project_parameters):
+        """
+        Writes the values of the cell specifications in the project
+        parameters to the project data dataframes and the project
+        parameters. Null values are skipped. Both are modified in place,
+        with the same results as
+        XlsxReader.modify_project_data_and_project_list()
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys are sheet names and values are the project data dataframes.
+            If it is a CopyOnWriteSheets, modified sheets are first replaced
+            with private copies.
+
+        project_parameters : pandas.Series
+            The project parameters, whose index holds the parameter names
+            the plan was compiled for.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a cell specification that has a value does not resolve.
+        """
+        for cell_specification in self.cell_specifications:
+            value = project_parameters[cell_specification]
+            if pd.isnull(value):
+                continue
+            if cell_specification in self.errors:
+                raise self.errors[cell_specification]
+
+            if cell_specification in self.project_list_cells:
+                project_parameters[self.project_list_cells[cell_specification]] = value
+            else:
+                dataframe_name, positions, column_position = self.sheet_cells[cell_specification]
+                df = CopyOnWriteSheets.writable_sheet(project_data_dataframes, dataframe_name)
+                df.iloc[positions, column_position] = value
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+
+class CopyOnWriteSheets(dict):
+    """
+    This is a dictionary of project data dataframes, keyed by sheet name,
+    whose values are shared with other users, such as the dataframes held
+    by XlsxDataframeCache or attached from shared memory by
+    SharedDataFrame.
+
+    Most of the code that receives project data sheets only reads them, so
+    copying every sheet for every project is wasted work. Instead, values
+    of this dictionary must be treated as read only, and code that modifies
+    a sheet first asks for a private copy of it with writable(). The copy
+    replaces the shared dataframe in this dictionary, so later reads see the
+    modifications, and later calls to writable() return the same copy.
+
+    Code that may receive either a plain dict or an instance of this class
+    should use CopyOnWriteSheets.writable_sheet()
+
+    The shared dataframes should be made with read_only(), like those of
+    XlsxDataframeCache and SharedDataFrame, so that code that writes to a
+    shared sheet in place without asking for writable() raises an error
+    instead of changing the sheet for every other project.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Takes the same arguments as dict(). The values are the shared
+        dataframes.
+        """
+        super().__init__(*args, **kwargs)
+
+        # Names of the sheets that have been copied
+        self.copied_sheet_names = set()
+
+    def writable(self, sheet_name):
+        """
+        Returns a dataframe for the sheet that can be modified in place
+        without affecting other users of the shared dataframe.
+
+        Parameters
+        ----------
+        sheet_name : str
+            The name of the sheet.
+
+        Returns
+        -------
+        pd.DataFrame
+            The private copy of the sheet.
+        """
+        if sheet_name not in self.copied_sheet_names:
+            self[sheet_name] = self[sheet_name].copy()
+            self.copied_sheet_names.add(sheet_name)
+        return self[sheet_name]
+
+    @staticmethod
+    def writable_sheet(sheets, sheet_name):
+        """
+        Returns a sheet that can be modified in place.
+
+        Parameters
+        ----------
+        sheets : dict
+            A plain dict of dataframes that the caller owns, or an instance
+            of CopyOnWriteSheets.
+
+        sheet_name : str
+            The name of the sheet.
+
+        Returns
+        -------
+        pd.DataFrame
+            The sheet itself for a plain dict, the private copy for an
+            instance of CopyOnWriteSheets.
+        """
+        if isinstance(sheets, CopyOnWriteSheets):
+            return sheets.writable(sheet_name)
+        return sheets[sheet_name]
+
+    @staticmethod
+    def read_only(df):
+        """
+        Makes a dataframe whose values cannot be modified in place. Writes
+        such as df.loc[0, 'Value'] = 1 raise ValueError('assignment
+        destination is read-only'). A copy made with df.copy() can be
+        modified as usual.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The dataframe to protect. It is not modified.
+
+        Returns
+        -------
+        pd.DataFrame
+            A dataframe with the same columns, dtypes and values as df. Each
+            column with a NumPy dtype is a read only array of its own.
+        """
+        if df.shape[1] == 0:
+            return df.copy()
+
+        all_series = []
+        for position in range(df.shape[1]):
+            series = df.iloc[:, position]
+            if isinstance(series.dtype, np.dtype):
+                values = series.to_numpy(copy=True)
+                values.flags.writeable = False
+                series = pd.Series(values, index=df.index, name=series.name, copy=False)
+            all_series.append(series)
+
+        # Concatenating the columns without copying keeps one block per
+        # column, so the columns remain the read only arrays.
+        return pd.concat(all_series, axis=1, copy=False)
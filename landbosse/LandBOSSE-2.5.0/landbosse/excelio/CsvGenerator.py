@@ -6,6 +6,30 @@ class CsvGenerator:
     This class generates CSV files.
     """
 
+    # The columns of the details and costs .csv files, in order. Dataframes
+    # always have all of these columns, so that dataframes for different
+    # projects can be appended to the same .csv file.
+    details_columns = [
+        "Project ID with serial",
+        "Module",
+        "Variable name",
+        "Unit",
+        "Numeric value",
+        "Non-numeric value",
+    ]
+
+    costs_columns = [
+        "Project ID with serial",
+        "Number of turbines",
+        "Turbine rating MW",
+        "Rotor diameter m",
+        "Module",
+        "Type of cost",
+        "Cost per turbine",
+        "Cost per project",
+        "Cost per kW",
+    ]
+
     def __init__(self, file_ops):
         """
         Parameters
@@ -55,7 +79,7 @@ class CsvGenerator:
 
             details_to_write_to_csv.append(new_row)
 
-        details = pd.DataFrame(details_to_write_to_csv)
+        details = pd.DataFrame(details_to_write_to_csv, columns=self.details_columns)
 
         return details
 
@@ -85,7 +109,7 @@ class CsvGenerator:
                 "Cost per kW": row["usd_per_kw_per_project"]
             }
             new_rows.append(new_row)
-        costs_df = pd.DataFrame(new_rows)
+        costs_df = pd.DataFrame(new_rows, columns=self.costs_columns)
         return costs_df
 
     def _is_numeric(self, value):
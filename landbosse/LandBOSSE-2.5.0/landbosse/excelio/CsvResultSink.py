@@ -0,0 +1,89 @@
+import os
+
+from .CsvGenerator import CsvGenerator
+
+
+class CsvResultSink:
+    """
+    This class writes the results of a run to landbosse-costs.csv and
+    landbosse-details.csv one project at a time, as the projects finish,
+    so that the results of all the projects of a large sweep never need to
+    be in memory at the same time.
+
+    Only the cost rows (for validation and the costs tab of the output
+    .xlsx) are kept in memory, because they are much smaller than the
+    details rows.
+
+    Use it as a context manager:
+
+    with CsvResultSink(file_ops) as sink:
+        for project_result in ...:
+            sink.add_project(project_result)
+    """
+
+    costs_csv_basename = 'landbosse-costs.csv'
+    details_csv_basename = 'landbosse-details.csv'
+
+    def __init__(self, file_ops):
+        """
+        Parameters
+        ----------
+        file_ops : XlsxFileOperations
+            An instance of XlsxFileOperations to manage file names.
+        """
+        self.file_ops = file_ops
+        self.csv_generator = CsvGenerator(file_ops)
+        self.costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), self.costs_csv_basename)
+        self.details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), self.details_csv_basename)
+        self.costs_file = None
+        self.details_file = None
+
+        # The cost rows of all the projects added so far.
+        self.module_type_operation_list = []
+
+        # The number of details rows written so far.
+        self.details_row_count = 0
+
+    def __enter__(self):
+        """
+        Opens both .csv files, replacing any previous contents, and writes
+        their headers.
+
+        Returns
+        -------
+        CsvResultSink
+            This instance.
+        """
+        self.costs_file = open(self.costs_csv_filename, 'w', newline='')
+        self.details_file = open(self.details_csv_filename, 'w', newline='')
+        self.csv_generator.create_costs_dataframe([]).to_csv(self.costs_file, index=False)
+        self.csv_generator.create_details_dataframe([]).to_csv(self.details_file, index=False)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Closes both .csv files.
+        """
+        self.costs_file.close()
+        self.details_file.close()
+
+    def add_project(self, project_result):
+        """
+        Appends the rows of one project to the .csv files.
+
+        Parameters
+        ----------
+        project_result : dict
+            Has the key 'details_list' with the details rows, as returned
+            by XlsxManagerRunner.extract_details_lists(), and the key
+            'module_type_operation_list' with the cost rows, as returned by
+            XlsxManagerRunner.extract_module_type_operation_lists()
+        """
+        costs = project_result['module_type_operation_list']
+        details = project_result['details_list']
+
+        self.module_type_operation_list.extend(costs)
+        self.details_row_count += len(details)
+
+        self.csv_generator.create_costs_dataframe(costs).to_csv(self.costs_file, index=False, header=False)
+        self.csv_generator.create_details_dataframe(details).to_csv(self.details_file, index=False, header=False)
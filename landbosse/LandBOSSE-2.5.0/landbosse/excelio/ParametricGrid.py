@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+
+class ParametricGrid:
+    """
+    This class computes points in an N-dimensional parametric search space
+    without building them all in memory. It replaces GridSearchTree, which
+    built a tree with a leaf for every point and traversed it into a list.
+
+    Each row of the parametric list of a project is an axis of the grid.
+    A point is identified by its index, which is a mixed radix number whose
+    digits are the indices of the values on each axis. The radix of each
+    digit is the number of values on its axis. The last axis varies the
+    fastest, so points are numbered in the same order as the depth first
+    traversal of that tree:
+
+    | index | alpha/fizz/buzz | beta/foo/bar |
+    |-------|-----------------|--------------|
+    | 0     | 0               | 0            |
+    | 1     | 0               | 6            |
+    | 2     | 0               | 12           |
+    | 3     | 6               | 0            |
+    | ...   | ...             | ...          |
+
+    Any point can be computed from its index alone, so a sweep can be
+    streamed point by point or split into index ranges. An axis without
+    any values makes the grid empty.
+    """
+
+    def __init__(self, parametric_list):
+        """
+        Reads the axes from the parametric list. See the first dataframe
+        described in the docstring of XlsxReader.create_parametric_value_list()
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The rows of the parametric list for one project.
+        """
+        self.cell_specifications = []
+        self.axis_values = []
+
+        for _, row in parametric_list.iterrows():
+            self.cell_specifications.append(f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}")
+
+            # Putting the stop at end + step ensures the end value is in the sequence
+            if 'Value list' in row and not pd.isnull(row['Value list']):
+                values = np.array([float(value) for value in str(row['Value list']).split(',')])
+            else:
+                values = np.arange(row['Min'], row['Max'] + row['Step'], row['Step'])
+            self.axis_values.append(values)
+
+        # The stride of an axis is the number of points between consecutive
+        # values on that axis.
+        self.radices = [len(values) for values in self.axis_values]
+        self.strides = []
+        stride = 1
+        for radix in reversed(self.radices):
+            self.strides.insert(0, stride)
+            stride *= radix
+        self.size = stride if len(self.radices) > 0 else 0
+
+    def __len__(self):
+        """
+        Returns
+        -------
+        int
+            The number of points in the grid.
+        """
+        return self.size
+
+    def axis_indices(self, index):
+        """
+        Decodes the index of a point into the indices of its values on each
+        axis.
+
+        Parameters
+        ----------
+        index : int
+            The index of the point. It must be between 0 and len(self) - 1
+
+        Returns
+        -------
+        list
+            The index of the value on each axis.
+
+        Raises
+        ------
+        IndexError
+            If the index is outside of the grid.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f'Grid point {index} is outside a grid of {self.size} points.')
+        return [(index // stride) % radix for stride, radix in zip(self.strides, self.radices)]
+
+    def grid_point(self, index):
+        """
+        Computes the point with the given index.
+
+        Parameters
+        ----------
+        index : int
+            The index of the point. It must be between 0 and len(self) - 1
+
+        Returns
+        -------
+        dict
+            Keys are cell specifications and values are the parametric
+            values of the point.
+        """
+        axis_indices = self.axis_indices(index)
+        return {
+            cell_specification: values[axis_index]
+            for cell_specification, values, axis_index in zip(self.cell_specifications, self.axis_values, axis_indices)
+        }
+
+    def grid_points(self, start=0, stop=None):
+        """
+        Generates the points with indices from start up to but not
+        including stop.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first point.
+
+        stop : int
+            One past the index of the last point. If None, the points run
+            to the end of the grid.
+
+        Yields
+        ------
+        dict
+            See grid_point()
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        for index in range(start, stop):
+            yield self.grid_point(index)
+
+    def grid_values(self, start=0, stop=None):
+        """
+        Computes the values of a range of points as columns, which is much
+        faster than calling grid_point() for every point.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first point.
+
+        stop : int
+            One past the index of the last point. If None, the points run
+            to the end of the grid.
+
+        Returns
+        -------
+        dict
+            Keys are cell specifications and values are arrays with the
+            values of each point in the range.
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        indices = np.arange(start, max(start, stop))
+        return {
+            cell_specification: values[(indices // stride) % radix]
+            for cell_specification, values, stride, radix in
+            zip(self.cell_specifications, self.axis_values, self.strides, self.radices)
+        }
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from .XlsxOperationException import XlsxOperationException
+
+
+class ParametricSample:
+    """
+    This class computes a sample of points in an N-dimensional parametric
+    search space. It is used instead of ParametricGrid when a full
+    factorial grid would have too many points, such as in sensitivity
+    studies with many parameters.
+
+    A project selects sampling in its rows of the Parametric list sheet
+    with these optional columns:
+
+    'Sampling': One of 'grid', 'latin hypercube', 'sobol' or 'random'.
+        'grid' or a blank cell means a full factorial ParametricGrid.
+        'sobol' is a scrambled Sobol sequence.
+
+    'Sample count': The number of points in the sample. A Sobol sample
+        loses its balance properties unless its count is a power of 2, so
+        'sobol' needs a count such as 64, 128 or 256.
+
+    'Seed': The seed of the random number generator. Defaults to 0, so
+        a sample is the same every time it is computed. This is necessary
+        when a sweep is split into several runs with --project-range.
+
+    Only the first value in each of these columns for a project is used.
+
+    Each row of the parametric list of the project is an axis of the
+    sample. If the row has a Value list, each point takes one of the values
+    in the list. Otherwise each point takes a value between Min and Max,
+    and Step is ignored.
+
+    This class has the same interface as ParametricGrid, so points can be
+    computed by index in the same way.
+    """
+
+    sampling_modes = ['latin hypercube', 'sobol', 'random']
+
+    def __init__(self, parametric_list):
+        """
+        Reads the axes and sampling options from the parametric list and
+        draws the sample.
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The rows of the parametric list for one project.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the sampling mode is unknown, the sample count is missing or
+            the sample count of a Sobol sample is not a power of 2.
+        """
+        self.sampling = str(self.first_value(parametric_list, 'Sampling')).strip().lower()
+        if self.sampling not in self.sampling_modes:
+            raise XlsxOperationException(
+                f"Sampling {self.sampling} is not one of grid, {', '.join(self.sampling_modes)}. Please check the Parametric list.")
+
+        sample_count = self.first_value(parametric_list, 'Sample count')
+        if sample_count is None:
+            raise XlsxOperationException(f'Sampling {self.sampling} needs a Sample count. Please check the Parametric list.')
+        self.size = int(sample_count)
+        if self.sampling == 'sobol' and (self.size < 1 or self.size & (self.size - 1) != 0):
+            lower = 1 << max(self.size.bit_length() - 1, 0)
+            raise XlsxOperationException(
+                f'Sampling sobol needs a Sample count that is a power of 2, such as {lower} or {lower * 2}, '
+                f'not {self.size}. Please check the Parametric list.')
+
+        seed = self.first_value(parametric_list, 'Seed')
+        self.seed = 0 if seed is None else int(seed)
+
+        self.cell_specifications = []
+        self.axis_value_lists = []
+        self.axis_ranges = []
+        for _, row in parametric_list.iterrows():
+            self.cell_specifications.append(f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}")
+            if 'Value list' in row and not pd.isnull(row['Value list']):
+                self.axis_value_lists.append(np.array([float(value) for value in str(row['Value list']).split(',')]))
+                self.axis_ranges.append(None)
+            else:
+                self.axis_value_lists.append(None)
+                self.axis_ranges.append((float(row['Min']), float(row['Max'])))
+
+        self.unit_sample = self.draw_unit_sample(len(self.cell_specifications))
+
+    @staticmethod
+    def first_value(parametric_list, column):
+        """
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The rows of the parametric list for one project.
+
+        column : str
+            The column name.
+
+        Returns
+        -------
+        object
+            The first value in the column that is not blank, or None if the
+            column is missing or blank.
+        """
+        if column not in parametric_list.columns:
+            return None
+        values = parametric_list[column].dropna()
+        return values.iloc[0] if len(values) > 0 else None
+
+    def draw_unit_sample(self, dimensions):
+        """
+        Draws the sample in the unit hypercube.
+
+        Parameters
+        ----------
+        dimensions : int
+            The number of axes.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array with a row for each point and a column for each axis. All
+            values are in [0, 1).
+        """
+        if self.sampling == 'latin hypercube':
+            return qmc.LatinHypercube(d=dimensions, seed=self.seed).random(self.size)
+        elif self.sampling == 'sobol':
+            return qmc.Sobol(d=dimensions, scramble=True, seed=self.seed).random(self.size)
+        else:
+            return np.random.default_rng(self.seed).random((self.size, dimensions))
+
+    def __len__(self):
+        """
+        Returns
+        -------
+        int
+            The number of points in the sample.
+        """
+        return self.size
+
+    def grid_values(self, start=0, stop=None):
+        """
+        Computes the values of a range of points as columns.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first point.
+
+        stop : int
+            One past the index of the last point. If None, the points run
+            to the end of the sample.
+
+        Returns
+        -------
+        dict
+            Keys are cell specifications and values are arrays with the
+            values of each point in the range.
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        unit_sample = self.unit_sample[start:max(start, stop)]
+        result = dict()
+        for axis, cell_specification in enumerate(self.cell_specifications):
+            unit_values = unit_sample[:, axis]
+            value_list = self.axis_value_lists[axis]
+            if value_list is not None:
+                result[cell_specification] = value_list[np.minimum((unit_values * len(value_list)).astype(int), len(value_list) - 1)]
+            else:
+                low, high = self.axis_ranges[axis]
+                result[cell_specification] = low + unit_values * (high - low)
+        return result
+
+    def grid_point(self, index):
+        """
+        Computes the point with the given index.
+
+        Parameters
+        ----------
+        index : int
+            The index of the point. It must be between 0 and len(self) - 1
+
+        Returns
+        -------
+        dict
+            Keys are cell specifications and values are the parametric
+            values of the point.
+
+        Raises
+        ------
+        IndexError
+            If the index is outside of the sample.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f'Sample point {index} is outside a sample of {self.size} points.')
+        return {cell_specification: values[0] for cell_specification, values in self.grid_values(index, index + 1).items()}
+
+    def grid_points(self, start=0, stop=None):
+        """
+        Generates the points with indices from start up to but not
+        including stop.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first point.
+
+        stop : int
+            One past the index of the last point. If None, the points run
+            to the end of the sample.
+
+        Yields
+        ------
+        dict
+            See grid_point()
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        for index in range(start, stop):
+            yield self.grid_point(index)
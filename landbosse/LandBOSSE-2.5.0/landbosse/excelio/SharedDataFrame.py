@@ -0,0 +1,188 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+# Worker processes keep the shared memory blocks they have attached to, and
+# the read only dataframes built on them, for the lifetime of the process.
+# Keys are shared memory block names.
+_attached_dataframes = {}
+
+
+class SharedDataFrame:
+    """
+    This class places a dataframe in a multiprocessing.shared_memory block
+    so that worker processes of a ProcessPoolExecutor can attach to it by
+    name instead of receiving a pickled copy with every task.
+
+    The parent process creates an instance, passes the small, picklable
+    descriptor attribute to the workers, and calls close() when all the
+    workers are finished. Workers call SharedDataFrame.attach(descriptor)
+    to get a dataframe whose columns are read only NumPy views on the
+    shared memory block.
+
+    Columns are stored according to their dtype:
+
+    - Numeric and boolean columns are stored as they are and are zero
+      copy views in the workers.
+
+    - Categorical columns are stored as their integer codes, which are zero
+      copy views in the workers. The categories travel in the descriptor.
+
+    - Timezone aware datetime columns are stored as naive UTC datetimes.
+      Workers localize them again, which makes a copy.
+
+    - Other columns (usually strings) are stored as codes into a list of
+      unique values that travels in the descriptor. Workers rebuild them
+      as object columns, which makes a copy. Convert large string columns
+      to categoricals before sharing to avoid this.
+
+    Views are marked read only, so an attempt to modify a shared dataframe
+    in place raises a ValueError instead of corrupting the data seen by the
+    other workers.
+    """
+
+    # Offsets of columns in the shared memory block are aligned to this
+    # many bytes.
+    alignment = 8
+
+    def __init__(self, df):
+        """
+        Copies the dataframe into a new shared memory block.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The dataframe to share.
+        """
+        columns = []
+        arrays = []
+        offset = 0
+        for name, series in df.items():
+            column = {'name': name}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                column['kind'] = 'categorical'
+                column['categories'] = series.cat.categories
+                column['ordered'] = series.cat.ordered
+                array = series.cat.codes.to_numpy()
+            elif isinstance(series.dtype, pd.DatetimeTZDtype):
+                column['kind'] = 'datetimetz'
+                column['tz'] = series.dt.tz
+                array = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+            elif series.dtype.kind in 'biufcmM':
+                column['kind'] = 'numeric'
+                array = series.to_numpy()
+            else:
+                column['kind'] = 'object'
+                codes, uniques = pd.factorize(series.to_numpy(), use_na_sentinel=True)
+                column['uniques'] = np.asarray(uniques, dtype=object)
+                array = codes
+
+            array = np.ascontiguousarray(array)
+            offset = -(-offset // self.alignment) * self.alignment
+            column['dtype'] = array.dtype.str
+            column['offset'] = offset
+            offset += array.nbytes
+            columns.append(column)
+            arrays.append(array)
+
+        # A shared memory block cannot have a size of 0
+        self.shared_memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for column, array in zip(columns, arrays):
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=self.shared_memory.buf, offset=column['offset'])
+            view[:] = array
+
+        if isinstance(df.index, pd.RangeIndex):
+            index = ('range', df.index.start, df.index.stop, df.index.step)
+        else:
+            index = ('values', df.index.to_numpy())
+
+        self.descriptor = {
+            'name': self.shared_memory.name,
+            'length': len(df),
+            'index': index,
+            'columns': columns,
+        }
+
+    def close(self):
+        """
+        Releases and removes the shared memory block. Call this in the parent
+        process once no worker needs the dataframe anymore.
+        """
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Attaches to a shared memory block by name and builds a dataframe
+        of read only views on it. The shared memory block and the dataframe
+        are kept for the lifetime of the calling process, so repeated
+        attachments in the same worker cost nothing.
+
+        The returned dataframe is a shallow copy: replacing or adding
+        columns does not affect other callers. Writing values in place
+        raises a ValueError because the views are read only.
+
+        Parameters
+        ----------
+        descriptor : dict
+            The descriptor attribute of a SharedDataFrame created in the
+            parent process.
+
+        Returns
+        -------
+        pd.DataFrame
+            The dataframe backed by shared memory.
+        """
+        name = descriptor['name']
+        if name not in _attached_dataframes:
+            block = shared_memory.SharedMemory(name=name)
+            _attached_dataframes[name] = (block, cls._build_dataframe(block, descriptor))
+        _, df = _attached_dataframes[name]
+        return df.copy(deep=False)
+
+    @staticmethod
+    def _build_dataframe(block, descriptor):
+        """
+        Builds the dataframe of views described by descriptor on the
+        shared memory block.
+
+        Parameters
+        ----------
+        block : multiprocessing.shared_memory.SharedMemory
+            The attached shared memory block.
+
+        descriptor : dict
+            See attach()
+
+        Returns
+        -------
+        pd.DataFrame
+            The dataframe.
+        """
+        length = descriptor['length']
+        kind, *index_args = descriptor['index']
+        index = pd.RangeIndex(*index_args) if kind == 'range' else pd.Index(index_args[0])
+
+        all_series = []
+        for column in descriptor['columns']:
+            view = np.ndarray((length,), dtype=np.dtype(column['dtype']), buffer=block.buf, offset=column['offset'])
+            view.flags.writeable = False
+            if column['kind'] == 'categorical':
+                values = pd.Categorical.from_codes(view, categories=column['categories'], ordered=column['ordered'])
+            elif column['kind'] == 'datetimetz':
+                values = pd.Series(view).dt.tz_localize('UTC').dt.tz_convert(column['tz']).array
+            elif column['kind'] == 'object':
+                values = np.where(view < 0, np.nan, column['uniques'].take(np.maximum(view, 0)))
+            else:
+                values = view
+            all_series.append(pd.Series(values, index=index, name=column['name'], copy=False))
+
+        if len(all_series) == 0:
+            return pd.DataFrame(index=index)
+
+        # Concatenating the columns without copying keeps one block per
+        # column, so the numeric columns remain views on shared memory.
+        return pd.concat(all_series, axis=1, copy=False)
@@ -1,7 +1,10 @@
 from math import ceil
 
+import numpy as np
 import pandas as pd
 
+from .CopyOnWriteSheets import CopyOnWriteSheets
+
 
 SEASON_WINTER = 'winter'
 SEASON_SPRING = 'spring'
@@ -24,6 +27,23 @@ month_numbers_to_seasons = {
     12: SEASON_FALL
 }
 
+# Seasons indexed by month number, and time windows indexed by 1 for hours
+# between 8 and 18 inclusive and 0 otherwise.
+_seasons_by_month = np.array([None] + [month_numbers_to_seasons[month] for month in range(1, 13)], dtype=object)
+_time_windows_by_code = np.array(['long', 'normal'], dtype=object)
+
+# The format of the dates of a weather_window sheet that are not parsed by
+# Excel, such as 2012-01-01 00:00:00, optionally followed by a UTC offset.
+weather_window_date_format = '%Y-%m-%d %H:%M:%S'
+
+# Weather windows returned by read_weather_window(). Keys are the id() of the
+# weather_window sheet and the local timezone. Values are the sheet and the
+# read only weather window.
+_weather_window_cache = {}
+
+# The maximum number of weather windows held at once.
+_max_cached_weather_windows = 32
+
 
 def read_weather_window(weather_data, local_timezone='America/Denver'):
     """
@@ -71,6 +91,12 @@ def read_weather_window(weather_data, local_timezone='America/Denver'):
 
     'Speed m per s': Wind speed in meters per second.
 
+    The weather window of a sheet is parsed once and cached. Later calls
+    with the same dataframe return the same weather window, so the sheet
+    must be treated as read only. The values of the weather window are read
+    only (see CopyOnWriteSheets.read_only()), so code that needs to modify
+    it must modify a copy.
+
     Parameters
     ----------
     filename : str
@@ -86,6 +112,72 @@ def read_weather_window(weather_data, local_timezone='America/Denver'):
     pd.DataFrame
         A pandas data frame made from the CSV
     """
+    key = (id(weather_data), local_timezone)
+    if key in _weather_window_cache:
+        return _weather_window_cache[key][1]
+
+    result = parse_weather_window(weather_data, local_timezone)
+    return store_weather_window(weather_data, result, local_timezone)
+
+
+def store_weather_window(weather_data, weather_window, local_timezone='America/Denver'):
+    """
+    Places a weather window in the cache of read_weather_window(), so that
+    reading the weather_data dataframe returns it. XlsxDataframeCache uses
+    this for weather windows it loads from its disk cache.
+
+    When the cache is full, the oldest weather window is evicted.
+
+    Parameters
+    ----------
+    weather_data : pd.DataFrame
+        The weather_window sheet. It must not be modified afterward.
+
+    weather_window : pd.DataFrame
+        The weather window returned by parse_weather_window() for the sheet.
+
+    local_timezone : str
+        The local timezone the weather window was parsed with.
+
+    Returns
+    -------
+    pd.DataFrame
+        The read only copy of the weather window that read_weather_window()
+        returns for the sheet.
+    """
+    if len(_weather_window_cache) >= _max_cached_weather_windows:
+        _weather_window_cache.pop(next(iter(_weather_window_cache)))
+
+    # The sheet is kept with the weather window so that its id is not
+    # reused while the weather window is cached.
+    weather_window = CopyOnWriteSheets.read_only(weather_window)
+    _weather_window_cache[(id(weather_data), local_timezone)] = (weather_data, weather_window)
+    return weather_window
+
+
+def parse_weather_window(weather_data, local_timezone='America/Denver'):
+    """
+    Parses a wind toolkit formatted dataframe without the cache. See
+    read_weather_window() for the format and the returned columns.
+
+    The local month, day and hour are computed from one conversion of the
+    dates to local time, and the time windows and seasons are looked up
+    from those integers with arrays instead of mapped through dictionaries
+    one value at a time.
+
+    Parameters
+    ----------
+    weather_data : pd.DataFrame
+        The weather_window sheet.
+
+    local_timezone : str
+        The local timezone.
+
+    Returns
+    -------
+    pd.DataFrame
+        The weather window.
+    """
     # set column names for weather data and keep only the renamed columns
     column_names = weather_data[4:].columns
     renamed_columns = {
@@ -99,32 +191,48 @@ def read_weather_window(weather_data, local_timezone='America/Denver'):
     weather_data = weather_data.reset_index(drop=True)
     weather_data = weather_data[renamed_columns.values()]
 
-    # Parse the datetime data and localize it to UTC. If the timestamp does not contain 
-    # a timestamp, assume it is in UTC and process with tz_localize. If it contains a 
-    # timestamp, assume it is in UTC and use tz_convert.
-    try:
-        weather_data['Date UTC'] = pd.to_datetime(weather_data['Date UTC']).dt.tz_localize('UTC')
-    except TypeError as err:
-        weather_data['Date UTC'] = pd.to_datetime(weather_data['Date UTC']).dt.tz_convert('UTC')
+    # Localize the dates to UTC. Dates parsed by Excel are already
+    # datetimes, and only need the time zone. Otherwise parse them with
+    # weather_window_date_format. If the timestamp does not contain a time
+    # zone, assume it is in UTC and process with tz_localize. If it contains
+    # a time zone, assume it is in UTC and use tz_convert.
+    dates = weather_data['Date UTC']
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format=weather_window_date_format)
+    if pd.api.types.is_datetime64tz_dtype(dates):
+        weather_data['Date UTC'] = dates.dt.tz_convert('UTC')
+    else:
+        weather_data['Date UTC'] = dates.dt.tz_localize('UTC')
 
     # Convert UTC to local time
     weather_data['Date'] = weather_data['Date UTC'].dt.tz_convert(local_timezone)
 
-    # Extract month, day, hour from the local date
-    weather_data['Month'] = weather_data['Date'].dt.month
-    weather_data['Day'] = weather_data['Date'].dt.day
-    weather_data['Hour'] = weather_data['Date'].dt.hour
-
-    # The original date columns are now redundant. Drop them.
-    weather_data.drop(columns=['Date', 'Date UTC'])
-
-    # create time window for normal (8am to 6pm) versus long (24 hour) time window for operation
-    weather_data['Time window'] = weather_data['Hour'].between(8, 18, inclusive='both')
-    boolean_dictionary = {True: 'normal', False: 'long'}
-    weather_data['Time window'] = weather_data['Time window'].map(boolean_dictionary)
-
-    # Add a seasons column
-    weather_data['Season'] = weather_data['Month'].map(month_numbers_to_seasons)
+    # Extract month, day, hour from the local wall clock times. Missing
+    # dates make the month, day and hour NaN, so they are extracted with
+    # the dt accessors instead.
+    local_times = weather_data['Date'].dt.tz_localize(None).to_numpy()
+    if np.isnat(local_times).any():
+        weather_data['Month'] = weather_data['Date'].dt.month
+        weather_data['Day'] = weather_data['Date'].dt.day
+        weather_data['Hour'] = weather_data['Date'].dt.hour
+        weather_data['Time window'] = weather_data['Hour'].between(8, 18, inclusive='both')
+        weather_data['Time window'] = weather_data['Time window'].map({True: 'normal', False: 'long'})
+        weather_data['Season'] = weather_data['Month'].map(month_numbers_to_seasons)
+    else:
+        local_months = local_times.astype('datetime64[M]')
+        local_days = local_times.astype('datetime64[D]')
+        months = local_months.astype(np.int64) % 12 + 1
+        hours = (local_times.astype('datetime64[h]') - local_days.astype('datetime64[h]')).astype(np.int64)
+        weather_data['Month'] = months
+        weather_data['Day'] = (local_days - local_months.astype('datetime64[D]')).astype(np.int64) + 1
+        weather_data['Hour'] = hours
+
+        # create time window for normal (8am to 6pm) versus long (24 hour) time window for operation
+        time_window_codes = ((hours >= 8) & (hours <= 18)).astype(np.intp)
+        weather_data['Time window'] = _time_windows_by_code[time_window_codes]
+
+        # Add a seasons column
+        weather_data['Season'] = _seasons_by_month[months]
 
     # Cast the columns that are numeric to float64
     columns_to_cast = ['Pressure atm', 'Direction deg', 'Speed m per s']
@@ -149,7 +257,10 @@ def extend_weather_window(weather_window_df, months_of_weather_data_needed):
     a multiple of the number of rows in the original data frame.
 
     If rows are added to the weather window, they are added to a new dataframe.
-    The weather window is not modified in place.
+    The weather window is not modified in place. The new dataframe is built
+    column by column by tiling the row positions of the original, and has
+    the same dtypes as if it had been built from a list of row dicts: float32
+    columns become float64 and object columns have their dtypes inferred.
 
     Parameters
     ----------
@@ -176,8 +287,15 @@ def extend_weather_window(weather_window_df, months_of_weather_data_needed):
         return weather_window_df
 
     number_of_windows_needed = int(ceil(hours_of_weather_data_needed / hours_of_weather_data_available))
-    weather_window_as_list = weather_window_df.to_dict(orient='records')
-    weather_window_repeated_as_list = weather_window_as_list * number_of_windows_needed
-    result = pd.DataFrame(weather_window_repeated_as_list)
+    positions = np.tile(np.arange(hours_of_weather_data_available), number_of_windows_needed)
+    result = weather_window_df.take(positions).reset_index(drop=True)
+
+    # Row dicts hold Python floats, so float32 columns come back as float64.
+    # Object columns are inferred, like the columns of a new dataframe.
+    for column, dtype in result.dtypes.items():
+        if dtype == np.float32:
+            result[column] = result[column].astype(np.float64)
+        elif dtype == object:
+            result[column] = result[column].infer_objects()
 
     return result
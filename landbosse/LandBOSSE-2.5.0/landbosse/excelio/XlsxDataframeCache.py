@@ -1,7 +1,12 @@
+import hashlib
 import os
+import pickle
+
 import pandas as pd
 
 from .XlsxFileOperations import XlsxFileOperations
+from .CopyOnWriteSheets import CopyOnWriteSheets
+from .WeatherWindowCSVReader import parse_weather_window, store_weather_window
 
 class XlsxDataframeCache:
     """
@@ -20,25 +25,55 @@ class XlsxDataframeCache:
 
     Regardless of which executor is used, care must be taken that one thread
     or process cannot mutate the dataframes of another process. So, this
-    class make copies of dataframes so the callables running from the
-    executor cannot overwrite each other's data.
+    class returns the dataframes in a CopyOnWriteSheets, and code that
+    modifies a sheet gets its own copy of that sheet from it. The other
+    sheets are shared with the cache, and their values are made read only
+    with CopyOnWriteSheets.read_only(), so a write that bypasses
+    CopyOnWriteSheets.writable() raises an error instead of changing the
+    sheet for the projects that read it later.
+
+    Parsing .xlsx files with openpyxl is slow, so the parsed sheets can
+    also be stored on disk in pickle files. The disk cache is disabled
+    unless a folder is given with --dataframe-cache or LANDBOSSE_CACHE_DIR
+    (see XlsxFileOperations.dataframe_cache_dir()), and it is never read
+    from or written to the input folder or the folder of the .xlsx, since
+    loading a pickle runs code from it. A new process loads the pickle
+    instead of parsing the .xlsx again. Both the in memory and the disk
+    caches are invalidated when the .xlsx changes: a change to the size or
+    modification time of the file causes its SHA1 hash to be computed,
+    and the sheets are parsed again if the hash differs from the one
+    stored with the cached sheets. If the cache folder cannot be written,
+    the .xlsx is simply parsed every time a new process needs it.
+
+    The weather_window sheet of a project data file is also processed by
+    read_weather_window() when the file is parsed, and the processed
+    weather window is stored in the disk cache with the sheets. When the
+    sheets are loaded, the processed weather window is placed in the cache
+    of read_weather_window(), so a new process does not process it again.
     """
 
     # _cache is a class attribute that holds the cache of sheets and their
-    # dataframes
+    # dataframes. Keys are basenames, values are dictionaries with the
+    # keys 'filename', 'signature', 'sha1' and 'sheets'.
     _cache = {}
 
+    # Increment this when the format of the disk cache changes, so that
+    # existing cache files are ignored.
+    persistent_cache_version = 2
+
     @classmethod
     def read_all_sheets_from_xlsx(cls, xlsx_basename, xlsx_path=None):
         """
         If the .xlsx file specified by .xlsx_basename has been read before
-        (meaning it is stored as a key on cls._cache), a copy of all the
-        dataframes stored under that sheet name is returned. See the note
-        about copying in the class docstring for why copies are being made.
+        (meaning it is stored as a key on cls._cache), the dataframes stored
+        under that basename are returned in a CopyOnWriteSheets. See the
+        note about copying in the class docstring.
 
-        If the xlsx_basename has not been read before, all the sheets are
-        read and copies are returned. The sheets are stored on the dictionary
-        cache.
+        If the xlsx_basename has not been read before, or the .xlsx file has
+        changed since it was read, all the sheets are read from the disk
+        cache or, if that is not valid, parsed from the .xlsx. The sheets
+        are stored on the dictionary cache and returned in a
+        CopyOnWriteSheets.
 
         Parameters
         ----------
@@ -56,15 +91,11 @@ class XlsxDataframeCache:
 
         Returns
         -------
-        dict
+        CopyOnWriteSheets
             A dictionary of dataframes. Keys on the dictionary are names of
             sheets and values in the dictionary are dataframes in that
             .xlsx file.
         """
-        if xlsx_basename in cls._cache:
-            original = cls._cache[xlsx_basename]
-            return cls.copy_dataframes(original)
-
         file_ops = XlsxFileOperations()
 
         if xlsx_path is None:
@@ -72,28 +103,223 @@ class XlsxDataframeCache:
         else:
             xlsx_filename = os.path.join(xlsx_path, f'{xlsx_basename}.xlsx')
 
-        xlsx = pd.ExcelFile(xlsx_filename, engine='openpyxl')
-        sheets_dict = {sheet_name: xlsx.parse(sheet_name) for sheet_name in xlsx.sheet_names}
-        for sheet_name in xlsx.sheet_names:
-            sheets_dict[sheet_name].dropna(inplace=True, how='all')
-        cls._cache[xlsx_basename] = sheets_dict
-        return cls.copy_dataframes(sheets_dict)
+        signature = cls.file_signature(xlsx_filename)
+
+        if xlsx_basename in cls._cache:
+            entry = cls._cache[xlsx_basename]
+            if entry['filename'] == xlsx_filename and entry['signature'] == signature:
+                return CopyOnWriteSheets(entry['sheets'])
+
+            # The file was touched. Only parse it again if its contents changed.
+            sha1 = cls.file_sha1(xlsx_filename)
+            if entry['filename'] == xlsx_filename and entry['sha1'] == sha1:
+                entry['signature'] = signature
+                return CopyOnWriteSheets(entry['sheets'])
+        else:
+            sha1 = None
+
+        entry = cls.read_persistent_cache(xlsx_filename, signature, sha1)
+        if entry is None:
+            xlsx = pd.ExcelFile(xlsx_filename, engine='openpyxl')
+            sheets_dict = {sheet_name: xlsx.parse(sheet_name) for sheet_name in xlsx.sheet_names}
+            for sheet_name in xlsx.sheet_names:
+                sheets_dict[sheet_name] = CopyOnWriteSheets.read_only(sheets_dict[sheet_name].dropna(how='all'))
+            entry = {
+                'filename': xlsx_filename,
+                'signature': signature,
+                'sha1': sha1 if sha1 is not None else cls.file_sha1(xlsx_filename),
+                'sheets': sheets_dict,
+                'weather_window': cls.process_weather_window(sheets_dict)
+            }
+            cls.write_persistent_cache(entry)
+        else:
+            # Pickles do not keep the arrays read only.
+            entry['sheets'] = {
+                sheet_name: CopyOnWriteSheets.read_only(df) for sheet_name, df in entry['sheets'].items()
+            }
+            if entry.get('weather_window') is not None:
+                entry['weather_window'] = store_weather_window(entry['sheets']['weather_window'],
+                                                               entry['weather_window'])
+
+        cls._cache[xlsx_basename] = entry
+        return CopyOnWriteSheets(entry['sheets'])
 
     @classmethod
-    def copy_dataframes(cls, dict_of_dataframes):
+    def process_weather_window(cls, sheets_dict):
         """
-        This copies a dictionary of dataframes. See the class docstring for an
-        explanation of why this copying is taking place.
+        Processes the weather_window sheet, if there is one, with
+        read_weather_window() so that it is cached with the sheets.
 
         Parameters
         ----------
-        dict_of_dataframes : dict
-            The dictionary of dataframes to copy.
+        sheets_dict : dict
+            The sheets of an .xlsx file.
+
+        Returns
+        -------
+        pd.DataFrame
+            The processed weather window, or None if there is no
+            weather_window sheet or it cannot be processed. A sheet that
+            cannot be processed raises its error when a project reads it,
+            as if it had not been cached.
+        """
+        if 'weather_window' not in sheets_dict:
+            return None
+        try:
+            weather_window = parse_weather_window(sheets_dict['weather_window'])
+        except Exception:
+            return None
+        return store_weather_window(sheets_dict['weather_window'], weather_window)
+
+    @classmethod
+    def file_signature(cls, filename):
+        """
+        Parameters
+        ----------
+        filename : str
+            The file to inspect.
+
+        Returns
+        -------
+        tuple
+            The size and modification time in nanoseconds of the file. These
+            change whenever the file is written.
+        """
+        stat = os.stat(filename)
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def file_sha1(cls, filename):
+        """
+        Parameters
+        ----------
+        filename : str
+            The file to hash.
+
+        Returns
+        -------
+        str
+            The hexadecimal SHA1 digest of the contents of the file.
+        """
+        digest = hashlib.sha1()
+        with open(filename, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def persistent_cache_filename(cls, xlsx_filename):
+        """
+        Parameters
+        ----------
+        xlsx_filename : str
+            The .xlsx file that is cached.
+
+        Returns
+        -------
+        str
+            The filename of the disk cache of the .xlsx file, or None if the
+            disk cache is disabled or its folder is inside the input folder
+            or the folder of the .xlsx. The name includes a digest of the
+            full path of the .xlsx, so .xlsx files with the same name in
+            different input folders do not evict each other.
+        """
+        file_ops = XlsxFileOperations()
+        cache_dir = file_ops.dataframe_cache_dir()
+        if cache_dir is None:
+            return None
+
+        cache_dir = os.path.realpath(cache_dir)
+        xlsx_filename = os.path.realpath(xlsx_filename)
+        for input_dir in [file_ops.landbosse_input_dir(), os.path.dirname(xlsx_filename)]:
+            input_dir = os.path.realpath(input_dir)
+            if os.path.commonpath([cache_dir, input_dir]) == input_dir:
+                return None
+
+        xlsx_basename = os.path.basename(xlsx_filename)
+        path_digest = hashlib.sha1(xlsx_filename.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(cache_dir, f'{xlsx_basename}-{path_digest}.pkl')
+
+    @classmethod
+    def read_persistent_cache(cls, xlsx_filename, signature, sha1=None):
+        """
+        Reads the sheets of an .xlsx file from the disk cache, if the cache
+        exists and is valid for the current contents of the .xlsx.
+
+        Parameters
+        ----------
+        xlsx_filename : str
+            The .xlsx file to find in the cache.
+
+        signature : tuple
+            The current signature of the .xlsx as returned by file_signature()
+
+        sha1 : str
+            The SHA1 hash of the .xlsx if it is already known. Otherwise it is
+            computed if needed.
 
         Returns
         -------
         dict
-            Keys are the same as the original dictionary of dataframes.
-            Values are copies of the origin dataframes.
+            The cache entry, as stored in _cache, or None if there is no valid
+            cache entry on disk.
         """
-        return {xlsx_basename: df.copy() for xlsx_basename, df in dict_of_dataframes.items()}
+        cache_filename = cls.persistent_cache_filename(xlsx_filename)
+        if cache_filename is None:
+            return None
+
+        try:
+            with open(cache_filename, 'rb') as file:
+                stored = pickle.load(file)
+        except Exception:
+            # A missing, unreadable or incompatible cache file is simply a
+            # cache miss.
+            return None
+
+        if stored.get('version') != cls.persistent_cache_version or stored.get('pandas_version') != pd.__version__:
+            return None
+
+        entry = stored['entry']
+        if entry['signature'] != signature:
+            if sha1 is None:
+                sha1 = cls.file_sha1(xlsx_filename)
+            if entry['sha1'] != sha1:
+                return None
+            entry['signature'] = signature
+            cls.write_persistent_cache(entry)
+
+        entry['filename'] = xlsx_filename
+        return entry
+
+    @classmethod
+    def write_persistent_cache(cls, entry):
+        """
+        Writes a cache entry to the disk cache. If the cache is disabled or
+        cannot be written, nothing happens.
+
+        The file is written under a temporary name and then renamed, so
+        parallel processes never read a partially written file.
+
+        Parameters
+        ----------
+        entry : dict
+            The cache entry, as stored in _cache
+        """
+        cache_filename = cls.persistent_cache_filename(entry['filename'])
+        if cache_filename is None:
+            return
+
+        temporary_filename = f'{cache_filename}.{os.getpid()}.tmp'
+        stored = {
+            'version': cls.persistent_cache_version,
+            'pandas_version': pd.__version__,
+            'entry': entry
+        }
+        try:
+            os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+            with open(temporary_filename, 'wb') as file:
+                pickle.dump(stored, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_filename, cache_filename)
+        except OSError:
+            if os.path.exists(temporary_filename):
+                os.remove(temporary_filename)
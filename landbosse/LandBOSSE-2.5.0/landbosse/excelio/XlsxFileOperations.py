@@ -118,6 +118,222 @@ class XlsxFileOperations:
         # Return the state of the command line arguments.
         return input_path, output_path, validation_enabled, enable_scaling_study
 
+    def project_data_export_mode(self):
+        """
+        Finds how the parametrically modified project data of each project
+        should be exported. It looks on the command line for
+
+        --project-data-export [mode]
+
+        If that is missing, it uses the environment variable
+        LANDBOSSE_PROJECT_DATA_EXPORT, and if that is missing too, it
+        defaults to 'xlsx'. The modes are:
+
+        'xlsx': Write a complete project data .xlsx for each project into
+            the folder returned by parametric_project_data_output_path().
+            This is the original behavior.
+
+        'deltas': Write a single .csv with one row for each parametric
+            modification of a project data cell, to the path returned by
+            parametric_project_data_deltas_path(). The .xlsx of any
+            project can be rebuilt from it with
+            post_processing_scripts/rebuild_parametric_project_data.py
+
+        'none': Do not export the modified project data.
+
+        Returns
+        -------
+        str
+            One of 'xlsx', 'deltas' or 'none'.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the mode is not one of the above.
+        """
+        mode = os.environ.get('LANDBOSSE_PROJECT_DATA_EXPORT', 'xlsx')
+
+        if '--project-data-export' in sys.argv and sys.argv.index('--project-data-export') + 1 < len(sys.argv):
+            mode = sys.argv[sys.argv.index('--project-data-export') + 1]
+
+        if mode not in ['xlsx', 'deltas', 'none']:
+            raise XlsxOperationException(f'Project data export mode {mode} is not one of xlsx, deltas or none.')
+
+        return mode
+
+    def project_index_range(self):
+        """
+        Finds the range of rows of the extended project list to run. It looks
+        on the command line for
+
+        --project-range [start]:[stop]
+
+        If that is missing, it uses the environment variable
+        LANDBOSSE_PROJECT_RANGE. Rows from start up to but not including
+        stop are run. Either number may be left out, as in Python slices. If
+        neither is given, all the rows are run. This splits a large
+        parametric sweep among several runs.
+
+        Returns
+        -------
+        int, int
+            Start and stop of the range. Either may be None.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the range is not in the form start:stop
+        """
+        project_range = os.environ.get('LANDBOSSE_PROJECT_RANGE', ':')
+
+        if '--project-range' in sys.argv and sys.argv.index('--project-range') + 1 < len(sys.argv):
+            project_range = sys.argv[sys.argv.index('--project-range') + 1]
+
+        try:
+            start, stop = [int(value) if value.strip() != '' else None for value in project_range.split(':')]
+        except ValueError:
+            raise XlsxOperationException(f'Project range {project_range} is not in the form start:stop')
+
+        return start, stop
+
+    def parallel_executor_options(self):
+        """
+        Finds the options for the ProcessPoolExecutor of
+        XlsxParallelManagerRunner. Each option is looked for on the command
+        line first, then in an environment variable, and then it takes its
+        default:
+
+        --workers [n] or LANDBOSSE_WORKERS: The number of worker processes.
+            Defaults to the number of CPUs.
+
+        --chunk-size [n] or LANDBOSSE_CHUNK_SIZE: The number of projects sent
+            to a worker in each task. Larger chunks reduce the overhead of
+            each task when projects are fast to run. Defaults to 1.
+
+        --max-in-flight [n] or LANDBOSSE_MAX_IN_FLIGHT: The largest number of
+            tasks submitted and not yet written to the output. When this is
+            reached, the runner waits for the oldest task before submitting
+            more, which bounds the memory used by pending tasks and their
+            results. Defaults to 4 times the number of workers.
+
+        --start-method [method] or LANDBOSSE_START_METHOD: The multiprocessing
+            start method, one of 'fork', 'spawn' or 'forkserver'. Defaults to
+            the default of the platform.
+
+        Returns
+        -------
+        dict
+            Keys are 'max_workers', 'chunk_size', 'max_in_flight' and
+            'start_method'. 'max_workers' and 'start_method' are None when
+            they take the default. 'max_in_flight' is always resolved.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a number is not a positive integer or the start method is not
+            one of the above.
+        """
+        def option(flag, environment_variable):
+            value = os.environ.get(environment_variable)
+            if flag in sys.argv and sys.argv.index(flag) + 1 < len(sys.argv):
+                value = sys.argv[sys.argv.index(flag) + 1]
+            return value
+
+        def positive_integer(flag, environment_variable):
+            value = option(flag, environment_variable)
+            if value is None:
+                return None
+            try:
+                number = int(value)
+            except ValueError:
+                number = 0
+            if number < 1:
+                raise XlsxOperationException(f'{flag} {value} is not a positive integer.')
+            return number
+
+        max_workers = positive_integer('--workers', 'LANDBOSSE_WORKERS')
+        chunk_size = positive_integer('--chunk-size', 'LANDBOSSE_CHUNK_SIZE')
+        max_in_flight = positive_integer('--max-in-flight', 'LANDBOSSE_MAX_IN_FLIGHT')
+        start_method = option('--start-method', 'LANDBOSSE_START_METHOD')
+
+        if start_method is not None and start_method not in ['fork', 'spawn', 'forkserver']:
+            raise XlsxOperationException(f'Start method {start_method} is not one of fork, spawn or forkserver.')
+
+        if max_in_flight is None:
+            max_in_flight = 4 * (max_workers if max_workers is not None else (os.cpu_count() or 1))
+
+        return {
+            'max_workers': max_workers,
+            'chunk_size': chunk_size if chunk_size is not None else 1,
+            'max_in_flight': max_in_flight,
+            'start_method': start_method,
+        }
+
+    def result_cache_dir(self):
+        """
+        Finds the folder of the ResultCache that stores the results of
+        projects between runs. It looks on the command line for
+
+        --result-cache [folder]
+
+        If that is missing, it uses the environment variable
+        LANDBOSSE_RESULT_CACHE_DIR. If that is missing too, the cache is
+        disabled and every project is computed.
+
+        Returns
+        -------
+        str
+            The folder of the cache, or None if the cache is disabled.
+        """
+        result_cache_dir = os.environ.get('LANDBOSSE_RESULT_CACHE_DIR')
+
+        if '--result-cache' in sys.argv and sys.argv.index('--result-cache') + 1 < len(sys.argv):
+            result_cache_dir = sys.argv[sys.argv.index('--result-cache') + 1]
+
+        return result_cache_dir if result_cache_dir else None
+
+    def dataframe_cache_dir(self):
+        """
+        Finds the folder of the disk cache of XlsxDataframeCache, which holds
+        the parsed sheets of .xlsx files between runs. It looks on the
+        command line for
+
+        --dataframe-cache [folder]
+
+        If that is missing, it uses the environment variable
+        LANDBOSSE_CACHE_DIR. If that is missing too, the disk cache is
+        disabled and .xlsx files are parsed in every run.
+
+        Returns
+        -------
+        str
+            The folder of the cache, or None if the cache is disabled.
+        """
+        dataframe_cache_dir = os.environ.get('LANDBOSSE_CACHE_DIR')
+
+        if '--dataframe-cache' in sys.argv and sys.argv.index('--dataframe-cache') + 1 < len(sys.argv):
+            dataframe_cache_dir = sys.argv[sys.argv.index('--dataframe-cache') + 1]
+
+        return dataframe_cache_dir if dataframe_cache_dir else None
+
+    def reuse_module_results(self):
+        """
+        Determines whether the cost modules of a project reuse the results
+        of an earlier project whose module inputs were the same. See
+        CostModuleGraph. It looks on the command line for
+
+        --reuse-module-results
+
+        If that is missing, reuse is enabled when the environment variable
+        LANDBOSSE_REUSE_MODULE_RESULTS is 1.
+
+        Returns
+        -------
+        bool
+            True if module results are reused.
+        """
+        return '--reuse-module-results' in sys.argv or os.environ.get('LANDBOSSE_REUSE_MODULE_RESULTS') == '1'
+
     def landbosse_input_dir(self):
         """
         See the get_input_output_paths_from_argv_or_env() function above. This
@@ -184,6 +400,19 @@ class XlsxFileOperations:
         os.makedirs(path, exist_ok=True)
         return path
 
+    def parametric_project_data_deltas_path(self):
+        """
+        Returns the path of the .csv that logs the parametric modifications
+        of the project data when the project data export mode is 'deltas'.
+        See project_data_export_mode()
+
+        Returns
+        -------
+        str
+            Path to the deltas .csv
+        """
+        return os.path.join(self.extended_project_list_path(), 'parametric_project_data_deltas.csv')
+
     def extended_project_list_path(self):
         """
         This returns the path to which the extended project list, which has all
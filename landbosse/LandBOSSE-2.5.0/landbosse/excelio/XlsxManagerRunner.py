@@ -1,6 +1,7 @@
 import pandas as pd
 
 from .XlsxDataframeCache import XlsxDataframeCache
+from .CellSpecPlan import CellSpecPlan
 from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
 
@@ -73,7 +74,8 @@ class XlsxManagerRunner:
         """
         raise NotImplementedError('run_from_project_list_xlsx() can only be called on subclasses')
 
-    def extract_module_type_operation_lists(self, runs_dict):
+    @staticmethod
+    def extract_module_type_operation_lists(runs_dict):
         """
         This method extract all the cost_by_module_type_operation lists for
         output in an Excel file.
@@ -100,7 +102,8 @@ class XlsxManagerRunner:
                     result.extend(value)
         return result
 
-    def extract_details_lists(self, runs_dict):
+    @staticmethod
+    def extract_details_lists(runs_dict):
         """
         This method extract all .csv lists from the OrderDict of runs to output
         into an Excel or .csv file.
@@ -127,7 +130,211 @@ class XlsxManagerRunner:
                     runs_for_csv.extend(value)
         return runs_for_csv
 
+    @staticmethod
+    def master_input_dictionaries(projects):
+        """
+        Creates the master input dictionaries of several projects that have
+        been through the parametric modifications. The projects whose
+        parametric values modify no project data sheet are grouped by
+        project data file, and the dictionaries of each group are created
+        together with XlsxReader.create_master_input_dictionaries(). The
+        other projects get their own with create_master_input_dictionary()
+
+        Parameters
+        ----------
+        projects : list
+            One tuple for each project, with the basename of its project
+            data file, its project data sheets, its project parameters and
+            its weather window already processed by read_weather_window, or
+            None to process the weather_window sheet.
+
+        Returns
+        -------
+        list
+            The master input dictionaries, in the order of the projects.
+        """
+        xlsx_reader = XlsxReader()
+        result = [None] * len(projects)
+
+        # Keys are project data basenames. Values are the positions of the
+        # projects with unmodified sheets.
+        unmodified_positions = dict()
+        for position, (project_data_basename, project_data_sheets, project_parameters, weather_window) \
+                in enumerate(projects):
+            if len(xlsx_reader.modified_sheet_names(project_parameters)) == 0:
+                unmodified_positions.setdefault(project_data_basename, []).append(position)
+            else:
+                result[position] = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters,
+                                                                              weather_window)
+
+        for positions in unmodified_positions.values():
+            # The unmodified sheets are the same for every project of the file.
+            _, project_data_sheets, _, weather_window = projects[positions[0]]
+            project_list = pd.DataFrame([projects[position][2] for position in positions], dtype=object)
+            master_input_dicts = xlsx_reader.create_master_input_dictionaries(project_data_sheets, project_list,
+                                                                              weather_window)
+            for position, master_input_dict in zip(positions, master_input_dicts):
+                result[position] = master_input_dict
+
+        return result
+
+    @staticmethod
+    def project_result(project_id_with_serial, output_dict):
+        """
+        Reduces the output dictionary of one project to the rows that are
+        written to the output files. The output dictionary holds large
+        objects, such as the dataframes of each module, that are not
+        needed once the rows have been extracted.
+
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The project ID with serial.
+
+        output_dict : dict
+            The output dictionary of the project. It must have the key
+            'project_series'
+
+        Returns
+        -------
+        dict
+            Has the key 'project_series' with the project parameters, the
+            key 'details_list' with the details rows and the key
+            'module_type_operation_list' with the cost rows.
+        """
+        runs_dict = {project_id_with_serial: output_dict}
+        return {
+            'project_series': output_dict['project_series'],
+            'details_list': XlsxManagerRunner.extract_details_lists(runs_dict),
+            'module_type_operation_list': XlsxManagerRunner.extract_module_type_operation_lists(runs_dict),
+        }
+
+    def write_parametric_project_data_deltas(self, deltas):
+        """
+        Writes the deltas of all projects, as created by
+        XlsxReader.parametric_project_data_deltas(), into a single .csv.
+        This is used instead of writing a project data .xlsx for each
+        project when the project data export mode is 'deltas'.
+
+        Parameters
+        ----------
+        deltas : list
+            The list of dicts, one for each modified cell, for all projects.
+        """
+        columns = ['Project ID with serial', 'Project data file', 'Sheet', 'Row', 'Column', 'Value']
+        deltas_df = pd.DataFrame(deltas, columns=columns)
+        deltas_df.to_csv(self.file_ops.parametric_project_data_deltas_path(), index=False)
+
     def read_project_and_parametric_list_from_xlsx(self):
+        """
+        This method reads both the project and parametric list from the
+        project_list xlsx and joins them into the extended project list.
+        See read_project_and_parametric_sheets() for how the sheets are
+        found.
+
+        Runners use generate_extended_project_list() instead, so the
+        whole extended project list does not need to be in memory.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The enhanced project list that has support for all parametric
+            adjustments for each step.
+
+        Raises
+        ------
+        KeyError
+            When the spreadsheet contains multiple sheets and one or
+            both of "Project list" or "Parametric list" are undefined.
+        """
+        project_list, parametric_list = self.read_project_and_parametric_sheets()
+
+        # Instantiate and XlsxReader to assemble master input dictionary
+        xlsx_reader = XlsxReader()
+
+        # Join in the parametric variable modifications
+        parametric_value_list = xlsx_reader.create_parametric_value_list(parametric_list)
+        extended_project_list = xlsx_reader.outer_join_projects_to_parametric_values(project_list,
+                                                                                 parametric_value_list)
+
+        return extended_project_list
+
+    def generate_extended_project_list(self):
+        """
+        Generates the rows of the extended project list, as returned by
+        read_project_and_parametric_list_from_xlsx(), one at a time.
+
+        If a project range is given on the command line (see
+        XlsxFileOperations.project_index_range()) only the rows in that
+        range are generated, so that a large sweep can be split among
+        several runs.
+
+        The cell specifications of the parametric list are checked before
+        any project is generated. See validate_cell_specifications()
+
+        Returns
+        -------
+        int, generator
+            The number of projects that will be generated, and the generator
+            of the project parameters series of each project.
+
+        Raises
+        ------
+        KeyError
+            When the spreadsheet contains multiple sheets and one or
+            both of "Project list" or "Parametric list" are undefined.
+
+        XlsxOperationException
+            When a cell specification does not point to a sheet, row or
+            column of the project data of its project.
+        """
+        project_list, parametric_list = self.read_project_and_parametric_sheets()
+        self.validate_cell_specifications(project_list, parametric_list)
+        start, stop = self.file_ops.project_index_range()
+
+        xlsx_reader = XlsxReader()
+        # Slicing a range resolves missing and negative ends like a list would.
+        project_range = range(xlsx_reader.count_extended_project_list(project_list, parametric_list))[start:stop]
+        generator = xlsx_reader.generate_extended_project_list(project_list, parametric_list,
+                                                               project_range.start, project_range.stop)
+
+        return len(project_range), generator
+
+    def validate_cell_specifications(self, project_list, parametric_list):
+        """
+        Compiles the cell specifications of the parametric list of each
+        project against the project data file of the project, so that a
+        sheet, row or column that is not found stops the run before any
+        project runs, rather than in a worker. See CellSpecPlan.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list.
+
+        Raises
+        ------
+        XlsxOperationException
+            When a cell specification does not point to a sheet, row or
+            column of the project data of its project.
+        """
+        xlsx_reader = XlsxReader()
+        parametric_grids = xlsx_reader.parametric_grids(parametric_list)
+        if len(parametric_grids) == 0:
+            return
+
+        parameter_names = list(project_list.columns) + xlsx_reader.parametric_value_list_columns(parametric_grids)
+        project_data_files = dict(zip(project_list['Project ID'], project_list['Project data file']))
+        for project_id, grid in parametric_grids:
+            if pd.isnull(project_data_files.get(project_id)) or len(grid) == 0:
+                continue
+            project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_files[project_id])
+            CellSpecPlan(project_data_sheets, parameter_names).validate(grid.cell_specifications)
+
+    def read_project_and_parametric_sheets(self):
         """
         This method reads both the project and parametric list from the
         project_list xlsx. It returns them as a tuple.
@@ -149,9 +356,8 @@ class XlsxManagerRunner:
 
         Returns
         -------
-        pandas.DataFrame
-            The enhanced project list that has support for all parametric
-            adjustments for each step.
+        pandas.DataFrame, pandas.DataFrame
+            The project list and the parametric list.
 
         Raises
         ------
@@ -177,12 +383,4 @@ class XlsxManagerRunner:
         else:
             raise KeyError("Project list needs to have a single sheet or sheets named 'Project list' and 'Parametric list'.")
 
-        # Instantiate and XlsxReader to assemble master input dictionary
-        xlsx_reader = XlsxReader()
-
-        # Join in the parametric variable modifications
-        parametric_value_list = xlsx_reader.create_parametric_value_list(parametric_list)
-        extended_project_list = xlsx_reader.outer_join_projects_to_parametric_values(project_list,
-                                                                                 parametric_value_list)
-
-        return extended_project_list
+        return project_list, parametric_list
@@ -1,20 +1,40 @@
+import multiprocessing
 import os
+from collections import deque
 from concurrent import futures
 
 import pandas as pd
 
 from ..model import Manager
-from .XlsxFileOperations import XlsxFileOperations
+from ..model import ResultCache
 from .XlsxReader import XlsxReader
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxGenerator import XlsxGenerator
+from .SharedDataFrame import SharedDataFrame
+from .CopyOnWriteSheets import CopyOnWriteSheets
+from .CsvResultSink import CsvResultSink
+from .WeatherWindowCSVReader import read_weather_window
 
 
 class XlsxParallelManagerRunner(XlsxManagerRunner):
     """
     This subclass implementation of XlsxManagerRunner runs all projects
     with a ProcessPoolExecutor.
+
+    The project data sheets, and the processed weather window, are placed
+    once in shared memory with SharedDataFrame rather than being pickled
+    into every task. Workers attach to them by name, apply the parametric
+    values of their project and write the parametric project data .xlsx.
+
+    Workers return only the rows for the output files, which are appended
+    to the .csv files in the order of the project list as soon as the
+    projects at the front of that order finish.
+
+    The number of workers, the number of projects in each task, the start
+    method and the number of tasks in flight are set on the command line
+    or in environment variables. See
+    XlsxFileOperations.parallel_executor_options()
     """
 
     def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False):
@@ -41,89 +61,199 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
 
         Returns
         -------
-        dict, list, module_type_operation_lists
-            First element of tuple is a dict that is the result of
-            all the runs. Each key is the name of a project and each value
-            is the output dictionary of that project. The second element
-            is the list of rows for the csv. The third element is the list
-            of costs for the spreadsheets.
+        dict
+            The key 'module_type_operation_list' has the list of costs for
+            the spreadsheets, 'details_row_count' has the number of rows
+            written to landbosse-details.csv and 'extended_project_list'
+            has the project parameters after the parametric modifications.
         """
         # Load the project list
         print('Calculating parametric values')
-        extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
-
-        # Prepare the file operations
-        file_ops = XlsxFileOperations()
-
-        # Instantiate an XlsxReader to handle the parametrics and master input
-        # dictionaries
-        xlsx_reader = XlsxReader()
-
-        # Get a list ready to hold the project parameters after they have been modified
-        # After all rows have been added to this list (each row is a series) then the
-        # whole list will be transformed into a dataframe.
-        #
-        # See notes at https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.append.html
-        # for why this is more performant than appending to a dataframe.
+        number_of_projects, extended_project_list_before_parameter_modifications = self.generate_extended_project_list()
+
+        # Worker count, chunking, start method and the bound on tasks in flight
+        executor_options = self.file_ops.parallel_executor_options()
+        chunk_size = executor_options['chunk_size']
+        max_in_flight = executor_options['max_in_flight']
+        if executor_options['start_method'] is not None:
+            mp_context = multiprocessing.get_context(executor_options['start_method'])
+        else:
+            mp_context = None
+
+        # Keys are project data basenames. Values are dictionaries of
+        # SharedDataFrame instances keyed by sheet name. The processed weather
+        # window is under the key 'processed weather_window'. All of these
+        # must be closed after all the projects have run.
+        shared_project_data = dict()
+
+        # Futures of the chunks of projects whose results have not been
+        # written yet, in the order of the project list
+        pending_futures = deque()
+
+        # The tasks of the chunk being assembled
+        chunk = []
+
+        # The project parameters after the parametric modifications
         extended_project_list_after_parameter_modifications = []
 
-        # Prep all task for the executor
-        all_tasks = []
-        print(f'Found {len(extended_project_list_before_parameter_modifications)} projects for execution')
-        for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
-
-            # If project_parameters['Project ID with serial'] is null, that means there are no
-            # parametric modifications to the project data dataframes. Hence,
-            # just the plain Project ID without a serial number should be used.
-            if pd.isnull(project_parameters['Project ID with serial']):
-                project_id_with_serial = project_parameters['Project ID']
-            else:
-                project_id_with_serial = project_parameters['Project ID with serial']
-
-            print(f'Preparing {project_id_with_serial}')
-
-            project_data_basename = project_parameters['Project data file']
-            task = dict()
-
-            task['project_data_sheets'] = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
-
-            # Transform the dataframes so that they have the right values for
-            # the parametric variables.
-            xlsx_reader.modify_project_data_and_project_list(task['project_data_sheets'], project_parameters)
+        def write_chunk_results(future):
+            for project_result in future.result():
+                extended_project_list_after_parameter_modifications.append(project_result['project_series'])
+                sink.add_project(project_result)
+
+        def submit_chunk():
+            # Wait for the oldest chunks when too many are in flight, so the
+            # project list is not read further ahead than the workers can run.
+            while len(pending_futures) >= max_in_flight:
+                write_chunk_results(pending_futures.popleft())
+            pending_futures.append(executor.submit(run_project_chunk, list(chunk)))
+            chunk.clear()
+
+        # How to export the modified project data, and the modifications of
+        # all the projects if only the modifications are exported.
+        project_data_export_mode = self.file_ops.project_data_export_mode()
+        parametric_project_data_deltas = []
+        xlsx_reader = XlsxReader()
 
-            # Apply cost and scaling modifications if needed.
-            if enable_cost_and_scaling_modifications:
-                xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+        # The folder of the cache of results of projects that have been run
+        # before, or None if the cache is disabled.
+        result_cache_dir = self.file_ops.result_cache_dir()
+
+        # Whether cost modules reuse the results of earlier projects. Each
+        # worker process keeps its own results.
+        reuse_module_results = self.file_ops.reuse_module_results()
+
+        # Tasks are submitted as soon as they are prepared, so the first projects
+        # start running while the rest of the project list is being read. Each task
+        # carries only the project parameters, which hold the parametric values, and
+        # the names of the shared memory blocks holding the project data sheets.
+        # Applying the parametric values and writing the parametric project data
+        # .xlsx files happens in the workers.
+        print(f'Found {number_of_projects} projects for execution')
+        try:
+            # The project data files named in the project list are shared before
+            # the workers start, so that each worker attaches to them once in its
+            # initializer rather than during its first project.
+            project_list, _ = self.read_project_and_parametric_sheets()
+            for project_data_basename in project_list['Project data file'].dropna().unique():
+                shared_project_data[project_data_basename] = self.share_project_data_sheets(project_data_basename)
+            all_descriptors = [
+                shared_sheet.descriptor
+                for shared_sheets in shared_project_data.values()
+                for shared_sheet in shared_sheets.values()
+            ]
+
+            with CsvResultSink(self.file_ops) as sink, \
+                    futures.ProcessPoolExecutor(max_workers=executor_options['max_workers'],
+                                                mp_context=mp_context,
+                                                initializer=initialize_worker,
+                                                initargs=(all_descriptors,)) as executor:
+                for project_parameters in extended_project_list_before_parameter_modifications:
+
+                    # If project_parameters['Project ID with serial'] is null, that means there are no
+                    # parametric modifications to the project data dataframes. Hence,
+                    # just the plain Project ID without a serial number should be used.
+                    if pd.isnull(project_parameters['Project ID with serial']):
+                        project_id_with_serial = project_parameters['Project ID']
+                    else:
+                        project_id_with_serial = project_parameters['Project ID with serial']
+
+                    project_data_basename = project_parameters['Project data file']
+
+                    # Each project data file is read and placed in shared memory once.
+                    if project_data_basename not in shared_project_data:
+                        shared_project_data[project_data_basename] = \
+                            self.share_project_data_sheets(project_data_basename)
+                    shared_sheets = shared_project_data[project_data_basename]
+
+                    task = dict()
+                    task['project_data_basename'] = project_data_basename
+                    task['project_id_with_serial'] = project_id_with_serial
+                    task['project_series'] = project_parameters
+                    task['shared_sheets'] = {
+                        sheet_name: shared_sheet.descriptor
+                        for sheet_name, shared_sheet in shared_sheets.items()
+                        if sheet_name != 'processed weather_window'
+                    }
+                    task['shared_weather_window'] = shared_sheets['processed weather_window'].descriptor
+                    task['enable_cost_and_scaling_modifications'] = enable_cost_and_scaling_modifications
+                    task['result_cache_dir'] = result_cache_dir
+                    task['reuse_module_results'] = reuse_module_results
+                    if project_data_export_mode == 'xlsx':
+                        task['parametric_project_data_path'] = \
+                            os.path.join(self.file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
+                    else:
+                        task['parametric_project_data_path'] = None
+
+                    if project_data_export_mode == 'deltas':
+                        parametric_project_data_deltas.extend(
+                            xlsx_reader.parametric_project_data_deltas(project_parameters, project_id_with_serial))
+
+                    chunk.append(task)
+                    if len(chunk) == chunk_size:
+                        submit_chunk()
+
+                    # Write the results of the chunks that have finished, so
+                    # their rows do not wait in memory until all tasks are submitted.
+                    while len(pending_futures) > 0 and pending_futures[0].done():
+                        write_chunk_results(pending_futures.popleft())
+
+                if len(chunk) > 0:
+                    submit_chunk()
+
+                while len(pending_futures) > 0:
+                    write_chunk_results(pending_futures.popleft())
+        finally:
+            for shared_sheets in shared_project_data.values():
+                for shared_sheet in shared_sheets.values():
+                    shared_sheet.close()
+
+        if project_data_export_mode == 'deltas':
+            self.write_parametric_project_data_deltas(parametric_project_data_deltas)
+
+        # Assemble the dictionary with content for the cost_by_module_type_operation
+        # tab. The details have already been written to the .csv.
+        final_result = dict()
+        final_result['details_row_count'] = sink.details_row_count
+        final_result['module_type_operation_list'] = sink.module_type_operation_list
+        final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
 
-            # Append the modified project parameters
-            extended_project_list_after_parameter_modifications.append(project_parameters)
+        # Return the runs for all the scenarios.
+        return final_result
 
-            # Write all project_data sheets
-            parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(task['project_data_sheets'], parametric_project_data_path)
 
-            task['project_data_basename'] = project_data_basename
-            task['project_id_with_serial'] = project_id_with_serial
-            task['project_series'] = project_parameters
-            all_tasks.append(task)
+    def share_project_data_sheets(self, project_data_basename):
+        """
+        Reads all the sheets of a project data file and places them in
+        shared memory. The weather window is also processed with
+        read_weather_window and placed in shared memory, so that workers
+        do not each need to process it again.
 
-        # Execute every project
-        with futures.ProcessPoolExecutor() as executor:
-            executor_result = executor.map(run_single_project, all_tasks)
+        Parameters
+        ----------
+        project_data_basename : str
+            The basename of the project data .xlsx file.
 
-        # Get the output dictionary ready
-        runs_dict = {project_id_with_serial: result for project_id_with_serial, result in executor_result}
+        Returns
+        -------
+        dict
+            Keys are sheet names and values are SharedDataFrame instances.
+            The processed weather window is under the key
+            'processed weather_window'.
+        """
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+        result = {sheet_name: SharedDataFrame(df) for sheet_name, df in project_data_sheets.items()}
 
-        # Assemble the dictionary with content for the details, details with inputs,
-        #  cost_by_module_type_operation and cost_by_module_type_operation_with_input tabs
-        final_result = dict()
-        final_result['details_list'] = self.extract_details_lists(runs_dict)
-        final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
-        final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+        # Season and Time window are shared as categoricals so that they are
+        # views on shared memory rather than rebuilt in each worker. They
+        # replace the columns of a shallow copy, since the weather window is
+        # cached by read_weather_window.
+        weather_window = read_weather_window(project_data_sheets['weather_window']).copy(deep=False)
+        for column in ['Season', 'Time window']:
+            weather_window[column] = weather_window[column].astype('category')
+        result['processed weather_window'] = SharedDataFrame(weather_window)
 
-        # Return the runs for all the scenarios.
-        return final_result
+        return result
 
 
 """
@@ -133,30 +263,99 @@ parallel processes.
 """
 
 
-def run_single_project(task_dict):
+def initialize_worker(descriptors):
     """
-    The dictionary project_definition_dict contains the following keys.
+    Runs once in each worker process when it starts. It attaches to the
+    shared project data sheets, so that the projects run by the worker
+    find them already attached.
+
+    Parameters
+    ----------
+    descriptors : list
+        The SharedDataFrame descriptors of all the sheets shared before the
+        workers started.
+    """
+    for descriptor in descriptors:
+        SharedDataFrame.attach(descriptor)
+
+
+def run_project_chunk(tasks):
+    """
+    Runs several projects in one task, which reduces the overhead of
+    submitting each project separately when projects are fast to run.
+
+    Basically, the map operation goes like this:
+
+    task_dict -> master_input_dict -> master_output_dict
 
-    For each process another logger is created, so that each process does
-    not attempt to use the same logger.
+    Wrapped in a functional executor, this maps chunks of projects into
+    their results. Each process prints its own log messages, so that
+    processes do not attempt to use the same logger.
 
-    input_xlsx : str
-        The filename for the input .xlsx that has all the dataframes
-        for the for ErectionCost and FoundationCost
+    Each task dictionary contains the following keys.
+
+    project_data_basename : str
+        The basename of the project data .xlsx of the project.
 
     project_series : pd.Series
         The series that has the non-dataframe values for each project,
         including the project name.
 
-    project_id : str
+    project_id_with_serial : str
         The string that is the name of the project.
 
-    Basically, the map operation goes like this:
+    shared_sheets : dict
+        Keys are sheet names and values are SharedDataFrame descriptors of
+        the unmodified project data sheets.
 
-    task_dict -> master_input_dict -> master_output_dict
+    shared_weather_window : dict
+        The SharedDataFrame descriptor of the unmodified weather window
+        already processed by read_weather_window.
+
+    enable_cost_and_scaling_modifications : bool
+        If True, apply the cost and scaling modifications to the project
+        parameters after the parametric modifications.
+
+    parametric_project_data_path : str
+        The pathname to write the parametrically modified project data
+        .xlsx file to. If None, the file is not written.
 
-    Wrapped in a functional executor, this maps projects into their
-    output dictionaries.
+    result_cache_dir : str
+        The folder of the ResultCache to read the result from, if the project
+        has been run before, and to write it to otherwise. If None, the
+        project is always computed.
+
+    reuse_module_results : bool
+        If True, the cost modules reuse the results of earlier projects run
+        by the same worker whose inputs to the modules were the same.
+
+    The master input dictionaries of the projects are created together,
+    see XlsxManagerRunner.master_input_dictionaries(), so the projects whose
+    parametric values modify no project data sheet share the work of
+    creating them.
+
+    Parameters
+    ----------
+    tasks : list
+        The task dictionaries of the projects.
+
+    Returns
+    -------
+    list
+        The result of run_prepared_project() for each task, in order.
+    """
+    projects = [prepare_project(task) for task in tasks]
+    master_input_dicts = XlsxManagerRunner.master_input_dictionaries(projects)
+    return [
+        run_prepared_project(task, master_input_dict)
+        for task, master_input_dict in zip(tasks, master_input_dicts)
+    ]
+
+
+def prepare_project(task_dict):
+    """
+    Applies the parametric modifications of a project to its project data
+    and parameters. See run_project_chunk() for the keys of task_dict.
 
     Parameters
     ----------
@@ -165,28 +364,87 @@ def run_single_project(task_dict):
 
     Returns
     -------
-    tuple : (str, dict)
-        The str is the project_id. The dict is the resulting output
-        dictionary.
+    str, CopyOnWriteSheets, pd.Series, pd.DataFrame
+        The basename of the project data file, the project data sheets and
+        the project parameters after the modifications, and the shared
+        processed weather window, or None if the parametrics modify the
+        weather_window sheet.
     """
     project_data_basename = task_dict['project_data_basename']
     project_series = task_dict['project_series']
     project_id_with_serial = task_dict['project_id_with_serial']
-    project_data_sheets = task_dict['project_data_sheets']
 
     # Log each project. Use print because it works better for multiple processes.
     print(f'Start {project_id_with_serial}, project data in {project_data_basename}')
 
-    # Read the Excel
     xlsx_reader = XlsxReader()
-    master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_series)
+
+    # Attach to the shared project data sheets. The sheets modified by the
+    # parametrics, and those modified in place while the project runs, are
+    # copied by CopyOnWriteSheets when they are written to.
+    project_data_sheets = CopyOnWriteSheets({
+        sheet_name: SharedDataFrame.attach(descriptor)
+        for sheet_name, descriptor in task_dict['shared_sheets'].items()
+    })
+
+    # Transform the dataframes so that they have the right values for
+    # the parametric variables.
+    xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_series)
+
+    # Apply cost and scaling modifications if needed.
+    if task_dict['enable_cost_and_scaling_modifications']:
+        xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_series)
+
+    # Write all project_data sheets, unless the export is disabled
+    if task_dict['parametric_project_data_path'] is not None:
+        XlsxGenerator.write_project_data(project_data_sheets, task_dict['parametric_project_data_path'])
+
+    # If the parametrics modify the weather window, it is processed again from
+    # the modified sheet.
+    if 'weather_window' in xlsx_reader.modified_sheet_names(project_series):
+        weather_window = None
+    else:
+        weather_window = SharedDataFrame.attach(task_dict['shared_weather_window'])
+
+    return project_data_basename, project_data_sheets, project_series, weather_window
+
+
+def run_prepared_project(task_dict, master_input_dict):
+    """
+    Runs a project prepared by prepare_project(). See run_project_chunk()
+    for the keys of task_dict.
+
+    Parameters
+    ----------
+    task_dict : dict
+        The configuration of the task.
+
+    master_input_dict : dict
+        The master input dictionary of the project.
+
+    Returns
+    -------
+    dict
+        The rows for the output files and the modified project parameters.
+        See XlsxManagerRunner.project_result()
+    """
+    project_series = task_dict['project_series']
+    project_id_with_serial = task_dict['project_id_with_serial']
 
     # Now run the manager and accumulate its result into the runs_dict
     output_dict = dict()
     output_dict['project_series'] = project_series
-    mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
+    if task_dict['result_cache_dir'] is not None:
+        result_cache = ResultCache(task_dict['result_cache_dir'])
+    else:
+        result_cache = None
+    mc = Manager(input_dict=master_input_dict, output_dict=output_dict, result_cache=result_cache,
+                 reuse_module_results=task_dict['reuse_module_results'])
     mc.execute_landbosse(project_name=project_id_with_serial)
 
-    print(f'End {project_id_with_serial}')
+    if result_cache is not None and result_cache.hits > 0:
+        print(f'End {project_id_with_serial}, from the result cache')
+    else:
+        print(f'End {project_id_with_serial}')
 
-    return project_id_with_serial, output_dict
+    return XlsxManagerRunner.project_result(project_id_with_serial, output_dict)
@@ -1,13 +1,14 @@
-import re
-
 import pandas as pd
 import numpy as np
 from math import ceil
 
 from .XlsxOperationException import XlsxOperationException
+from .CopyOnWriteSheets import CopyOnWriteSheets
+from .CellSpecPlan import CellSpecPlan
 from .WeatherWindowCSVReader import read_weather_window, extend_weather_window
-from ..model import DefaultMasterInputDict
-from .GridSearchTree import GridSearchTree
+from ..model import DefaultMasterInputDict, RSMeansIndex
+from .ParametricGrid import ParametricGrid
+from .ParametricSample import ParametricSample
 
 
 class XlsxReader:
@@ -58,6 +59,61 @@ class XlsxReader:
     possible.
     """
 
+    # Keys of the master input dictionary that are copied from a column of
+    # the project list, and the names of those columns.
+    project_list_input_columns = [
+        ('project_id', 'Project ID'),
+        ('crane_breakdown_fraction', 'Crane breakdown fraction'),
+        ('num_turbines', 'Number of turbines'),
+        ('construct_duration', 'Total project construction time (months)'),
+        ('hub_height_meters', 'Hub height m'),
+        ('rotor_diameter_m', 'Rotor diameter m'),
+        ('wind_shear_exponent', 'Wind shear exponent'),
+        ('turbine_rating_MW', 'Turbine rating MW'),
+        ('breakpoint_between_base_and_topping_percent', 'Breakpoint between base and topping (percent)'),
+        ('fuel_usd_per_gal', 'Fuel cost USD per gal'),
+        ('rate_of_deliveries', 'Rate of deliveries (turbines per week)'),
+        ('turbine_spacing_rotor_diameters', 'Turbine spacing (times rotor diameter)'),
+        ('depth', 'Foundation depth m'),
+        ('rated_thrust_N', 'Rated Thrust (N)'),
+        ('bearing_pressure_n_m2', 'Bearing Pressure (n/m2)'),
+        ('gust_velocity_m_per_s', '50-year Gust Velocity (m/s)'),
+        ('site_prep_area_m2', 'Site prep area for Distributed wind (m2)'),
+        ('road_length_adder_m', 'Road length adder (m)'),
+        ('fraction_new_roads', 'Percent of roads that will be constructed'),
+        ('road_quality', 'Road Quality (0-1)'),
+        ('line_frequency_hz', 'Line Frequency (Hz)'),
+        ('row_spacing_rotor_diameters', 'Row spacing (times rotor diameter)'),
+        ('user_defined_distance_to_grid_connection', 'Flag for user-defined home run trench length (0 = no; 1 = yes)'),
+        ('distance_to_grid_connection_km', 'Combined Homerun Trench Length to Substation (km)'),
+        ('fuel_cost_usd_per_gal', 'Fuel cost USD per gal'),
+        ('user_defined_home_run_trench', 'Flag for user-defined home run trench length (0 = no; 1 = yes)'),
+        ('trench_len_to_substation_km', 'Combined Homerun Trench Length to Substation (km)'),
+        ('distance_to_interconnect_mi', 'Distance to interconnect (miles)'),
+        ('interconnect_voltage_kV', 'Interconnect Voltage (kV)'),
+        ('critical_speed_non_erection_wind_delays_m_per_s', 'Non-Erection Wind Delay Critical Speed (m/s)'),
+        ('critical_height_non_erection_wind_delays_m', 'Non-Erection Wind Delay Critical Height (m)'),
+        ('road_width_ft', 'Road width (ft)'),
+        ('road_thickness', 'Road thickness (in)'),
+        ('crane_width', 'Crane width (m)'),
+        ('num_hwy_permits', 'Number of highway permits'),
+        ('num_access_roads', 'Number of access roads'),
+        ('overtime_multiplier', 'Overtime multiplier'),
+    ]
+
+    # Keys of the master input dictionary that hold the markups, and the
+    # names of their project list columns. They are only read for projects
+    # that do not override the total management cost.
+    markup_input_columns = [
+        ('markup_contingency', 'Markup contingency'),
+        ('markup_warranty_management', 'Markup warranty management'),
+        ('markup_sales_and_use_tax', 'Markup sales and use tax'),
+        ('markup_overhead', 'Markup overhead'),
+        ('markup_profit_margin', 'Markup profit margin'),
+    ]
+
+    override_total_mgmt_cost_col_name = 'Override total management cost for distributed (0 does not override)'
+
     def create_parametric_value_list(self, parametric_list):
         """
         Assuming we have a "Parametric list" sheet/dataframe like the following
@@ -85,6 +141,10 @@ class XlsxReader:
         | project2   | project2_10 | NaN             | NaN          | 24             |
         | project2   | project2_11 | NaN             | NaN          | 27             |
 
+        Instead of a full factorial grid, a project can select a sample of
+        a given size with the Sampling and Sample count columns. See
+        ParametricSample. Samples are numbered like grids.
+
         Here NaN is not an error. It is the normal way Pandas handles
         empty cells It means that, for a particular project,
         to the dataframe/row/column is needed and that the value in that
@@ -116,55 +176,233 @@ class XlsxReader:
                 }
             ])
 
+        # Each project has its own grid of parametric values. Every grid
+        # point becomes a row.
+        parametric_grids = self.parametric_grids(parametric_list)
+        number_of_rows = sum(len(grid) for _, grid in parametric_grids)
+        columns = self.parametric_value_list_columns(parametric_grids)
+
         all_parametric_value_rows = []
+        first_serial_index = 0
+        for project_id, grid in parametric_grids:
+            all_parametric_value_rows.append(
+                self.parametric_value_rows(project_id, grid, columns, first_serial_index, number_of_rows)
+            )
+            first_serial_index += len(grid)
 
-        # Group all the projects by their ID and iterate over each group
-        group_by_project = parametric_list.groupby('Project ID')
-        for name, group in group_by_project:
-
-            # For each group/project ID, build a new grid search tree
-            grid_search_tree = GridSearchTree(group)
-            grid = grid_search_tree.build_grid_tree_and_return_grid()
-
-            # After the tree is built, make new rows that have individual
-            # parametric values.
-            #
-            # A grid_point is set of cell specifications and their values.
-            # given our example above, a grid point would be a list of
-            # dictionaries about dataframe cells to modify.
-            #
-            # Grid point 0: alpha/fizz/buzz = 0, beta/foo/bar = 0
-            # Grid point 1: alpha/fizz/buzz = 0, beta/foo/bar = 6
-            # etc
-            parametric_value_rows = []
-            for grid_point in grid:
-                parametric_value_row = dict()
-                for axis in grid_point:
-                    parametric_value_row[axis['cell_specification']] = axis['value']
-                parametric_value_rows.append(parametric_value_row)
-
-            # Assign the project ID to each row. Because of the grouping,
-            # tha name is the same as the project ID.
-            for parametric_value_row in parametric_value_rows:
-                parametric_value_row['Project ID'] = name
-
-            # Add all these new rows into the master list before
-            # iterating again.
-            all_parametric_value_rows.extend(parametric_value_rows)
-
-        # Create project names with serial numbers for each row
-        for index, parametric_value_row in enumerate(all_parametric_value_rows):
-            project_id = parametric_value_row['Project ID']
-            serial = self.create_serial_number(project_id, index, len(all_parametric_value_rows))
-            parametric_value_row['Project ID with serial'] = serial
-
-        # Make a dataframe out of the list of dictionaries. This will
-        # add NaN where appropriate
-
-        result = pd.DataFrame(all_parametric_value_rows)
+        result = pd.concat(all_parametric_value_rows, ignore_index=True)
 
         return result
 
+    def parametric_grids(self, parametric_list):
+        """
+        Makes a ParametricGrid for every project in the parametric list, or
+        a ParametricSample for projects that select a sampling mode other
+        than 'grid' in the Sampling column. See the ParametricSample
+        docstring.
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The "Parametric list" sheet described in
+            create_parametric_value_list()
+
+        Returns
+        -------
+        list
+            List of tuples of project ID and ParametricGrid or
+            ParametricSample, sorted by project ID. Serial numbers are
+            assigned to the grid points in this order.
+        """
+        if parametric_list.empty:
+            return []
+
+        result = []
+        for project_id, group in parametric_list.groupby('Project ID'):
+            sampling = ParametricSample.first_value(group, 'Sampling')
+            if sampling is None or str(sampling).strip().lower() == 'grid':
+                result.append((project_id, ParametricGrid(group)))
+            else:
+                result.append((project_id, ParametricSample(group)))
+        return result
+
+    def parametric_value_list_columns(self, parametric_grids):
+        """
+        Finds the columns of the dataframe returned by
+        create_parametric_value_list(). They are the cell specifications
+        of all the projects, 'Project ID' and 'Project ID with serial'.
+
+        Parameters
+        ----------
+        parametric_grids : list
+            As returned by parametric_grids()
+
+        Returns
+        -------
+        list
+            The column names.
+        """
+        columns = []
+        for _, grid in parametric_grids:
+            if len(grid) > 0:
+                columns.extend(cell_specification for cell_specification in grid.cell_specifications
+                               if cell_specification not in columns)
+                if 'Project ID' not in columns:
+                    columns.extend(['Project ID', 'Project ID with serial'])
+        if 'Project ID' not in columns:
+            columns.extend(['Project ID', 'Project ID with serial'])
+        return columns
+
+    def parametric_value_rows(self, project_id, grid, columns, first_serial_index, number_of_rows, start=0, stop=None):
+        """
+        Makes rows of the dataframe returned by create_parametric_value_list()
+        for a range of points of one project's grid.
+
+        Parameters
+        ----------
+        project_id : str
+            The project ID.
+
+        grid : ParametricGrid
+            The grid of the project.
+
+        columns : list
+            As returned by parametric_value_list_columns()
+
+        first_serial_index : int
+            The serial number of the first point of this grid.
+
+        number_of_rows : int
+            The number of points in all grids, which sets the number of
+            digits in serial numbers.
+
+        start : int
+            The index of the first point of the range.
+
+        stop : int
+            One past the index of the last point of the range. If None, the
+            range runs to the end of the grid.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The rows. Parametric values are floats and cell specifications
+            of other projects are NaN.
+        """
+        grid_values = grid.grid_values(start, stop)
+        row_count = len(next(iter(grid_values.values()))) if len(grid_values) > 0 else 0
+        rows = dict()
+        for column in columns:
+            if column == 'Project ID':
+                rows[column] = pd.Series([project_id] * row_count, dtype=object)
+            elif column == 'Project ID with serial':
+                rows[column] = pd.Series([
+                    self.create_serial_number(project_id, first_serial_index + start + index, number_of_rows)
+                    for index in range(row_count)
+                ], dtype=object)
+            elif column in grid_values:
+                rows[column] = pd.Series(grid_values[column], dtype=float)
+            else:
+                rows[column] = pd.Series(np.nan, index=range(row_count), dtype=float)
+        return pd.DataFrame(rows, columns=columns)
+
+    def count_extended_project_list(self, project_list, parametric_list):
+        """
+        Counts the rows of the extended project list without creating it.
+        See outer_join_projects_to_parametric_values()
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list.
+
+        Returns
+        -------
+        int
+            The number of projects to run.
+        """
+        grid_sizes = {project_id: len(grid) for project_id, grid in self.parametric_grids(parametric_list)}
+        return sum(max(grid_sizes.get(project_id, 1), 1) for project_id in project_list['Project ID'])
+
+    def generate_extended_project_list(self, project_list, parametric_list, start=0, stop=None, chunk_size=1000):
+        """
+        Generates the rows of the extended project list, as created by
+        outer_join_projects_to_parametric_values() from the project list
+        and create_parametric_value_list(), without creating the whole
+        list. Grid points are computed in chunks of chunk_size rows as they
+        are needed.
+
+        A sweep can be split into parts with start and stop, which are
+        positions in the extended project list.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list.
+
+        start : int
+            The position of the first row to generate.
+
+        stop : int
+            One past the position of the last row to generate. If None, the
+            rows run to the end of the extended project list.
+
+        chunk_size : int
+            The number of grid points computed at once.
+
+        Yields
+        ------
+        pandas.Series
+            The project parameters of each project, named by position.
+        """
+        parametric_grids = self.parametric_grids(parametric_list)
+        number_of_rows = sum(len(grid) for _, grid in parametric_grids)
+        columns = self.parametric_value_list_columns(parametric_grids)
+
+        grids_by_project_id = dict()
+        first_serial_index = 0
+        for project_id, grid in parametric_grids:
+            grids_by_project_id[project_id] = (grid, first_serial_index)
+            first_serial_index += len(grid)
+
+        # Projects without parametric values, or with an empty grid, join to
+        # a single row of NaN.
+        empty_rows = pd.DataFrame({column: pd.Series(dtype=float if '/' in column else object) for column in columns})
+
+        position = 0
+        for project_index in range(len(project_list)):
+            if stop is not None and position >= stop:
+                return
+
+            project = project_list.iloc[[project_index]]
+            project_id = project['Project ID'].iloc[0]
+            grid, first_serial_index = grids_by_project_id.get(project_id, (None, 0))
+            row_count = len(grid) if grid is not None and len(grid) > 0 else 1
+
+            # The range of this project's rows to generate
+            first = max(start - position, 0)
+            last = row_count if stop is None else min(stop - position, row_count)
+
+            for chunk_start in range(first, last, chunk_size):
+                chunk_stop = min(chunk_start + chunk_size, last)
+                if grid is not None and len(grid) > 0:
+                    rows = self.parametric_value_rows(project_id, grid, columns, first_serial_index,
+                                                      number_of_rows, chunk_start, chunk_stop)
+                else:
+                    rows = empty_rows
+                extended_rows = self.outer_join_projects_to_parametric_values(project, rows)
+                extended_rows.index = range(position + chunk_start, position + chunk_stop)
+                for _, project_parameters in extended_rows.iterrows():
+                    yield project_parameters
+
+            position += row_count
+
     def outer_join_projects_to_parametric_values(self, project_list, parametric_value_list):
         """
         Consider the dataframe we made in create_parametric_value_list.
@@ -241,12 +479,13 @@ class XlsxReader:
         parametric modifications in the project parameters. It does not
         return a value because dataframes are modified in place.
 
-        Note: This method will modify the dataframes in place. This isn't
-        a problem if the dataframes are returned from
-        XlsxReader.read_all_sheets_from_xlsx.
+        Note: This method will modify the dataframes in place. If
+        project_data_dataframes is a CopyOnWriteSheets, as returned by
+        XlsxDataframeCache.read_all_sheets_from_xlsx, the modified sheets
+        are first replaced with private copies.
 
-        If the dataframe name, column name or row name are not found, an
-        XlsxOperationException is raised.
+        If the dataframe name, column name or row name of a cell that has a
+        value are not found, an XlsxOperationException is raised.
 
         Also, it modifies (once again in plance) the project parameters
         according to the parametrics.
@@ -275,58 +514,112 @@ class XlsxReader:
             is not found. The message is descriptive to help diagnose the
             problem during operation.
         """
-        # This is a regex to match a column name that specifies a change to make
-        # to a cell
-        cell_spec_re = re.compile('^.*/.*/.*$')
+        # The cell specifications are parsed and their rows and columns
+        # found once for all the projects with the same parameter names and
+        # project data. See CellSpecPlan.
+        plan = CellSpecPlan.for_project(project_data_dataframes, project_parameters.index)
+        plan.apply(project_data_dataframes, project_parameters)
+
+    def modified_sheet_names(self, project_parameters):
+        """
+        Finds the names of the project data sheets that the parametric
+        values in project_parameters modify. See
+        modify_project_data_and_project_list() for how the cell
+        specifications are interpreted.
 
-        # Go through each project parameter
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The enhanced project parameters as created by
+            create_parametric_value_list
+
+        Returns
+        -------
+        set
+            Names of the modified sheets. The project list is not included.
+        """
+        result = set()
         for index, value in project_parameters.items():
+            if CellSpecPlan.cell_spec_re.match(index) and not pd.isnull(value):
+                dataframe_name = index.split('/')[0]
+                if dataframe_name != 'project list':
+                    result.add(dataframe_name)
+        return result
 
-            # If the column specifies a cell to change in the dataframe
-            # or project list, inspect it to ensure it points somewhere
-            # valid and change the project list or the dataframe
+    def parametric_project_data_deltas(self, project_parameters, project_id_with_serial):
+        """
+        Lists the modifications that the parametric values in
+        project_parameters make to the project data sheets. Together with
+        the unmodified project data file, these rows are enough to rebuild
+        the project data of the project with apply_parametric_project_data_deltas()
 
-            if cell_spec_re.match(index) and not pd.isnull(value):
-                dataframe_name, row_name, column_name = index.split('/')
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The enhanced project parameters as created by
+            create_parametric_value_list
 
-                # First, branch on whether this a project list parameter
-                # or a dataframe parameter. First, if it is a project list
-                # parameter.
-                if dataframe_name == 'project list':
-                    if column_name not in project_parameters:
-                        raise XlsxOperationException(
-                            f'Column {column_name} not found in project parameters'
-                        )
-                    if not pd.isnull(value):
-                        project_parameters[column_name] = value
-
-                # Second, if it is a dataframe parameter
-                else:
-                    # Check if dataframe exists
-                    if dataframe_name not in project_data_dataframes:
-                        raise XlsxOperationException(
-                            f'Datframe {dataframe_name} not found. Please check the project_data spreadsheet and project_list.')
+        project_id_with_serial : str
+            The project ID with serial of the project.
+
+        Returns
+        -------
+        list
+            A list of dicts, one for each modified cell, with the keys
+            'Project ID with serial', 'Project data file', 'Sheet', 'Row',
+            'Column' and 'Value'.
+        """
+        result = []
+        for index, value in project_parameters.items():
+            if CellSpecPlan.cell_spec_re.match(index) and not pd.isnull(value):
+                dataframe_name, row_name, column_name = index.split('/')
+                if dataframe_name != 'project list':
+                    result.append({
+                        'Project ID with serial': project_id_with_serial,
+                        'Project data file': project_parameters['Project data file'],
+                        'Sheet': dataframe_name,
+                        'Row': row_name,
+                        'Column': column_name,
+                        'Value': value
+                    })
+        return result
 
-                    df = project_data_dataframes[dataframe_name]
-                    first_col = df.columns[0]
+    def apply_parametric_project_data_deltas(self, project_data_dataframes, deltas):
+        """
+        Applies rows created by parametric_project_data_deltas() to project
+        data dataframes. The dataframes are modified in place.
 
-                    # Check if row exists
-                    if df.loc[df[first_col] == row_name].empty:
-                        raise XlsxOperationException(
-                            f'Row {row_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
+        Values that were numeric when the deltas were created may have been
+        read back from a .csv as strings. Values that can be parsed as
+        numbers are therefore converted to numbers.
 
-                    # Check if column exists
-                    if df.loc[df[first_col] == row_name, column_name].empty:
-                        raise XlsxOperationException(
-                            f'Column {column_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys are sheet names and values are dataframes, as returned by
+            XlsxDataframeCache.read_all_sheets_from_xlsx()
 
-                    # If all the above check pass, check to make sure the value is not nan.
-                    # If it is not nan, then a modification needs to be made, either to the
-                    # dataframe or the project list.
-                    if not pd.isnull(value):
-                        df.loc[df[first_col] == row_name, column_name] = value
+        deltas : pandas.DataFrame
+            The rows for one project. It needs the columns 'Sheet', 'Row',
+            'Column' and 'Value'.
 
-    def create_master_input_dictionary(self, project_data_dataframes, project_parameters):
+        Raises
+        ------
+        XlsxOperationException
+            If a sheet, row or column is not found. See
+            modify_project_data_and_project_list()
+        """
+        cell_specs = dict()
+        for _, delta in deltas.iterrows():
+            value = delta['Value']
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                pass
+            cell_specs[f"{delta['Sheet']}/{delta['Row']}/{delta['Column']}"] = value
+        self.modify_project_data_and_project_list(project_data_dataframes, pd.Series(cell_specs, dtype=object))
+
+    def create_master_input_dictionary(self, project_data_dataframes, project_parameters, weather_window=None):
         """
         This method takes a dictionary of dataframes that are the project data
         and unites them with the project parameters as found in the project list
@@ -347,17 +640,132 @@ class XlsxReader:
             See the subclasses of XlsxManagerRunner for examples on how this
             project series is read from a spreadsheet.
 
+        weather_window : pandas.DataFrame
+            The weather window already processed by read_weather_window. If
+            this is None, the weather_window sheet in project_data_dataframes
+            is processed instead. XlsxParallelManagerRunner uses this to pass
+            a weather window that is shared among worker processes.
+
         Returns
         -------
         dict
             An master input dictionary suitable to pass to an instance
             of Manager to run all the cost module sin LandBOSSE.
         """
-        # First, read all inputs that come from .csv or .xlsx files.
-        # erection_input_worksheets come from the input data spreadsheet.
-        # Their string values are the names of the sheets in the Excel
-        # workbook and the keys in the erection_project_data_dict dictionary.
+        incomplete_input_dict = self.project_data_inputs(project_data_dataframes,
+                                                         project_parameters['Labor cost multiplier'])
+        incomplete_input_dict.update(self.project_list_inputs(project_parameters)[0])
 
+        # The weather window is stored on a sheet of the project_data, but
+        # needs preprocessing after it is read. The preprocessing changes it
+        # from wind toolkit format to a dataframe.
+        number_of_months_for_construction = int(project_parameters['Total project construction time (months)'])
+        if weather_window is None:
+            weather_window_intermediate = read_weather_window(project_data_dataframes['weather_window'])
+        else:
+            weather_window_intermediate = weather_window
+        extended_weather_window = extend_weather_window(weather_window_intermediate, number_of_months_for_construction)
+        incomplete_input_dict['weather_window'] = extended_weather_window
+
+        # Now fill any missing values with sensible defaults.
+        defaults = DefaultMasterInputDict()
+        master_input_dict = defaults.populate_input_dict(incomplete_input_dict=incomplete_input_dict)
+        return master_input_dict
+
+    def create_master_input_dictionaries(self, project_data_dataframes, project_list, weather_window=None):
+        """
+        Creates the master input dictionaries of many projects that share
+        the same project data, such as the rows of an extended project list
+        that have no parametric modifications of the project data sheets.
+        Each dictionary is the same as the one create_master_input_dictionary()
+        creates for the project.
+
+        The project list columns are mapped to input keys a column at a
+        time. The inputs derived from the project data, such as the
+        component arrays, the labor rates and the per diem, are built once
+        for each distinct labor cost multiplier and shared by the projects
+        that have it. The weather window is processed once and extended once
+        for each distinct construction time. Each project gets its own copy
+        of the components sheet, which ErectionCost modifies.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            The project data sheets shared by all the projects. They are not
+            modified.
+
+        project_list : pandas.DataFrame
+            One row for each project, with the columns of the project list
+            after the parametric modifications of the project list have
+            been applied.
+
+        weather_window : pandas.DataFrame
+            The weather window already processed by read_weather_window, or
+            None to process the weather_window sheet.
+
+        Returns
+        -------
+        list
+            The master input dictionaries, in the order of the rows of
+            project_list.
+        """
+        if weather_window is None:
+            weather_window = read_weather_window(project_data_dataframes['weather_window'])
+
+        project_data_inputs = dict()
+        extended_weather_windows = dict()
+        labor_cost_multipliers = project_list['Labor cost multiplier'].to_numpy()
+        construction_months = project_list['Total project construction time (months)'].to_numpy()
+        defaults = DefaultMasterInputDict()
+
+        result = []
+        project_list_inputs = self.project_list_inputs(project_list)
+        for labor_cost_multiplier, months, project_inputs in zip(labor_cost_multipliers, construction_months,
+                                                                 project_list_inputs):
+            if labor_cost_multiplier not in project_data_inputs:
+                project_data_inputs[labor_cost_multiplier] = \
+                    self.project_data_inputs(CopyOnWriteSheets(project_data_dataframes), labor_cost_multiplier)
+            incomplete_input_dict = dict(project_data_inputs[labor_cost_multiplier])
+
+            # ErectionCost adds a column to the components sheet, so every
+            # project needs its own copy.
+            erection_project_data_dict = dict(incomplete_input_dict['project_data'])
+            erection_project_data_dict['components'] = erection_project_data_dict['components'].copy()
+            incomplete_input_dict['project_data'] = erection_project_data_dict
+            incomplete_input_dict['component_data'] = erection_project_data_dict['components']
+
+            incomplete_input_dict.update(project_inputs)
+
+            number_of_months_for_construction = int(months)
+            if number_of_months_for_construction not in extended_weather_windows:
+                extended_weather_windows[number_of_months_for_construction] = \
+                    extend_weather_window(weather_window, number_of_months_for_construction)
+            incomplete_input_dict['weather_window'] = extended_weather_windows[number_of_months_for_construction]
+
+            result.append(defaults.populate_input_dict(incomplete_input_dict=incomplete_input_dict))
+        return result
+
+    def project_data_inputs(self, project_data_dataframes, labor_cost_multiplier):
+        """
+        Creates the part of the master input dictionary that comes from the
+        project data sheets. The labor multiplier is applied to the sheets
+        first, see apply_labor_multiplier_to_project_data_dict()
+
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            The project data sheets. The labor rate sheets and the components
+            sheet are modified in place, or replaced by private copies if it
+            is a CopyOnWriteSheets.
+
+        labor_cost_multiplier : float
+            The scalar labor cost multiplier.
+
+        Returns
+        -------
+        dict
+            The input keys derived from the project data.
+        """
         # Incomplete project dict will hold the input dictionary
         # configurations.
         incomplete_input_dict = dict()
@@ -366,8 +774,11 @@ class XlsxReader:
         # The erection module takes in a bunch of keys and values under the
         # 'project_data' key in the incomplete_input_dict
 
+        # Index the rsmeans sheet before the labor multiplier copies it, so
+        # that all projects that share the sheet share the index.
+        rsmeans_index = RSMeansIndex.for_rsmeans(project_data_dataframes['rsmeans'])
+
         # Apply the labor multipliers
-        labor_cost_multiplier = project_parameters['Labor cost multiplier']
         self.apply_labor_multiplier_to_project_data_dict(project_data_dataframes, labor_cost_multiplier)
 
         erection_input_worksheets = [
@@ -380,15 +791,21 @@ class XlsxReader:
             'components'
         ]
 
+        # ErectionCost adds a column to the components sheet, so it needs
+        # a copy that it can modify.
         erection_project_data_dict = dict()
         for worksheet in erection_input_worksheets:
-            erection_project_data_dict[worksheet] = project_data_dataframes[worksheet]
+            if worksheet == 'components':
+                erection_project_data_dict[worksheet] = CopyOnWriteSheets.writable_sheet(project_data_dataframes, worksheet)
+            else:
+                erection_project_data_dict[worksheet] = project_data_dataframes[worksheet]
 
         # Add the erection project data to the incomplete_input_dict
         incomplete_input_dict['project_data'] = erection_project_data_dict
 
         # Get the first set of data
         incomplete_input_dict['rsmeans'] = project_data_dataframes['rsmeans']
+        incomplete_input_dict['rsmeans_index'] = rsmeans_index
         incomplete_input_dict['site_facility_building_area_df'] = project_data_dataframes['site_facility_building_area']
         incomplete_input_dict['material_price'] = project_data_dataframes['material_price']
 
@@ -404,6 +821,48 @@ class XlsxReader:
             incomplete_input_dict[component] = np.array(incomplete_input_dict['component_data'][component])
 
         incomplete_input_dict['cable_specs_pd'] = project_data_dataframes['cable_specs']
+        incomplete_input_dict['crew'] = incomplete_input_dict['project_data']['crew']
+        incomplete_input_dict['crew_cost'] = incomplete_input_dict['project_data']['crew_price']
+
+        #read in RSMeans per diem:
+        crew_cost = incomplete_input_dict['project_data']['crew_price']
+        crew_cost = crew_cost.set_index("Labor type ID", drop=False)
+        incomplete_input_dict['rsmeans_per_diem'] = crew_cost.loc['RSMeans', 'Per diem USD per day']
+
+        return incomplete_input_dict
+
+    def project_list_inputs(self, project_list):
+        """
+        Creates the part of the master input dictionary that comes from the
+        project list, for many projects at once. Each column is read once
+        and the derived inputs, such as the project size, are computed for
+        all the projects together.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame or pandas.Series
+            One row for each project, or the project parameters of a single
+            project.
+
+        Returns
+        -------
+        list
+            A dict of input keys for each project, in the order of the rows.
+        """
+        if isinstance(project_list, pd.Series):
+            column_names = project_list.index
+            number_of_projects = 1
+
+            def column(column_name):
+                return np.array([project_list[column_name]], dtype=object)
+        else:
+            column_names = project_list.columns
+            number_of_projects = len(project_list)
+
+            def column(column_name):
+                return project_list[column_name].astype(object).to_numpy()
+
+        columns = dict()
 
         # For development cost, legacy input data will specify an itemized
         # breakdown in the project data. Newer input data will specify the
@@ -413,105 +872,39 @@ class XlsxReader:
         # absence of a development_labor_cost_usd key in the master input
         # dictionary. In that case, the development cost will be pulled from
         # the prject data.
-        if 'Development labor cost USD' in project_parameters:
-            incomplete_input_dict['development_labor_cost_usd'] = project_parameters['Development labor cost USD']
+        if 'Development labor cost USD' in column_names:
+            columns['development_labor_cost_usd'] = column('Development labor cost USD')
 
         # These columns come from the columns in the project definition .xlsx
-        incomplete_input_dict['project_id'] = project_parameters['Project ID']
-        incomplete_input_dict['crane_breakdown_fraction'] = project_parameters['Crane breakdown fraction']
-        incomplete_input_dict['num_turbines'] = project_parameters['Number of turbines']
-        incomplete_input_dict['construct_duration'] = project_parameters['Total project construction time (months)']
-        incomplete_input_dict['hub_height_meters'] = project_parameters['Hub height m']
-        incomplete_input_dict['rotor_diameter_m'] = project_parameters['Rotor diameter m']
-        incomplete_input_dict['wind_shear_exponent'] = project_parameters['Wind shear exponent']
-        incomplete_input_dict['turbine_rating_MW'] = project_parameters['Turbine rating MW']
-        incomplete_input_dict['breakpoint_between_base_and_topping_percent'] = \
-            project_parameters['Breakpoint between base and topping (percent)']
-        incomplete_input_dict['fuel_usd_per_gal'] = project_parameters['Fuel cost USD per gal']
-        incomplete_input_dict['rate_of_deliveries'] = project_parameters['Rate of deliveries (turbines per week)']
-        incomplete_input_dict['turbine_spacing_rotor_diameters'] = project_parameters['Turbine spacing (times rotor diameter)']
-        incomplete_input_dict['depth'] = project_parameters['Foundation depth m']
-        incomplete_input_dict['rated_thrust_N'] = project_parameters['Rated Thrust (N)']
-        incomplete_input_dict['bearing_pressure_n_m2'] = project_parameters['Bearing Pressure (n/m2)']
-        incomplete_input_dict['gust_velocity_m_per_s'] = project_parameters['50-year Gust Velocity (m/s)']
-        incomplete_input_dict['project_size_megawatts'] = project_parameters['Number of turbines'] * project_parameters['Turbine rating MW']
-
-        if project_parameters['Calculate road cost for distributed wind? (y/n)'] == 'y':
-            incomplete_input_dict['road_distributed_wind'] = True
-        else:
-            incomplete_input_dict['road_distributed_wind'] = False
-        incomplete_input_dict['site_prep_area_m2'] = project_parameters['Site prep area for Distributed wind (m2)']
-        incomplete_input_dict['road_length_adder_m'] = project_parameters['Road length adder (m)']
-        incomplete_input_dict['fraction_new_roads'] = project_parameters['Percent of roads that will be constructed']
-        incomplete_input_dict['road_quality'] = project_parameters['Road Quality (0-1)']
-        incomplete_input_dict['line_frequency_hz'] = project_parameters['Line Frequency (Hz)']
-        incomplete_input_dict['plant_capacity_MW'] = project_parameters['Turbine rating MW'] * project_parameters['Number of turbines']
-        incomplete_input_dict['row_spacing_rotor_diameters'] = project_parameters['Row spacing (times rotor diameter)']
-        incomplete_input_dict['user_defined_distance_to_grid_connection'] = project_parameters['Flag for user-defined home run trench length (0 = no; 1 = yes)']
-        incomplete_input_dict['distance_to_grid_connection_km'] = project_parameters['Combined Homerun Trench Length to Substation (km)']
-        incomplete_input_dict['crew'] = incomplete_input_dict['project_data']['crew']
-        incomplete_input_dict['crew_cost'] = incomplete_input_dict['project_data']['crew_price']
-
-        #read in RSMeans per diem:
-        crew_cost = incomplete_input_dict['project_data']['crew_price']
-        crew_cost = crew_cost.set_index("Labor type ID", drop=False)
-        incomplete_input_dict['rsmeans_per_diem'] = crew_cost.loc['RSMeans', 'Per diem USD per day']
-
-        incomplete_input_dict['fuel_cost_usd_per_gal'] = project_parameters['Fuel cost USD per gal']
-
-        incomplete_input_dict['line_frequency_hz'] = project_parameters['Line Frequency (Hz)']
-        incomplete_input_dict['plant_capacity_MW'] = project_parameters['Turbine rating MW'] * project_parameters['Number of turbines']
-        incomplete_input_dict['row_spacing_rotor_diameters'] = project_parameters['Row spacing (times rotor diameter)']
-        incomplete_input_dict['user_defined_home_run_trench'] = project_parameters[
-            'Flag for user-defined home run trench length (0 = no; 1 = yes)']
-        incomplete_input_dict['trench_len_to_substation_km'] = project_parameters[
-            'Combined Homerun Trench Length to Substation (km)']
-
-        # Add inputs for transmission & Substation modules:
-        incomplete_input_dict['distance_to_interconnect_mi'] = project_parameters['Distance to interconnect (miles)']
-        incomplete_input_dict['interconnect_voltage_kV'] = project_parameters['Interconnect Voltage (kV)']
-        new_switchyard = True
-        if project_parameters['New Switchyard (y/n)'] == 'y':
-            new_switchyard = True
-        else:
-            new_switchyard = False
-        incomplete_input_dict['new_switchyard'] = new_switchyard
-
-        incomplete_input_dict['critical_speed_non_erection_wind_delays_m_per_s'] = project_parameters['Non-Erection Wind Delay Critical Speed (m/s)']
-        incomplete_input_dict['critical_height_non_erection_wind_delays_m'] = project_parameters['Non-Erection Wind Delay Critical Height (m)']
-
-        incomplete_input_dict['road_width_ft'] = project_parameters['Road width (ft)']
-        incomplete_input_dict['road_thickness'] = project_parameters['Road thickness (in)']
-        incomplete_input_dict['crane_width'] = project_parameters['Crane width (m)']
-        incomplete_input_dict['num_hwy_permits'] = project_parameters['Number of highway permits']
-        incomplete_input_dict['num_access_roads'] = project_parameters['Number of access roads']
-        incomplete_input_dict['overtime_multiplier'] = project_parameters['Overtime multiplier']
-        incomplete_input_dict['allow_same_flag'] = True if project_parameters['Allow same flag'] == 'y' else False
-
-        override_total_mgmt_cost_col_name = 'Override total management cost for distributed (0 does not override)'
-        if override_total_mgmt_cost_col_name in project_parameters and project_parameters[override_total_mgmt_cost_col_name] > 0:
-            incomplete_input_dict['override_total_management_cost'] = \
-                project_parameters[override_total_mgmt_cost_col_name]
+        for key, column_name in self.project_list_input_columns:
+            columns[key] = column(column_name)
+
+        num_turbines = columns['num_turbines']
+        turbine_rating_MW = columns['turbine_rating_MW']
+        columns['project_size_megawatts'] = num_turbines * turbine_rating_MW
+        columns['plant_capacity_MW'] = turbine_rating_MW * num_turbines
+        columns['road_distributed_wind'] = [value == 'y' for value in column('Calculate road cost for distributed wind? (y/n)')]
+        columns['new_switchyard'] = [value == 'y' for value in column('New Switchyard (y/n)')]
+        columns['allow_same_flag'] = [value == 'y' for value in column('Allow same flag')]
+
+        if self.override_total_mgmt_cost_col_name in column_names:
+            override_total_management_cost = column(self.override_total_mgmt_cost_col_name)
         else:
-            incomplete_input_dict['markup_contingency'] = project_parameters['Markup contingency']
-            incomplete_input_dict['markup_warranty_management'] = project_parameters['Markup warranty management']
-            incomplete_input_dict['markup_sales_and_use_tax'] = project_parameters['Markup sales and use tax']
-            incomplete_input_dict['markup_overhead'] = project_parameters['Markup overhead']
-            incomplete_input_dict['markup_profit_margin'] = project_parameters['Markup profit margin']
-
-        # The weather window is stored on a sheet of the project_data, but
-        # needs preprocessing after it is read. The preprocessing changes it
-        # from wind toolkit format to a dataframe.
-        number_of_months_for_construction = int(project_parameters['Total project construction time (months)'])
-        weather_window_input = project_data_dataframes['weather_window']
-        weather_window_intermediate = read_weather_window(weather_window_input)
-        extended_weather_window = extend_weather_window(weather_window_intermediate, number_of_months_for_construction)
-        incomplete_input_dict['weather_window'] = extended_weather_window
-
-        # Now fill any missing values with sensible defaults.
-        defaults = DefaultMasterInputDict()
-        master_input_dict = defaults.populate_input_dict(incomplete_input_dict=incomplete_input_dict)
-        return master_input_dict
+            override_total_management_cost = None
+        markup_columns = None
+
+        result = []
+        for index in range(number_of_projects):
+            project_inputs = {key: values[index] for key, values in columns.items()}
+            if override_total_management_cost is not None and override_total_management_cost[index] > 0:
+                project_inputs['override_total_management_cost'] = override_total_management_cost[index]
+            else:
+                if markup_columns is None:
+                    markup_columns = {key: column(column_name) for key, column_name in self.markup_input_columns}
+                for key, values in markup_columns.items():
+                    project_inputs[key] = values[index]
+            result.append(project_inputs)
+        return result
 
     def apply_labor_multiplier_to_project_data_dict(self, project_data_dict, labor_cost_multiplier):
         """
@@ -524,7 +917,7 @@ class XlsxReader:
 
         For the rsmeans dataframe, rows that have "Labor" for the "Type of cost"
         column are found and, for those rows, the values in the "Rate USD per unit"
-        column is multiplied by the multiplier
+        column is multiplied by the multiplier. See rsmeans_labor_rates()
 
         The dataframes are modified in place.
 
@@ -536,31 +929,55 @@ class XlsxReader:
         labor_cost_multiplier : float
             The scalar labor cost multiplier.
         """
-        crew_price = project_data_dict['crew_price']
+        crew_price = CopyOnWriteSheets.writable_sheet(project_data_dict, 'crew_price')
         crew_price_new_hourly_rates = crew_price['Hourly rate USD per hour'] * labor_cost_multiplier
         crew_price_new_per_diem_rates = crew_price['Per diem USD per day'] * labor_cost_multiplier
         crew_price['Hourly rate USD per hour'] = crew_price_new_hourly_rates
         crew_price['Per diem USD per day'] = crew_price_new_per_diem_rates
 
-        rsmeans = project_data_dict['rsmeans']
-
-        # This function maps new labor rates in rsmeans. Used with an apply()
-        # call, it will create a new Series that can be mapped back onto the
-        # original dataframe.
-        #
-        # If the column "Type of cost" is "Labor" then return the current cost
-        # times the labor multiplier. If "Type of cost" isn't "Labor" then
-        # just return the current cost.
-        def map_labor_rates(row):
-            if row['Type of cost'] == 'Labor':
-                return row['Rate USD per unit'] * labor_cost_multiplier
-            else:
-                return row['Rate USD per unit']
-
-        rsmeans_new_labor_rates = rsmeans.apply(map_labor_rates, axis=1)
+        rsmeans = CopyOnWriteSheets.writable_sheet(project_data_dict, 'rsmeans')
+        rsmeans_new_labor_rates = self.rsmeans_labor_rates(rsmeans, [labor_cost_multiplier])[0]
         rsmeans.drop(columns=['Rate USD per unit'], inplace=True)
         rsmeans['Rate USD per unit'] = rsmeans_new_labor_rates
 
+    @staticmethod
+    def rsmeans_labor_rates(rsmeans, labor_cost_multipliers):
+        """
+        Computes the "Rate USD per unit" column of the rsmeans sheet for
+        several labor cost multipliers at once. Rows that have "Labor" for
+        the "Type of cost" column have their rate multiplied by each
+        multiplier and the other rows keep their rate.
+
+        The rsmeans sheet is not modified. A sweep over the labor cost
+        multiplier can compute the rates of all its projects from one
+        shared sheet, and copy only this column for each project.
+
+        Parameters
+        ----------
+        rsmeans : pd.DataFrame
+            The rsmeans sheet before any labor multiplier is applied.
+
+        labor_cost_multipliers : pd.Series or list
+            The scalar labor cost multipliers.
+
+        Returns
+        -------
+        pd.DataFrame
+            The index is the index of rsmeans and there is one column of
+            rates for each multiplier. The columns are labeled with the
+            index of labor_cost_multipliers if it is a Series, or with the
+            position of each multiplier otherwise.
+        """
+        if isinstance(labor_cost_multipliers, pd.Series):
+            columns = labor_cost_multipliers.index
+        else:
+            columns = pd.RangeIndex(len(labor_cost_multipliers))
+        multipliers = np.asarray(labor_cost_multipliers, dtype=float)
+        rates = rsmeans['Rate USD per unit'].to_numpy(dtype=float)
+        is_labor = (rsmeans['Type of cost'] == 'Labor').to_numpy()
+        labor_rates = np.where(is_labor[:, np.newaxis], rates[:, np.newaxis] * multipliers, rates[:, np.newaxis])
+        return pd.DataFrame(labor_rates, index=rsmeans.index, columns=columns)
+
     def apply_cost_and_scaling_modifications_to_project_parameters(self, project_parameters):
         """
         This applies the cost and scaling modification to project parameters
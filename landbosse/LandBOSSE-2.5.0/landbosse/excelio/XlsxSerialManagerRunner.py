@@ -1,14 +1,14 @@
-from collections import OrderedDict
 import os
 
 import pandas as pd
 
 from ..model import Manager
-from .XlsxFileOperations import XlsxFileOperations
+from ..model import ResultCache
 from .XlsxReader import XlsxReader
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxGenerator import XlsxGenerator
+from .CsvResultSink import CsvResultSink
 
 
 class XlsxSerialManagerRunner(XlsxManagerRunner):
@@ -17,6 +17,10 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
     in a serial loop.
     """
 
+    # The number of projects whose master input dictionaries are created
+    # together. See XlsxManagerRunner.master_input_dictionaries()
+    batch_size = 64
+
     def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False):
         """
         This function runs all the scenarios in the projects_xlsx file. It creates
@@ -41,25 +45,16 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
 
         Returns
         -------
-        OrderedDict, list, list, list
-            First element of tuple is an ordered dict that is the result of
-            all the runs. Each key is the name of a project and each value
-            is the output dictionary of that project. The second element
-            is the list of rows for the csv. The third element is the list
-            of costs for the spreadsheets. The fourth element is the same as
-            module_type_operation_lists, but every row has all the inputs
-            on each row.
+        dict
+            The key 'module_type_operation_list' has the list of costs for
+            the spreadsheets, 'details_row_count' has the number of rows
+            written to landbosse-details.csv and 'extended_project_list'
+            has the project parameters after the parametric modifications.
         """
         # Load the project list
-        extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
+        _, extended_project_list_before_parameter_modifications = self.generate_extended_project_list()
         print('>>> Project and parametric lists loaded')
 
-        # For file operations
-        file_ops = XlsxFileOperations()
-
-        # Get the output dictionary ready
-        runs_dict = OrderedDict()
-
         # Instantiate and XlsxReader to assemble master input dictionary
         xlsx_reader = XlsxReader()
 
@@ -71,59 +66,106 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
         # for why this is more performant than appending to a dataframe.
         extended_project_list_after_parameter_modifications = []
 
-        # Loop over every project
-        for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
-
-            # If project_parameters['Project ID with serial'] is null, that means there are no
-            # parametric modifications to the project data dataframes. Hence,
-            # just the plain Project ID without a serial number should be used.
-            if pd.isnull(project_parameters['Project ID with serial']):
-                project_id_with_serial = project_parameters['Project ID']
-            else:
-                project_id_with_serial = project_parameters['Project ID with serial']
-
-            project_data_basename = project_parameters['Project data file']
-
-            # Input path for unmodified project input data.
-            project_data_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
-
-            # Log each project
-            print(f'<><><><><><><><><><><><><><><><><><> {project_id_with_serial} <><><><><><><><><><><><><><><><><><>')
-            print('>>> project_id: {}'.format(project_id_with_serial))
-            print('>>> Project data: {}'.format(project_data_xlsx))
-
-            # Read the project data sheets.
-            project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
-
-            # Transform the dataframes so that they have the right values for
-            # the parametric variables.
-            xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_parameters)
-
-            # Apply cost and scaling modifications if needed.
-            if enable_cost_and_scaling_modifications:
-                xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
-
-            # Append the modified project parameters
-            extended_project_list_after_parameter_modifications.append(project_parameters)
-
-            # Write all project_data sheets
-            parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
-
-            # Create the master input dictionary.
-            master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
-
-            # Now run the manager and accumulate its result into the runs_dict
-            output_dict = dict()
-            mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
-            mc.execute_landbosse(project_name=project_id_with_serial)
-            output_dict['project_series'] = project_parameters
-            runs_dict[project_id_with_serial] = output_dict
+        # How to export the modified project data, and the modifications of
+        # all the projects if only the modifications are exported.
+        project_data_export_mode = self.file_ops.project_data_export_mode()
+        parametric_project_data_deltas = []
+
+        # Results of projects that have been run before, if enabled
+        result_cache_dir = self.file_ops.result_cache_dir()
+        result_cache = ResultCache(result_cache_dir) if result_cache_dir is not None else None
+
+        # Whether cost modules reuse the results of earlier projects
+        reuse_module_results = self.file_ops.reuse_module_results()
+
+        # The projects that have been through the parametric modifications
+        # but have not run yet. Each item is a tuple of the project ID with
+        # serial, the project data basename, the project data sheets and the
+        # project parameters.
+        pending_projects = []
+
+        def run_pending_projects():
+            master_input_dicts = self.master_input_dictionaries([
+                (project_data_basename, project_data_sheets, project_parameters, None)
+                for _, project_data_basename, project_data_sheets, project_parameters in pending_projects
+            ])
+            for (project_id_with_serial, _, _, project_parameters), master_input_dict in \
+                    zip(pending_projects, master_input_dicts):
+                # Now run the manager and write its result to the .csv files
+                output_dict = dict()
+                mc = Manager(input_dict=master_input_dict, output_dict=output_dict, result_cache=result_cache,
+                             reuse_module_results=reuse_module_results)
+                mc.execute_landbosse(project_name=project_id_with_serial)
+                output_dict['project_series'] = project_parameters
+                sink.add_project(self.project_result(project_id_with_serial, output_dict))
+            pending_projects.clear()
+
+        # The results of each batch of projects are written to the .csv files
+        # as soon as the batch has run.
+        with CsvResultSink(self.file_ops) as sink:
+            # Loop over every project
+            for project_parameters in extended_project_list_before_parameter_modifications:
+
+                # If project_parameters['Project ID with serial'] is null, that means there are no
+                # parametric modifications to the project data dataframes. Hence,
+                # just the plain Project ID without a serial number should be used.
+                if pd.isnull(project_parameters['Project ID with serial']):
+                    project_id_with_serial = project_parameters['Project ID']
+                else:
+                    project_id_with_serial = project_parameters['Project ID with serial']
+
+                project_data_basename = project_parameters['Project data file']
+
+                # Input path for unmodified project input data.
+                project_data_xlsx = os.path.join(self.file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
+
+                # Log each project
+                print(f'<><><><><><><><><><><><><><><><><><> {project_id_with_serial} <><><><><><><><><><><><><><><><><><>')
+                print('>>> project_id: {}'.format(project_id_with_serial))
+                print('>>> Project data: {}'.format(project_data_xlsx))
+
+                # Read the project data sheets.
+                project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+
+                # Transform the dataframes so that they have the right values for
+                # the parametric variables.
+                xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_parameters)
+
+                # Apply cost and scaling modifications if needed.
+                if enable_cost_and_scaling_modifications:
+                    xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+
+                # Append the modified project parameters
+                extended_project_list_after_parameter_modifications.append(project_parameters)
+
+                # Write all project_data sheets, or just log the modifications
+                if project_data_export_mode == 'xlsx':
+                    parametric_project_data_path = \
+                        os.path.join(self.file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
+                    XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
+                elif project_data_export_mode == 'deltas':
+                    parametric_project_data_deltas.extend(
+                        xlsx_reader.parametric_project_data_deltas(project_parameters, project_id_with_serial))
+
+                # The master input dictionaries are created, and the projects
+                # run, a batch at a time.
+                pending_projects.append((project_id_with_serial, project_data_basename, project_data_sheets,
+                                         project_parameters))
+                if len(pending_projects) == self.batch_size:
+                    run_pending_projects()
+
+            if len(pending_projects) > 0:
+                run_pending_projects()
+
+        if project_data_export_mode == 'deltas':
+            self.write_parametric_project_data_deltas(parametric_project_data_deltas)
+
+        if result_cache is not None:
+            print(f'>>> Result cache: {result_cache.hits} hits, {result_cache.misses} misses')
 
         final_result = dict()
-        final_result['details_list'] = self.extract_details_lists(runs_dict)
-        final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
+        final_result['details_row_count'] = sink.details_row_count
+        final_result['module_type_operation_list'] = sink.module_type_operation_list
         final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
 
         # Return the runs for all the projects.
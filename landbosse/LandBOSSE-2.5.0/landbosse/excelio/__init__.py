@@ -7,3 +7,9 @@ from .XlsxFileOperations import XlsxFileOperations
 from .XlsxValidator import XlsxValidator
 from .XlsxDataframeCache import XlsxDataframeCache
 from .CsvGenerator import CsvGenerator
+from .SharedDataFrame import SharedDataFrame
+from .CopyOnWriteSheets import CopyOnWriteSheets
+from .ParametricGrid import ParametricGrid
+from .ParametricSample import ParametricSample
+from .CsvResultSink import CsvResultSink
+from .CellSpecPlan import CellSpecPlan
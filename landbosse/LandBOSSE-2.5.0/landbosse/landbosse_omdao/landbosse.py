@@ -323,6 +323,9 @@ class LandBOSSE_API(om.ExplicitComponent):
         )
 
         self.add_discrete_output("erection_crane_choice", desc="The crane choices for erection.", val=None)
+        self.add_discrete_output(
+            "erection_crane_alternatives", desc="The least cost crane alternatives for erection.", val=None
+        )
 
         self.add_discrete_output(
             "erection_component_name_topvbase",
@@ -559,6 +562,7 @@ class LandBOSSE_API(om.ExplicitComponent):
             pandas.DataFrame)
         """
         discrete_outputs["erection_crane_choice"] = master_output_dict["crane_choice"]
+        discrete_outputs["erection_crane_alternatives"] = master_output_dict["crane_alternatives"]
         discrete_outputs["erection_component_name_topvbase"] = master_output_dict["component_name_topvbase"]
 
     def compute_total_bos_costs(self, costs_by_module_type_operation, master_output_dict, inputs, outputs):
@@ -0,0 +1,530 @@
+import numpy as np
+import pandas as pd
+import scipy.interpolate
+
+
+class ClosedFormCostBatch:
+    """
+    This class computes the closed form cost modules for many projects at
+    once with NumPy. SubstationCost, GridConnectionCost, TransportCost,
+    DevelopmentCost and ManagementCost are curve fits of a few scalars of
+    each project, so a whole project list can be computed in one pass over
+    columns instead of one project at a time through the module classes.
+
+    The projects are the rows of a dataframe whose columns have the same
+    names as the keys of the master input dictionary, such as
+    'num_turbines' and 'interconnect_voltage_kV', plus a
+    'project_id_with_serial' column. Only the columns needed by the methods
+    that are called must be present. from_input_dicts() makes this
+    dataframe from master input dictionaries.
+
+    The costs are the same as those computed by the module classes, and
+    module_type_operation_frame() returns the same rows as the
+    '_module_type_operation' lists of the modules, as a dataframe.
+    """
+
+    # Columns of the frames returned by module_type_operation_frame(), in
+    # the order of the keys of the rows made by the module classes.
+    module_type_operation_columns = [
+        'operation_id',
+        'type_of_cost',
+        'raw_cost',
+        'turbine_rating_MW',
+        'num_turbines',
+        'rotor_diameter_m',
+        'project_id_with_serial',
+        'module',
+        'raw_cost_total_or_per_turbine',
+        'cost_per_turbine',
+        'cost_per_project',
+        'usd_per_kw_per_project',
+    ]
+
+    # The types of cost of DevelopmentCost when a development labor cost is
+    # given. Only the labor cost is not zero.
+    development_types_of_cost = ['Equipment rental', 'Labor', 'Materials', 'Mobilization', 'Other']
+
+    # The types of cost of ManagementCost, with the keys of their values in
+    # the dictionary returned by management_costs_usd()
+    management_types_of_cost = [
+        ('insurance', 'insurance_usd'),
+        ('Construction Permitting', 'construction_permitting_usd'),
+        ('Project Management', 'project_management_usd'),
+        ('Bonding', 'bonding_usd'),
+        ('Markup Contingency', 'markup_contingency_usd'),
+        ('Engineering Foundation and Collections System (includes met mast)', 'engineering_usd'),
+        ('Site Facility', 'site_facility_usd'),
+    ]
+
+    def __init__(self, projects):
+        """
+        Parameters
+        ----------
+        projects : pd.DataFrame
+            One row for each project. See the class docstring.
+        """
+        self.projects = projects.reset_index(drop=True)
+        self._site_facility_building_area_df = None
+
+    @classmethod
+    def from_input_dicts(cls, input_dicts):
+        """
+        Makes a batch from master input dictionaries. The scalar values of
+        the dictionaries become columns, and the site_facility_building_area_df
+        of the dictionaries becomes the one of the batch.
+
+        Parameters
+        ----------
+        input_dicts : dict
+            Keys are project IDs with serial and values are master input
+            dictionaries, in the order of the projects.
+
+        Returns
+        -------
+        ClosedFormCostBatch
+            The batch of the projects.
+
+        Raises
+        ------
+        ValueError
+            If the projects do not all have the same
+            site_facility_building_area_df.
+        """
+        rows = []
+        site_facility_building_area_df = None
+        for project_id_with_serial, input_dict in input_dicts.items():
+            row = {key: value for key, value in input_dict.items() if np.isscalar(value) or value is None}
+            row['project_id_with_serial'] = project_id_with_serial
+            rows.append(row)
+
+            df = input_dict.get('site_facility_building_area_df')
+            if df is None:
+                continue
+            if site_facility_building_area_df is None:
+                site_facility_building_area_df = df
+            elif df is not site_facility_building_area_df and not df.equals(site_facility_building_area_df):
+                raise ValueError('Every project in a batch needs the same site_facility_building_area_df')
+
+        batch = cls(pd.DataFrame(rows))
+        batch.site_facility_building_area_df = site_facility_building_area_df
+        return batch
+
+    def column(self, name):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of a column of the projects.
+
+        Returns
+        -------
+        np.ndarray
+            The values of the column as floats.
+        """
+        return self.projects[name].to_numpy(dtype=float)
+
+    def substation_cost_usd(self):
+        """
+        Returns
+        -------
+        np.ndarray
+            The substation cost of each project. See SubstationCost.
+        """
+        num_turbines = self.column('num_turbines')
+        interconnect_voltage_kV = self.column('interconnect_voltage_kV')
+        project_size_megawatts = self.column('project_size_megawatts')
+
+        # Projects with 10 or fewer turbines are distributed wind and have
+        # no substation.
+        utility_cost = 11652 * (interconnect_voltage_kV + project_size_megawatts) + \
+            11795 * (project_size_megawatts ** 0.3549) + 1526800
+        return np.where(num_turbines > 10, utility_cost, 0.0)
+
+    def grid_connection_cost_usd(self):
+        """
+        Returns
+        -------
+        np.ndarray
+            The transmission and distribution cost of each project. See
+            GridConnectionCost.
+        """
+        num_turbines = self.column('num_turbines')
+        turbine_rating_MW = self.column('turbine_rating_MW')
+        distance_to_interconnect_mi = self.column('distance_to_interconnect_mi')
+        interconnect_voltage_kV = self.column('interconnect_voltage_kV')
+        new_switchyard = self.projects['new_switchyard'].to_numpy() == True
+
+        # Utility scale projects are larger than 15 MW.
+        interconnect_adder_usd = np.where(new_switchyard, 18115 * interconnect_voltage_kV + 165944, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            utility_cost = (
+                (1176 * interconnect_voltage_kV + 218257)
+                * (distance_to_interconnect_mi ** (-0.1063))
+                * distance_to_interconnect_mi
+            ) + interconnect_adder_usd
+        utility_cost = np.where(distance_to_interconnect_mi == 0, 0.0, utility_cost)
+
+        tower_to_point_of_interconnection_usd_per_kw = 1736.7 * ((num_turbines * turbine_rating_MW * 1000) ** (-0.272))
+        distributed_cost = num_turbines * turbine_rating_MW * 1000 * tower_to_point_of_interconnection_usd_per_kw
+
+        return np.where(turbine_rating_MW * num_turbines > 15, utility_cost, distributed_cost)
+
+    def transport_cost_usd(self):
+        """
+        Returns
+        -------
+        np.ndarray
+            The transport cost of each project. See TransportCost.
+        """
+        blade_length = 0.5 * self.column('rotor_diameter_m')
+        num_turbines = self.column('num_turbines')
+
+        xlen = np.array([-500., 0., 65., 75., 95., 115.])
+        ycost = 1e3 * np.array([0.0, 0.0, 52., 70., 120., 171.])
+        yinfra = 1e6 * np.array([0.0, 0.0, 0.0, 0.2, 1.0, 5.0])
+        cost_per_blade = scipy.interpolate.interp1d(
+            xlen, ycost, fill_value='extrapolate', assume_sorted=True
+        )(blade_length)
+        cost_infra = scipy.interpolate.interp1d(
+            xlen, yinfra, fill_value='extrapolate', assume_sorted=True
+        )(blade_length)
+
+        # 3 blades and 1 tower for each turbine
+        return 4 * cost_per_blade * num_turbines + cost_infra
+
+    def development_cost_usd(self):
+        """
+        Returns
+        -------
+        np.ndarray
+            The development labor cost of each project. The batch only
+            supports projects that have a 'development_labor_cost_usd'. See
+            DevelopmentCost.
+
+        Raises
+        ------
+        ValueError
+            If a project does not have a development labor cost.
+        """
+        if 'development_labor_cost_usd' not in self.projects.columns or \
+                self.projects['development_labor_cost_usd'].isnull().any():
+            raise ValueError('Every project in a batch needs a development_labor_cost_usd')
+        return self.column('development_labor_cost_usd')
+
+    def management_costs_usd(self):
+        """
+        Computes the management costs. Besides the project parameters, the
+        projects need the columns 'project_value_usd', 'foundation_cost_usd'
+        and 'actual_construction_months', which come from the other
+        modules, and the batch needs a site_facility_building_area_df.
+        Projects with a non null 'override_total_management_cost' are in
+        distributed mode: all their costs are zero except the total, and
+        they do not need the markups or the columns above. See
+        ManagementCost.
+
+        Returns
+        -------
+        dict
+            Keys are the output keys of ManagementCost, such as
+            'insurance_usd', and 'total_management_cost'. Values are arrays
+            with the cost of each project.
+        """
+        if 'override_total_management_cost' in self.projects.columns:
+            override = self.column('override_total_management_cost')
+            in_distributed_mode = ~np.isnan(override)
+        else:
+            override = None
+            in_distributed_mode = np.zeros(len(self.projects), dtype=bool)
+        in_utility_mode = ~in_distributed_mode
+
+        project_size_megawatts = self.column('project_size_megawatts')
+        num_turbines = self.column('num_turbines')
+        project_value_usd = self.utility_column('project_value_usd', in_utility_mode)
+        hub_height_meters = self.utility_column('hub_height_meters', in_utility_mode)
+        actual_construction_months = self.utility_column('actual_construction_months', in_utility_mode)
+
+        result = dict()
+        result['insurance_usd'] = 0.0056 * project_value_usd
+        result['construction_permitting_usd'] = 0.02 * self.utility_column(
+            'foundation_cost_usd', in_utility_mode
+        ) + 20000 * self.utility_column('num_hwy_permits', in_utility_mode)
+        result['project_management_usd'] = np.where(
+            actual_construction_months < 28,
+            (53.333 * actual_construction_months**2 - 3442 * actual_construction_months + 209542)
+            * (actual_construction_months + 2),
+            (actual_construction_months + 2) * 155000,
+        )
+        result['bonding_usd'] = 0.01 * project_value_usd
+        result['markup_contingency_usd'] = (
+            self.utility_column('markup_contingency', in_utility_mode)
+            + self.utility_column('markup_warranty_management', in_utility_mode)
+            + self.utility_column('markup_sales_and_use_tax', in_utility_mode)
+            + self.utility_column('markup_overhead', in_utility_mode)
+            + self.utility_column('markup_profit_margin', in_utility_mode)
+        ) * project_value_usd
+
+        # Engineering for foundations and collection system, and met masts.
+        # Python's round() and np.round() both round halves to even.
+        development_engineering_cost = (
+            7188.5 * num_turbines
+            + np.round(3.4893 * np.log(num_turbines) - 7.3049, 0) * 16800
+            + np.where(project_size_megawatts < 200, 165675, 327250)
+        )
+        met_masts_per_100_megawatts = np.round(project_size_megawatts / 100)
+        num_perm_met_mast = np.select(
+            [(30 <= project_size_megawatts) & (project_size_megawatts <= 100),
+             (100 < project_size_megawatts) & (project_size_megawatts <= 300),
+             project_size_megawatts > 300],
+            [2, 2, met_masts_per_100_megawatts],
+            1
+        )
+        num_temp_met_mast = np.select(
+            [(30 <= project_size_megawatts) & (project_size_megawatts <= 100),
+             (100 < project_size_megawatts) & (project_size_megawatts <= 300),
+             project_size_megawatts > 300],
+            [2, 4, met_masts_per_100_megawatts * 2],
+            1
+        )
+        multiplier_perm = np.where(hub_height_meters < 90, 232600, 290000)
+        multiplier_temp = np.where(hub_height_meters < 90, 92600, 116800)
+        met_mast_cost = (num_perm_met_mast * multiplier_perm) + (num_temp_met_mast * multiplier_temp) + 200000
+        result['engineering_usd'] = development_engineering_cost + met_mast_cost
+
+        # Projects in distributed mode may be outside of the building areas.
+        result['site_facility_usd'] = np.zeros(len(self.projects))
+        if in_utility_mode.any():
+            result['site_facility_usd'][in_utility_mode] = self.site_facility_cost_usd(
+                project_size_megawatts[in_utility_mode],
+                num_turbines[in_utility_mode],
+                actual_construction_months[in_utility_mode],
+            )
+
+        result['total_management_cost'] = (
+            result['insurance_usd']
+            + result['construction_permitting_usd']
+            + result['bonding_usd']
+            + result['project_management_usd']
+            + result['markup_contingency_usd']
+            + result['engineering_usd']
+            + result['site_facility_usd']
+        )
+
+        if in_distributed_mode.any():
+            for key in result.keys():
+                result[key] = np.where(in_distributed_mode, 0.0, result[key])
+            result['total_management_cost'] = np.where(in_distributed_mode, override, result['total_management_cost'])
+
+        return result
+
+    def utility_column(self, name, in_utility_mode):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of a column that only projects in utility mode need,
+            such as 'markup_contingency'.
+
+        in_utility_mode : np.ndarray
+            True for each project that is not in distributed mode.
+
+        Returns
+        -------
+        np.ndarray
+            The values of the column as floats for the projects in utility
+            mode, and 0 for the others. The column may be missing when no
+            project is in utility mode.
+        """
+        if not in_utility_mode.any():
+            return np.zeros(len(self.projects))
+        return np.where(in_utility_mode, self.column(name), 0.0)
+
+    def site_facility_cost_usd(self, project_size_megawatts, num_turbines, actual_construction_months):
+        """
+        Parameters
+        ----------
+        project_size_megawatts : np.ndarray
+            The size of each project.
+
+        num_turbines : np.ndarray
+            The number of turbines of each project.
+
+        actual_construction_months : np.ndarray
+            The construction time of each project.
+
+        Returns
+        -------
+        np.ndarray
+            The site facility and security cost of each project. See
+            ManagementCost.site_facility()
+
+        Raises
+        ------
+        ValueError
+            If the size of a project is not in exactly one row of the
+            building area dataframe.
+        """
+        df = self.site_facility_building_area_df
+        size_min = df['Size Min (MW)'].to_numpy(dtype=float)
+        size_max = df['Size Max (MW)'].to_numpy(dtype=float)
+        building_area = df['Building area (sq. ft.)'].to_numpy(dtype=float)
+
+        # One row for each project and one column for each building size
+        in_row = (size_max[np.newaxis, :] > project_size_megawatts[:, np.newaxis]) & \
+                 (size_min[np.newaxis, :] <= project_size_megawatts[:, np.newaxis])
+        if not (in_row.sum(axis=1) == 1).all():
+            raise ValueError('The size of every project must be in exactly one row of site_facility_building_area_df')
+        building_area_sq_ft = building_area[in_row.argmax(axis=1)]
+
+        construction_building_cost = building_area_sq_ft * 125 + 176125
+
+        nr = np.where(num_turbines < 30, 1, np.round(0.05 * num_turbines))
+        acs = np.select([num_turbines < 30, num_turbines < 100], [30000, 240000], 390000)
+        compound_security_cost = (
+            9825 * nr + 29850 * actual_construction_months + acs + 60 * project_size_megawatts + 62400
+        )
+
+        return construction_building_cost + compound_security_cost
+
+    @property
+    def site_facility_building_area_df(self):
+        """
+        The building area dataframe of ManagementCost. It must be the same for
+        all the projects. from_input_dicts() sets it from the master input
+        dictionaries. Otherwise it can be set on the batch, or be the first
+        value of a 'site_facility_building_area_df' column of the projects.
+        """
+        if self._site_facility_building_area_df is None:
+            self._site_facility_building_area_df = self.projects['site_facility_building_area_df'].iloc[0]
+        return self._site_facility_building_area_df
+
+    @site_facility_building_area_df.setter
+    def site_facility_building_area_df(self, df):
+        self._site_facility_building_area_df = df
+
+    def module_type_operation_frame(self, module, operation_id, types_of_cost, raw_costs):
+        """
+        Makes the cost rows of a module for all the projects. All the costs
+        are totals for the project, like those of the closed form modules.
+
+        Parameters
+        ----------
+        module : str
+            The name of the module, such as 'SubstationCost'
+
+        operation_id : str
+            The phase of construction of all the rows.
+
+        types_of_cost : list
+            The type of cost of each row of a project.
+
+        raw_costs : list
+            For each type of cost, the array of its costs for each project.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row for each type of cost of each project, in project order.
+            The columns are module_type_operation_columns.
+        """
+        number_of_projects = len(self.projects)
+        number_of_types = len(types_of_cost)
+
+        # Rows are ordered by project, then by type of cost.
+        raw_cost = np.column_stack([np.broadcast_to(np.asarray(costs, dtype=float), (number_of_projects,))
+                                    for costs in raw_costs]).ravel()
+        num_turbines = np.repeat(self.projects['num_turbines'].to_numpy(), number_of_types)
+        turbine_rating_MW = np.repeat(self.projects['turbine_rating_MW'].to_numpy(), number_of_types)
+        project_size_kw = num_turbines * turbine_rating_MW * 1000
+
+        frame = pd.DataFrame({
+            'operation_id': operation_id,
+            'type_of_cost': np.tile(np.array(types_of_cost, dtype=object), number_of_projects),
+            'raw_cost': raw_cost,
+            'turbine_rating_MW': turbine_rating_MW,
+            'num_turbines': num_turbines,
+            'rotor_diameter_m': np.repeat(self.projects['rotor_diameter_m'].to_numpy(), number_of_types),
+            'project_id_with_serial': np.repeat(self.projects['project_id_with_serial'].to_numpy(), number_of_types),
+            'module': module,
+            'raw_cost_total_or_per_turbine': 'total',
+            'cost_per_turbine': raw_cost / num_turbines,
+            'cost_per_project': raw_cost,
+            'usd_per_kw_per_project': raw_cost / project_size_kw,
+        }, columns=self.module_type_operation_columns)
+        return frame
+
+    def module_type_operation_frames(self, include_management=False):
+        """
+        Computes the closed form modules for all the projects.
+
+        Parameters
+        ----------
+        include_management : bool
+            If True, ManagementCost is included, which needs the columns
+            described in management_costs_usd()
+
+        Returns
+        -------
+        pd.DataFrame
+            The cost rows of SubstationCost, GridConnectionCost,
+            TransportCost and DevelopmentCost, and optionally ManagementCost,
+            for all the projects. Rows are grouped by module.
+        """
+        frames = [
+            self.module_type_operation_frame('SubstationCost', 'Substation', ['Other'], [self.substation_cost_usd()]),
+            self.module_type_operation_frame('GridConnectionCost', 'Transmission and Distribution', ['Other'],
+                                             [self.grid_connection_cost_usd()]),
+            self.module_type_operation_frame('TransportCost', 'Transport', ['Other'], [self.transport_cost_usd()]),
+        ]
+
+        development_cost_usd = self.development_cost_usd()
+        frames.append(
+            self.module_type_operation_frame(
+                'DevelopmentCost',
+                'Development',
+                self.development_types_of_cost,
+                [
+                    development_cost_usd if type_of_cost == 'Labor' else 0.0
+                    for type_of_cost in self.development_types_of_cost
+                ],
+            )
+        )
+
+        if include_management:
+            frames.append(self.management_module_type_operation_frame())
+
+        return pd.concat(frames, ignore_index=True)
+
+    def management_module_type_operation_frame(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            The cost rows of ManagementCost for all the projects. Projects in
+            distributed mode have a single 'total_management_cost' row, like
+            ManagementCost.outputs_for_module_type_operation()
+        """
+        management_costs_usd = self.management_costs_usd()
+        frame = self.module_type_operation_frame(
+            'ManagementCost',
+            'Management',
+            [type_of_cost for type_of_cost, _ in self.management_types_of_cost],
+            [management_costs_usd[key] for _, key in self.management_types_of_cost]
+        )
+        if 'override_total_management_cost' not in self.projects.columns:
+            return frame
+
+        in_distributed_mode = self.projects['override_total_management_cost'].notnull().to_numpy()
+        if not in_distributed_mode.any():
+            return frame
+
+        distributed_frame = self.module_type_operation_frame(
+            'ManagementCost', 'Management', ['total_management_cost'], [management_costs_usd['total_management_cost']])
+        number_of_types = len(self.management_types_of_cost)
+        frame['project_index'] = np.repeat(np.arange(len(self.projects)), number_of_types)
+        distributed_frame['project_index'] = np.arange(len(self.projects))
+        frame = pd.concat([
+            frame[~np.repeat(in_distributed_mode, number_of_types)],
+            distributed_frame[in_distributed_mode]
+        ])
+        frame = frame.sort_values('project_index', kind='stable')
+        return frame.drop(columns='project_index').reset_index(drop=True)
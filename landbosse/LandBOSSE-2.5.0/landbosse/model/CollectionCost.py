@@ -18,6 +18,7 @@ import traceback
 import pandas as pd
 
 from .CostModule import CostModule
+from .RSMeansIndex import RSMeansIndex
 from .WeatherDelay import WeatherDelay as WD
 
 
@@ -54,8 +55,23 @@ class Cable:
         cable_power : float
             Maximum 3-phase power dissipated in cable, MW
 
+    The characteristic impedance, power factor and cable power depend only
+    on the cable specifications and the line frequency, so they are
+    computed once for each cable type and frequency and held in a class
+    level cache shared by all the projects in a process.
     """
 
+    # _electrical_properties_cache is a class attribute that holds the
+    # characteristic impedance, power factor and cable power of each cable,
+    # keyed by the electrical specifications of the cable and the line
+    # frequency. NaN specifications are keyed as None, since NaN is not
+    # equal to itself.
+    _electrical_properties_cache = {}
+
+    # The maximum number of cables held at once. When it is reached, the
+    # oldest cable is evicted.
+    _max_entries = 32
+
     def __init__(self, cable_specs, addl_specs):
         """
         Parameters
@@ -80,9 +96,20 @@ class Cable:
 
 
         # Calc additional cable specs
-        self.calc_char_impedance(self.line_frequency_hz)
-        self.calc_power_factor()
-        self.calc_cable_power()
+        key = tuple(
+            None if pd.isnull(value) else value
+            for value in (self.current_capacity, self.rated_voltage, self.ac_resistance, self.inductance,
+                          self.capacitance, self.line_frequency_hz)
+        )
+        if key in self._electrical_properties_cache:
+            self.char_impedance, self.power_factor, self.cable_power = self._electrical_properties_cache[key]
+        else:
+            self.calc_char_impedance(self.line_frequency_hz)
+            self.calc_power_factor()
+            self.calc_cable_power()
+            if len(self._electrical_properties_cache) >= self._max_entries:
+                self._electrical_properties_cache.pop(next(iter(self._electrical_properties_cache)))
+            self._electrical_properties_cache[key] = (self.char_impedance, self.power_factor, self.cable_power)
 
     def calc_char_impedance(self, line_frequency_hz):
         """
@@ -707,21 +734,16 @@ class ArraySystem(CostModule):
         collection_construction_time = construction_time_input_data['construct_duration'] * 1 / 3  # assumes collection construction occurs for one-third of project duration
 
         throughput_operations = construction_time_input_data['rsmeans']
+        rsmeans_index = RSMeansIndex.from_input_dict(construction_time_input_data)
         trench_length_km = construction_time_output_data['trench_length_km']
         if construction_time_input_data['turbine_rating_MW'] >= 0.1:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Collection').dropna(
-                thresh=4)
-            # from rsmeans data, only read in Collection related data and filter out the rest:
-            cable_trenching = throughput_operations[throughput_operations.Module == 'Collection']
+            operation_data = rsmeans_index.operations(throughput_operations, 'Collection')
         else:   #switch for small DW
-            operation_data = throughput_operations.where(
-                throughput_operations['Module'] == 'Small DW Collection').dropna(thresh=4)
-            # from rsmeans data, only read in Collection related data and filter out the rest:
-            cable_trenching = throughput_operations[throughput_operations.Module == 'Small DW Collection']
+            operation_data = rsmeans_index.operations(throughput_operations, 'Small DW Collection')
         # operation_data = pd.merge()
 
         # from rsmeans data, only read in Collection related data and filter out the rest:
-        cable_trenching = throughput_operations[throughput_operations.Module == 'Collection']
+        cable_trenching = rsmeans_index.rows(throughput_operations, 'Collection')
 
         # Storing data with labor related inputs:
         trenching_labor = cable_trenching[cable_trenching.values == 'Labor']
@@ -793,6 +815,10 @@ class ArraySystem(CostModule):
         if wind_delay_fraction > 1:
             raise ValueError('{}: Error: Wind delay greater than 100%'.format(type(self).__name__))
         calculate_costs_output_dict['wind_multiplier'] = 1 / (1 - wind_delay_fraction)
+        # The wind delays are divided by the trenching days, not by the
+        # longest operation of the mission. StartDateSweep needs both.
+        calculate_costs_output_dict['collection_wind_delay_construct_days'] = calculate_costs_output_dict['time_construct_days']
+        calculate_costs_output_dict['collection_wind_multiplier'] = calculate_costs_output_dict['wind_multiplier']
 
         #Calculating trenching cost:
         calculate_costs_output_dict['Days taken for trenching (equipment)'] = (calculate_costs_output_dict['trench_length_km'] / self._km_to_LF) / calculate_costs_output_dict['trenching_equipment_daily_output']
@@ -1039,7 +1065,8 @@ class ArraySystem(CostModule):
 
             # pull only global inputs for weather delay from input_dict
             weather_data_keys = ('wind_shear_exponent',
-                                 'weather_window')
+                                 'weather_window',
+                                 'weather_index')
 
             # specify collection-specific weather delay inputs
             self.weather_input_dict = dict(
@@ -1061,6 +1088,7 @@ class ArraySystem(CostModule):
             operational_hrs_per_day = self.input_dict['hour_day'][self.input_dict['time_construct']]
             mission_time_hrs = duration_construction * operational_hrs_per_day
             self.weather_input_dict['mission_time_hours'] = int(mission_time_hrs)
+            self.output_dict['collection_wind_delay_mission_hours'] = int(mission_time_hrs)
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
@@ -0,0 +1,239 @@
+import numpy as np
+
+from .CollectionCost import Cable
+
+
+class CollectionLayoutBatch:
+    """
+    This class lays out the collection system of many projects at once with
+    NumPy. It computes the string counts, partial strings, cable lengths to
+    the substation and cable lengths and costs of
+    ArraySystem.create_ArraySystem(), for arrays of turbine counts,
+    turbine ratings, spacings and rotor diameters that share one cable_specs
+    sheet and line frequency.
+
+    The cables are the rows of the cable_specs sheet, in order, and their
+    electrical properties come from the same cache as Cable. Loops run over
+    the few cable types, never over projects, so a sweep over farm size is
+    a handful of array operations.
+
+    The results are the same as those of ArraySystem, up to floating point
+    rounding in the lengths to the substation of projects with many
+    strings, which are summed in a different order.
+    """
+
+    # Units: [km/LF] Conversion factor for converting from km to linear foot.
+    _km_to_LF = 0.0003048
+
+    def __init__(self, cable_specs_pd, line_frequency_hz, num_turbines, turbine_rating_MW,
+                 turbine_spacing_rotor_diameters, row_spacing_rotor_diameters, rotor_diameter_m,
+                 user_defined_distance_to_grid_connection=0, distance_to_grid_connection_km=0):
+        """
+        Parameters
+        ----------
+        cable_specs_pd : pd.DataFrame
+            The cable_specs sheet shared by all the projects.
+
+        line_frequency_hz : float
+            The line frequency shared by all the projects.
+
+        num_turbines : np.ndarray
+            The number of turbines of each project.
+
+        turbine_rating_MW : np.ndarray
+            The turbine rating of each project, or one rating for all.
+
+        turbine_spacing_rotor_diameters : np.ndarray
+            The spacing of turbines in a string, in rotor diameters.
+
+        row_spacing_rotor_diameters : np.ndarray
+            The spacing of the rows, in rotor diameters.
+
+        rotor_diameter_m : np.ndarray
+            The rotor diameter of each project.
+
+        user_defined_distance_to_grid_connection : np.ndarray
+            1 for projects whose distance to the grid connection is
+            distance_to_grid_connection_km, 0 for projects whose distance is
+            computed from the layout.
+
+        distance_to_grid_connection_km : np.ndarray
+            The user defined distance to the grid connection.
+        """
+        self.cable_specs = cable_specs_pd.T.to_dict()
+        self.cables = [Cable(specs, {'line_frequency_hz': line_frequency_hz}) for specs in self.cable_specs.values()]
+        self.cable_names = [specs['Array Cable'] for specs in self.cable_specs.values()]
+
+        self.num_turbines = np.asarray(num_turbines, dtype=float)
+        shape = self.num_turbines.shape
+        self.turbine_rating_MW = np.broadcast_to(np.asarray(turbine_rating_MW, dtype=float), shape)
+        self.turbine_spacing_rotor_diameters = np.broadcast_to(
+            np.asarray(turbine_spacing_rotor_diameters, dtype=float), shape
+        )
+        self.row_spacing_rotor_diameters = np.broadcast_to(np.asarray(row_spacing_rotor_diameters, dtype=float), shape)
+        self.rotor_diameter_m = np.broadcast_to(np.asarray(rotor_diameter_m, dtype=float), shape)
+        self.user_defined_distance_to_grid_connection = np.broadcast_to(
+            np.asarray(user_defined_distance_to_grid_connection), shape
+        )
+        self.distance_to_grid_connection_km = np.broadcast_to(
+            np.asarray(distance_to_grid_connection_km, dtype=float), shape
+        )
+
+    def num_turb_per_cable(self):
+        """
+        Returns
+        -------
+        np.ndarray, np.ndarray
+            The number of turbines on each cable type of a full string, and
+            the downstream connection of each cable type, with one row for
+            each project and one column for each cable type. See
+            Array.calc_num_turb_per_cable()
+        """
+        num_turb_per_cable = []
+        downstream_connection = []
+        upstream_turb = np.zeros(self.num_turbines.shape)
+        for cable in self.cables:
+            max_turb_per_cable = np.floor(cable.cable_power / self.turbine_rating_MW)
+            num_turb_per_cable.append(max_turb_per_cable - upstream_turb)
+            downstream_connection.append(np.where(upstream_turb == 0, -1, 0))
+            upstream_turb = upstream_turb + num_turb_per_cable[-1]
+        return np.column_stack(num_turb_per_cable), np.column_stack(downstream_connection)
+
+    def perc_partial_string(self, num_leftover_turb, num_turb_per_cable):
+        """
+        Parameters
+        ----------
+        num_leftover_turb : np.ndarray
+            The number of turbines on the partial string of each project.
+
+        num_turb_per_cable : np.ndarray
+            The number of turbines on each cable type of a full string.
+
+        Returns
+        -------
+        np.ndarray
+            The fraction of a full string of each cable type on the partial
+            string. See ArraySystem.calc_num_turb_partial_strings()
+        """
+        num_remaining = num_leftover_turb
+        turb_per_partial_string = []
+        for max_turb in num_turb_per_cable.T:
+            turb_per_partial_string.append(np.where(num_remaining > 0, np.minimum(num_remaining, max_turb), 0.0))
+            num_remaining = num_remaining - max_turb
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            perc_partial_string = np.column_stack(turb_per_partial_string) / num_turb_per_cable
+        has_zero = (num_turb_per_cable == 0).any(axis=1, keepdims=True)
+        perc_partial_string = np.where(has_zero, np.nan_to_num(perc_partial_string), perc_partial_string)
+        return np.where((num_leftover_turb > 0)[:, np.newaxis], perc_partial_string, 0.0)
+
+    def len_to_substation(self, num_strings):
+        """
+        Parameters
+        ----------
+        num_strings : np.ndarray
+            The number of strings of each project.
+
+        Returns
+        -------
+        np.ndarray
+            The distance to the grid connection of each project. See
+            ArraySystem.calc_cable_len_to_substation()
+        """
+        is_even = (num_strings % 2) == 0
+        n_max = np.where(is_even, num_strings / 2, (num_strings - 1) / 2)
+        turb_space_scaling = np.where(is_even, 0.5, 1)
+
+        # One column for each string index, up to the largest of all projects
+        idx = np.arange(int(max(n_max.max(initial=0), 0)) + 1)[np.newaxis, :]
+        in_range = (idx <= n_max[:, np.newaxis]) & ((idx >= 1) | ~is_even[:, np.newaxis])
+        c = np.where(idx == 0, 1, 2)
+        string_to_substation_length = c * np.sqrt(self.row_spacing_rotor_diameters[:, np.newaxis] ** 2 +
+                                                   (turb_space_scaling[:, np.newaxis] * idx *
+                                                    self.turbine_spacing_rotor_diameters[:, np.newaxis]) ** 2)
+        len_to_substation = np.where(in_range, string_to_substation_length, 0).sum(axis=1)
+
+        distributed_wind_distance_to_grid = (self.turbine_spacing_rotor_diameters * self.rotor_diameter_m) / 1000
+        computed = np.where(num_strings > 1, len_to_substation, distributed_wind_distance_to_grid)
+        return np.where(
+            self.user_defined_distance_to_grid_connection == 0, computed, self.distance_to_grid_connection_km
+        )
+
+    def layout(self):
+        """
+        Lays out the collection system of every project.
+
+        Returns
+        -------
+        dict
+            Keys are the keys of ArraySystem's output dictionary, such as
+            'num_full_strings' and 'total_cable_len_km'. Values are arrays
+            with one value for each project, or with one row for each
+            project and one column for each cable type for the keys
+            'num_turb_per_cable', 'perc_partial_string', 'cable_len_km' and
+            'cable_cost_usd'.
+        """
+        num_turb_per_cable, downstream_connection = self.num_turb_per_cable()
+        turb_section_length = (self.turbine_spacing_rotor_diameters * self.rotor_diameter_m) / 1000
+        array_cable_len = (num_turb_per_cable + downstream_connection) * turb_section_length[:, np.newaxis]
+
+        total_turb_per_string = np.zeros(self.num_turbines.shape)
+        for column in num_turb_per_cable.T:
+            total_turb_per_string = total_turb_per_string + column
+        with np.errstate(divide='ignore', invalid='ignore'):
+            num_full_strings = np.floor(self.num_turbines / total_turb_per_string)
+            num_leftover_turb = np.remainder(self.num_turbines, total_turb_per_string)
+        num_partial_strings = np.where(num_leftover_turb > 0, 1, 0)
+        perc_partial_string = self.perc_partial_string(num_leftover_turb, num_turb_per_cable)
+        num_strings = num_full_strings + num_partial_strings
+        distance_to_grid_connection_km = self.len_to_substation(num_strings)
+
+        # Utility scale projects use every cable type, and the cable to the
+        # substation is added to the last cable type.
+        num_full = num_full_strings[:, np.newaxis]
+        num_partial = num_partial_strings[:, np.newaxis]
+        utility_cable_len = num_full * array_cable_len + num_partial * (array_cable_len * perc_partial_string)
+        utility_cable_len[:, -1] = utility_cable_len[:, -1] + distance_to_grid_connection_km
+
+        # Projects with less than one full string are distributed wind. All
+        # their turbines are on the first cable type.
+        distributed_array_cable_len = (self.num_turbines + downstream_connection[:, 0]) * turb_section_length
+        distributed_cable_len = np.zeros(array_cable_len.shape)
+        distributed_cable_len[:, 0] = (
+            (num_full_strings * distributed_array_cable_len) + (num_partial_strings * distributed_array_cable_len)
+        ) + distance_to_grid_connection_km
+        distributed_num_turb_per_cable = np.zeros(num_turb_per_cable.shape)
+        distributed_num_turb_per_cable[:, 0] = self.num_turbines
+
+        is_distributed = (num_full_strings < 1)[:, np.newaxis]
+        cable_len_km = np.where(is_distributed, distributed_cable_len, utility_cable_len)
+        num_turb_per_cable = np.where(is_distributed, distributed_num_turb_per_cable, num_turb_per_cable)
+
+        cable_cost = np.array([cable.cost for cable in self.cables], dtype=float)
+        cable_cost_usd = (cable_len_km / self._km_to_LF) * cable_cost
+
+        total_cable_len_km = np.zeros(self.num_turbines.shape)
+        total_cable_cost_usd = np.zeros(self.num_turbines.shape)
+        repopulated_turb_per_string = np.zeros(self.num_turbines.shape)
+        for index in range(len(self.cables)):
+            total_cable_len_km = total_cable_len_km + cable_len_km[:, index]
+            total_cable_cost_usd = total_cable_cost_usd + cable_cost_usd[:, index]
+            repopulated_turb_per_string = repopulated_turb_per_string + num_turb_per_cable[:, index]
+
+        return {
+            'total_turb': self.num_turbines,
+            'num_turb_per_cable': num_turb_per_cable,
+            'total_turb_per_string': repopulated_turb_per_string,
+            'turb_per_string': total_turb_per_string,
+            'num_full_strings': num_full_strings,
+            'num_leftover_turb': num_leftover_turb,
+            'num_partial_strings': num_partial_strings,
+            'perc_partial_string': perc_partial_string,
+            'num_strings': num_strings,
+            'distance_to_grid_connection_km': distance_to_grid_connection_km,
+            'cable_len_to_grid_connection_km': distance_to_grid_connection_km,
+            'cable_len_km': cable_len_km,
+            'cable_cost_usd': cable_cost_usd,
+            'total_cable_len_km': total_cable_len_km,
+            'total_cable_cost_usd': total_cable_cost_usd,
+        }
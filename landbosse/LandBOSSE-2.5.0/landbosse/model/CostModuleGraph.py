@@ -0,0 +1,310 @@
+import copy
+
+from .RecordingDict import RecordingDict
+
+
+class CostModuleGraph:
+    """
+    This class runs cost modules in the order of a directed acyclic graph
+    of their dependencies, and reuses the result of a module when its
+    inputs are the same as those of a recent run in the same process.
+
+    A module depends on another module when it reads a key that the other
+    module writes to the input or output dictionary. For example,
+    SitePreparationCost reads 'operational_hrs_per_day', which
+    FoundationCost writes to the input dictionary, so it must run after
+    FoundationCost. Modules run in declaration order unless a dependency
+    requires otherwise.
+
+    Each module is run with RecordingDict copies of the input and output
+    dictionaries, so the keys it consumes are known after it has run. They
+    are in the consumed_inputs attribute, keyed by module name.
+
+    When reuse_results is True, the values of the keys a module read and
+    the values it wrote are kept in a class level cache, like the cache of
+    ErectionPriceBook. If a later project has the same values for all the
+    keys the module read, the module is not run again: the values it wrote
+    are copied into the dictionaries instead, with the project ID on every
+    output row replaced. In a parametric sweep that varies, say, the
+    distance to the grid connection, only the modules that read that value
+    are run again for each project.
+
+    Reuse is off by default, because digesting every value each module
+    reads costs about as much as running the modules for most projects. The
+    runners turn it on with --reuse-module-results, see
+    XlsxFileOperations.reuse_module_results()
+
+    Only writes through the dictionaries, which replace the value of a key,
+    are replayed when a module is reused. A module that modifies a value it
+    read in place, as ErectionCost adds columns to the components
+    dataframe, would lose that modification if it was reused. So after a
+    module runs, the values it read are digested again, and if any has
+    changed the result is not cached: the module runs for every project.
+    The keys it modified are in the modified_inputs attribute. A module
+    that fails, or that reads a value that cannot be digested, is not
+    cached either.
+    """
+
+    # The default for graphs created without a reuse_results argument. Set
+    # this to True to reuse results in every graph.
+    reuse_results = False
+
+    # The number of recent results kept for each module.
+    results_per_module = 8
+
+    # Keys are module names. Values are lists of cached results, the most
+    # recent first. Each result is a dictionary with the keys
+    # 'input_digests', 'output_digests', 'input_writes' and 'output_writes'
+    _results = {}
+
+    def __init__(self, reuse_results=None):
+        """
+        Parameters
+        ----------
+        reuse_results : bool
+            If True, the results of modules are reused when their inputs are
+            the same as those of a recent run. If None, the class attribute
+            reuse_results is used.
+        """
+        if reuse_results is not None:
+            self.reuse_results = reuse_results
+
+        # Keys are module names. Values are dictionaries with the keys
+        # 'module_class' and 'depends_on'
+        self.nodes = dict()
+
+        # Keys are module names. Values are the sets of input and output
+        # dictionary keys the module read the last time it ran or was reused.
+        self.consumed_inputs = dict()
+
+        # The names of the modules that were reused instead of run.
+        self.reused_module_names = []
+
+        # Keys are module names. Values are the sets of input and output
+        # dictionary keys whose values the module modified in place, which
+        # keep its results from being cached.
+        self.modified_inputs = dict()
+
+    def add_module(self, name, module_class, depends_on=()):
+        """
+        Declares a module of the graph.
+
+        Parameters
+        ----------
+        name : str
+            The name of the module in the graph.
+
+        module_class : type
+            The cost module class. It must take the keyword arguments
+            input_dict, output_dict and project_name and have a run_module()
+            method that returns a tuple whose first element is 0 on success.
+
+        depends_on : iterable
+            The names of the modules that must run before this one.
+        """
+        self.nodes[name] = {'module_class': module_class, 'depends_on': list(depends_on)}
+
+    def execution_order(self, module_names=None):
+        """
+        Sorts modules so that every module comes after the modules it
+        depends on. Modules that are not ordered by a dependency keep their
+        declaration order.
+
+        Parameters
+        ----------
+        module_names : list
+            The names of the modules to sort. If None, all modules are
+            sorted. Dependencies outside of this list are assumed to have
+            run already.
+
+        Returns
+        -------
+        list
+            The module names in the order to run them.
+
+        Raises
+        ------
+        ValueError
+            If a dependency is not declared or the dependencies have a cycle.
+        """
+        module_names = list(self.nodes.keys()) if module_names is None else list(module_names)
+        for name in module_names:
+            for dependency in self.nodes[name]['depends_on']:
+                if dependency not in self.nodes:
+                    raise ValueError(f'Cost module {name} depends on undeclared module {dependency}')
+
+        result = []
+        remaining = [name for name in self.nodes.keys() if name in module_names]
+        while len(remaining) > 0:
+            ready = [
+                name for name in remaining
+                if all(dependency in result or dependency not in remaining for dependency in self.nodes[name]['depends_on'])
+            ]
+            if len(ready) == 0:
+                raise ValueError(f'Cost modules {remaining} have a cycle of dependencies')
+            result.append(ready[0])
+            remaining.remove(ready[0])
+        return result
+
+    def run(self, input_dict, output_dict, project_name, module_names=None):
+        """
+        Runs or reuses modules in the order of execution_order()
+
+        Parameters
+        ----------
+        input_dict : dict
+            The master input dictionary.
+
+        output_dict : dict
+            The output dictionary.
+
+        project_name : str
+            The project ID with serial.
+
+        module_names : list
+            The names of the modules to run. If None, all modules run.
+        """
+        for name in self.execution_order(module_names):
+            self.run_module(name, input_dict, output_dict, project_name)
+
+    def run_module(self, name, input_dict, output_dict, project_name):
+        """
+        Runs or reuses one module.
+
+        Parameters
+        ----------
+        name : str
+            The name of the module.
+
+        input_dict : dict
+            The master input dictionary.
+
+        output_dict : dict
+            The output dictionary.
+
+        project_name : str
+            The project ID with serial.
+        """
+        if self.reuse_results:
+            result = self.find_result(name, input_dict, output_dict)
+            if result is not None:
+                for key, value in copy.deepcopy(result['input_writes']).items():
+                    input_dict[key] = value
+                for key, value in copy.deepcopy(result['output_writes']).items():
+                    output_dict[key] = self.with_project_name(value, project_name)
+                self.consumed_inputs[name] = set(result['input_digests']) | set(result['output_digests'])
+                self.reused_module_names.append(name)
+                return
+
+        recording_input_dict = RecordingDict(input_dict, digest_values=self.reuse_results)
+        recording_output_dict = RecordingDict(output_dict, digest_values=self.reuse_results)
+        module = self.nodes[name]['module_class'](
+            input_dict=recording_input_dict,
+            output_dict=recording_output_dict,
+            project_name=project_name
+        )
+        status = module.run_module()
+
+        # The values read must be compared before the written values replace
+        # them in the dictionaries.
+        if self.reuse_results:
+            modified = recording_input_dict.modified_keys(input_dict) | recording_output_dict.modified_keys(output_dict)
+            if len(modified) > 0:
+                self.modified_inputs[name] = modified
+
+        input_writes = recording_input_dict.written_values()
+        output_writes = recording_output_dict.written_values()
+        input_dict.update(input_writes)
+        output_dict.update(output_writes)
+        self.consumed_inputs[name] = set(recording_input_dict.read_digests) | set(recording_output_dict.read_digests)
+
+        succeeded = status is not None and status[0] == 0
+        if self.reuse_results and succeeded and recording_input_dict.digestable and \
+                recording_output_dict.digestable and name not in self.modified_inputs:
+            results = self._results.setdefault(name, [])
+            results.insert(0, {
+                'input_digests': recording_input_dict.read_digests,
+                'output_digests': recording_output_dict.read_digests,
+                'input_writes': copy.deepcopy(input_writes),
+                'output_writes': copy.deepcopy(output_writes),
+            })
+            del results[self.results_per_module:]
+
+    def find_result(self, name, input_dict, output_dict):
+        """
+        Finds a cached result of a module whose inputs have the same values
+        as the current inputs.
+
+        Parameters
+        ----------
+        name : str
+            The name of the module.
+
+        input_dict : dict
+            The master input dictionary.
+
+        output_dict : dict
+            The output dictionary.
+
+        Returns
+        -------
+        dict
+            The cached result, or None if there is no matching result.
+        """
+        current_input_dict = RecordingDict(input_dict, digest_values=True)
+        current_output_dict = RecordingDict(output_dict, digest_values=True)
+        for result in self._results.get(name, []):
+            if self.digests_match(result['input_digests'], current_input_dict) and \
+                    self.digests_match(result['output_digests'], current_output_dict):
+                return result
+        return None
+
+    @staticmethod
+    def digests_match(digests, current_dict):
+        """
+        Parameters
+        ----------
+        digests : dict
+            Keys are keys read by a module and values are the digests of
+            their values when it read them.
+
+        current_dict : RecordingDict
+            The current dictionary. Its read_digests attribute holds the
+            digests of the current values computed so far, so each value is
+            only digested once when several results are compared.
+
+        Returns
+        -------
+        bool
+            True if every key has the same digest in the current dictionary.
+        """
+        for key, digest in digests.items():
+            current_dict.record_read(key)
+            if current_dict.read_digests[key] != digest:
+                return False
+        return current_dict.digestable
+
+    @staticmethod
+    def with_project_name(value, project_name):
+        """
+        Replaces the project ID on the output rows of a reused module.
+
+        Parameters
+        ----------
+        value : object
+            A value written to the output dictionary by a module.
+
+        project_name : str
+            The project ID with serial.
+
+        Returns
+        -------
+        object
+            The value. If it is a list of rows, the 'project_id_with_serial'
+            of each row is replaced in place.
+        """
+        if isinstance(value, list):
+            for row in value:
+                if isinstance(row, dict) and 'project_id_with_serial' in row:
+                    row['project_id_with_serial'] = project_name
+        return value
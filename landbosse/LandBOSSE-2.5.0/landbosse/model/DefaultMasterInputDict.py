@@ -18,6 +18,9 @@ class DefaultMasterInputDict:
         self.default_input_dict['operational_construction_time'] = self.default_input_dict['hour_day'][
             self.default_input_dict['time_construct']]
 
+        # Number of least cost crane alternatives ErectionCost ranks for each operation.
+        self.default_input_dict['number_of_crane_alternatives'] = 3
+
     def populate_input_dict(self, incomplete_input_dict):
         """
         Completely fills the input_dict. If there are any keys in the
@@ -4,6 +4,7 @@ from math import ceil
 
 from .CostModule import CostModule
 from .WeatherDelay import WeatherDelay
+from .ErectionPriceBook import ErectionPriceBook
 
 import traceback
 
@@ -116,6 +117,10 @@ class ErectionCost(CostModule):
         (bool) boolean flag to indicate whether choosing same base and
         topping crane is allowed.
 
+    number_of_crane_alternatives
+        (int) number of least cost crane alternatives to rank for each
+        operation. They are placed on the crane_alternatives output key.
+
     operational_construction_time
         (int) Number of hours per day when construction can happen.
 
@@ -818,7 +823,7 @@ class ErectionCost(CostModule):
         crane_specs['Wind delay percent'] = np.nan
 
         # pull global inputs for weather delay from input_dict
-        weather_data_keys = {'wind_shear_exponent', 'weather_window'}
+        weather_data_keys = {'wind_shear_exponent', 'weather_window', 'weather_index'}
 
         # specify collection-specific weather delay inputs
         weather_delay_global_inputs = {i: self.input_dict[i] for i in self.input_dict if i in weather_data_keys}
@@ -876,45 +881,38 @@ class ErectionCost(CostModule):
         project_data = self.input_dict['project_data']
         hour_day = self.input_dict['hour_day']
 
+        # Tables that depend only on the project_data sheets are cached across
+        # projects in the price book.
+        price_book = ErectionPriceBook.price_book_for_project_data(project_data)
+
         # TODO: consider removing equipment name and crane capacity from crane_specs tab (I believe these data are unused here and they get overwritten later with equip information from equip tab)
         join_wind_operation = join_wind_operation.drop(columns=['Equipment name', 'Crane capacity tonne'])
 
-        possible_crane_cost_with_equip = pd.merge(join_wind_operation, project_data['equip'],
-                                                  on=['Equipment ID', 'Operation'])
-
-        equip_crane_cost = pd.merge(possible_crane_cost_with_equip, project_data['equip_price'],
-                                       on=['Equipment name', 'Crane capacity tonne'])
+        equip_crane_cost = pd.merge(join_wind_operation[['Crane name', 'Boom system', 'Equipment ID', 'Operation', 'Total time per op with weather']],
+                                    price_book['equip_rates'],
+                                    on=['Equipment ID', 'Operation'])
 
         equip_crane_cost['Equipment rental cost USD'] = equip_crane_cost['Total time per op with weather'] * \
-                                                        equip_crane_cost['Equipment price USD per hour'] * \
-                                                        equip_crane_cost['Number of equipment']
-
-        # Drop duplicates from equip crane cost, if any
-        # equip_crane_cost.drop_duplicates(subset=['Equipment ID', 'Operation', 'Crane name', 'Boom system'], inplace=True)
+                                                        equip_crane_cost['Equipment price USD per hour x number']
 
         equipment_cost_to_merge = equip_crane_cost[['Crane name', 'Boom system', 'Equipment ID', 'Operation', 'Equipment price USD per hour', 'Number of equipment', 'Equipment rental cost USD', 'Fuel consumption gal per day']]
         equipment_cost_to_merge = equipment_cost_to_merge.groupby(['Crane name', 'Boom system', 'Equipment ID', 'Operation']).sum().reset_index()
 
         possible_crane_cost = pd.merge(join_wind_operation, equipment_cost_to_merge, on=['Crane name', 'Boom system', 'Equipment ID', 'Operation'])
 
-        # Remove any duplicates from crew data.
-        crew_deduped = project_data['crew'].drop_duplicates(
-            subset=['Crew type ID', 'Operation', 'Crew name', 'Labor type ID'], keep="first")
-
-        # Merge crew and price data for non-management crews only (base, topping, and offload only)
-        crew_cost = pd.merge(crew_deduped, project_data['crew_price'], on=['Labor type ID'])
-        self.output_dict['crew_cost'] = crew_cost
-        non_management_crew_cost = crew_cost.loc[crew_cost['Operation'].isin(['Base', 'Top', 'Offload'])]
-
-        # calculate crew costs
+        # calculate crew costs. The price book holds straight time rates for
+        # the non-management crews (base, topping, and offload only), so
+        # scale them by the overtime adjustment.
         non_overtime_hours_per_week = 40
         working_days_per_week = 6
         hours_per_week = working_days_per_week * hour_day[time_construct]
         overtime_percentage = (hours_per_week - non_overtime_hours_per_week) / hours_per_week
         normal_labor_rate = non_overtime_hours_per_week / hours_per_week
-        crew_cost['Hourly rate for all workers'] = (non_management_crew_cost['Hourly rate USD per hour'] * non_management_crew_cost[
-            'Number of workers']) * (normal_labor_rate + overtime_percentage * overtime_multiplier)
-        crew_cost['Per diem all workers'] = non_management_crew_cost['Per diem USD per day'] * non_management_crew_cost['Number of workers']
+        overtime_adjustment = normal_labor_rate + overtime_percentage * overtime_multiplier
+
+        crew_cost = price_book['crew_cost'].copy()
+        crew_cost['Hourly rate for all workers'] = crew_cost['Hourly rate for all workers'] * overtime_adjustment
+        self.output_dict['crew_cost'] = crew_cost
 
         # Crew cost group is getting two more people in it.
         # Note to future self, enforce constraints on dataframes.
@@ -922,8 +920,9 @@ class ErectionCost(CostModule):
         # Before crew_price sheet is used, sort based on labor cost. Then drop rows with duplicated job titles.
         # Intent is to keep the most expensive labor row.
 
-        # group crew costs by crew type and operation
-        crew_cost_grouped = crew_cost.groupby(['Crew type ID', 'Operation']).sum(numeric_only=True).reset_index()
+        # crew costs grouped by crew type and operation
+        crew_cost_grouped = price_book['crew_cost_grouped'].copy()
+        crew_cost_grouped['Hourly rate for all workers'] = crew_cost_grouped['Hourly rate for all workers'] * overtime_adjustment
 
         # merge crane data with grouped crew costs
 
@@ -960,11 +959,8 @@ class ErectionCost(CostModule):
         # Store the possible cranes for the top and base for future diagnostics.
         self._possible_crane_cost = possible_crane_cost.copy()
 
-        # group crane spec data for mobilization
-        mobilization_costs = project_data['crane_specs'].groupby(['Crane name', 'Boom system'])[
-            'Mobilization cost USD'].max().reset_index()
-
-        mobilization_costs['Mobilization cost USD'] = mobilization_costs['Mobilization cost USD'] * 2 # for mobilization and demobilizaton
+        # mobilization and demobilization costs for each crane
+        mobilization_costs = price_book['mobilization_costs']
 
         # join top and base crane data with mobilization data
         topbase_same_crane_cost = pd.merge(possible_crane_topbase_sum, mobilization_costs,
@@ -1007,6 +1003,10 @@ class ErectionCost(CostModule):
         Finds the minimum cost crane(s) based on the aggregated labor, equipment,
         mobilization and fuel costs for erection.
 
+        The least cost crane for each operation is selected with a single
+        idxmin pass over the separate base and topping options, and another
+        over the same crane options.
+
         self.output_dict keys used as inputs
         ------------------------------------
         separate_basetop : pd.DataFrame
@@ -1018,25 +1018,35 @@ class ErectionCost(CostModule):
 
         allow_same_flag : boolean
             flag to indicate whether choosing same base and topping crane is allowed
+
+        Returns
+        -------
+        pd.DataFrame
+            The chosen cranes and their costs. The shape depends on the
+            option chosen:
+
+            Separate cranes: one row for each operation, with the costs of
+            the offload cranes doubled. 'Boom system', 'Crane name' and
+            'Operation' are the levels of the index, and the columns are the
+            cost columns of separate_basetop.
+
+            Same crane: the single row of same_basetop with the least total
+            cost, with its index label in same_basetop. 'Crane name', 'Boom
+            system' and 'Operation' ('Base + Top') are ordinary columns.
+
+            After reset_index(), both have 'Crane name', 'Boom system' and
+            'Operation' columns. The same crane frame also has an 'index'
+            column.
         """
         allow_same_flag = self.input_dict['allow_same_flag']
         separate_basetop = self.output_dict['separate_basetop']
         same_basetop = self.output_dict['same_basetop']
 
-        self.output_dict['separate_basetop'] = separate_basetop
-
-        total_separate_cost = pd.DataFrame()
-        for operation in separate_basetop['Operation'].unique():
-            # find minimum cost option for separate base and topping cranes
-            min_val = min(separate_basetop['Total cost USD'].where(separate_basetop['Operation'] == operation).dropna())
-
-            # find the crane that corresponds to the minimum cost for each operation
-            crane = separate_basetop[separate_basetop['Total cost USD'] == min_val]
-            cost = crane.groupby('Operation').min()
-            total_separate_cost = pd.concat((total_separate_cost, cost), sort=True)
-
-        # reset index for separate crane costs
-        total_separate_cost = total_separate_cost.reset_index()
+        # find the minimum cost crane for each operation. separate_basetop is
+        # sorted by crane name and boom system within each operation, so ties
+        # go to the first crane in that order.
+        min_cost_index = separate_basetop.groupby('Operation')['Total cost USD'].idxmin()
+        total_separate_cost = separate_basetop.loc[min_cost_index]
 
         # duplicate offload records because assuming two offload cranes are on site
         total_separate_cost = pd.concat((total_separate_cost,
@@ -1048,18 +1058,66 @@ class ErectionCost(CostModule):
 
         if allow_same_flag is True:
             # get the minimum cost for using the same crane for all operations
-            cost_chosen_same = min(same_basetop['Total cost USD'])
+            same_crane = same_basetop.loc[[same_basetop['Total cost USD'].idxmin()]]
+            cost_chosen_same = same_crane['Total cost USD'].iloc[0]
 
             # check if separate or same crane option is cheaper and choose crane cost
             if cost_chosen_separate < cost_chosen_same:
                 cost_chosen = total_separate_cost.groupby(by=["Boom system", "Crane name", "Operation"]).sum()  # added crane name and operation to groupby
             else:
-                cost_chosen = same_basetop.where(same_basetop['Total cost USD'] == cost_chosen_same).dropna()
+                cost_chosen = same_crane
         else:
             cost_chosen = total_separate_cost.groupby(by=["Boom system", "Crane name", "Operation"]).sum()  # added crane name and operation to groupby
 
         return cost_chosen
 
+    def rank_crane_alternatives(self, number_of_alternatives):
+        """
+        Ranks the least cost crane alternatives so near optimal crane choices
+        can be inspected without re-running the model. Each option type is
+        ranked with a single sort.
+
+        self.output_dict keys used as inputs
+        ------------------------------------
+        separate_basetop : pd.DataFrame
+            See find_minimum_cost_cranes()
+
+        same_basetop : pd.DataFrame
+            See find_minimum_cost_cranes()
+
+        Parameters
+        ----------
+        number_of_alternatives : int
+            The number of alternatives to keep for each operation of the
+            separate crane option and for the same crane option.
+
+        Returns
+        -------
+        pd.DataFrame
+            The alternatives with the columns 'Option type' ('Separate' or
+            'Same'), 'Operation', 'Rank' (1 is the least cost), 'Crane name',
+            'Boom system', the cost columns and 'Cost above minimum USD'.
+        """
+        separate_basetop = self.output_dict['separate_basetop']
+        same_basetop = self.output_dict['same_basetop']
+
+        ranked_separate = separate_basetop.sort_values(['Operation', 'Total cost USD'], kind='mergesort')
+        ranked_separate = ranked_separate.groupby('Operation').head(number_of_alternatives).copy()
+        ranked_separate['Option type'] = 'Separate'
+        ranked_separate['Rank'] = ranked_separate.groupby('Operation').cumcount() + 1
+        ranked_separate['Cost above minimum USD'] = ranked_separate['Total cost USD'] - \
+            ranked_separate.groupby('Operation')['Total cost USD'].transform('min')
+
+        ranked_same = same_basetop.sort_values('Total cost USD', kind='mergesort').head(number_of_alternatives).copy()
+        ranked_same['Option type'] = 'Same'
+        ranked_same['Rank'] = np.arange(1, len(ranked_same) + 1)
+        ranked_same['Cost above minimum USD'] = ranked_same['Total cost USD'] - ranked_same['Total cost USD'].min()
+
+        leading_columns = ['Option type', 'Operation', 'Rank', 'Crane name', 'Boom system']
+        crane_alternatives = pd.concat((ranked_separate, ranked_same), ignore_index=True)
+        other_columns = [column for column in crane_alternatives.columns if column not in leading_columns]
+        return crane_alternatives[leading_columns + other_columns]
+
     def calculate_management_crews_cost(self, erection_cost):
         """
         Calculates management costs for erection, based on rate of turbine deliveries.
@@ -1185,6 +1243,7 @@ class ErectionCost(CostModule):
         self.output_dict['crew_cost'] = crew_cost
 
         erection_cost = self.find_minimum_cost_cranes()
+        self.output_dict['crane_alternatives'] = self.rank_crane_alternatives(self.input_dict['number_of_crane_alternatives'])
 
         selected_time = join_wind_operation[['Crane name', 'Boom system', 'Operation', 'Operation time all turbines hrs', 'Total time per op with weather', 'Wind multiplier',
        'Operational construct days', 'Time construct days']]
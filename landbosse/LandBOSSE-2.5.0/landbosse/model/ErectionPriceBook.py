@@ -0,0 +1,166 @@
+import hashlib
+
+import pandas as pd
+
+
+def dataframe_digest(df):
+    """
+    Computes a digest of the contents of a dataframe. Two dataframes
+    with the same column names, index and values have the same digest,
+    regardless of whether they are the same object in memory.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataframe to digest.
+
+    Returns
+    -------
+    str
+        The hexadecimal SHA1 digest of the dataframe.
+    """
+    digest = hashlib.sha1()
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class ErectionPriceBook:
+    """
+    This class does not need to be instantiated. Like XlsxDataframeCache,
+    it holds a class level cache that is shared by all ErectionCost
+    instances in a process.
+
+    ErectionCost.aggregate_erection_costs() needs several tables that
+    depend only on the project_data sheets and not on the project list
+    values such as turbine count or hub height. These are:
+
+    equip_rates
+        Equipment joined with equipment prices and summed by Equipment ID
+        and Operation. Multiplying 'Equipment price USD per hour x number'
+        by the total time of an operation gives the rental cost.
+
+    crew_cost
+        Deduplicated crews joined with crew prices. 'Hourly rate for all
+        workers' holds the straight time rate of the non-management crews;
+        ErectionCost scales it by the overtime adjustment of each project.
+
+    crew_cost_grouped
+        crew_cost summed by Crew type ID and Operation.
+
+    mobilization_costs
+        Mobilization plus demobilization cost for each crane and boom
+        system.
+
+    In a parametric sweep that only changes project list values, these
+    tables are built once and every project only applies its own times
+    and quantities to them.
+
+    The price book is keyed by a digest of the contents of the crane_specs,
+    equip, equip_price, crew and crew_price sheets, so a parametric or
+    labor multiplier change to any of those sheets builds a new price book.
+    Callers must treat the cached dataframes as read only.
+    """
+
+    # _cache is a class attribute that holds price books keyed by the
+    # digest of the sheets they were built from.
+    _cache = {}
+
+    # The maximum number of price books held at once. When it is reached,
+    # the oldest price book is evicted.
+    _max_entries = 32
+
+    price_book_sheets = ['crane_specs', 'equip', 'equip_price', 'crew', 'crew_price']
+
+    @classmethod
+    def price_book_for_project_data(cls, project_data):
+        """
+        Returns the price book for the project_data sheets, building and
+        caching it if it has not been seen before.
+
+        Parameters
+        ----------
+        project_data : dict
+            Dictionary of project_data dataframes. Keys are sheet names.
+
+        Returns
+        -------
+        dict
+            The price book with the keys described in the class docstring.
+        """
+        key = cls.price_book_key(project_data)
+        if key in cls._cache:
+            return cls._cache[key]
+
+        price_book = cls.build_price_book(project_data)
+        if len(cls._cache) >= cls._max_entries:
+            cls._cache.pop(next(iter(cls._cache)))
+        cls._cache[key] = price_book
+        return price_book
+
+    @classmethod
+    def price_book_key(cls, project_data):
+        """
+        Parameters
+        ----------
+        project_data : dict
+            Dictionary of project_data dataframes. Keys are sheet names.
+
+        Returns
+        -------
+        tuple
+            The digests of each sheet the price book is built from.
+        """
+        return tuple(dataframe_digest(project_data[sheet]) for sheet in cls.price_book_sheets)
+
+    @classmethod
+    def build_price_book(cls, project_data):
+        """
+        Builds the price book tables. See the class docstring for the
+        contents.
+
+        Parameters
+        ----------
+        project_data : dict
+            Dictionary of project_data dataframes. Keys are sheet names.
+
+        Returns
+        -------
+        dict
+            The price book.
+        """
+        equip_with_price = pd.merge(project_data['equip'], project_data['equip_price'],
+                                    on=['Equipment name', 'Crane capacity tonne'])
+        equip_with_price['Equipment price USD per hour x number'] = equip_with_price['Equipment price USD per hour'] * \
+                                                                    equip_with_price['Number of equipment']
+        equip_rates = equip_with_price.groupby(['Equipment ID', 'Operation'])[['Equipment price USD per hour',
+                                                                              'Number of equipment',
+                                                                              'Equipment price USD per hour x number',
+                                                                              'Fuel consumption gal per day']
+        ].sum().reset_index()
+
+        # Remove any duplicates from crew data.
+        crew_deduped = project_data['crew'].drop_duplicates(
+            subset=['Crew type ID', 'Operation', 'Crew name', 'Labor type ID'], keep="first")
+
+        # Merge crew and price data. Only the non-management crews (base,
+        # topping, and offload) get rates for all workers.
+        crew_cost = pd.merge(crew_deduped, project_data['crew_price'], on=['Labor type ID'])
+        non_management_crew_cost = crew_cost.loc[crew_cost['Operation'].isin(['Base', 'Top', 'Offload'])]
+        crew_cost['Hourly rate for all workers'] = non_management_crew_cost['Hourly rate USD per hour'] * \
+                                                   non_management_crew_cost['Number of workers']
+        crew_cost['Per diem all workers'] = non_management_crew_cost['Per diem USD per day'] * \
+                                            non_management_crew_cost['Number of workers']
+        crew_cost_grouped = crew_cost.groupby(['Crew type ID', 'Operation']).sum(numeric_only=True).reset_index()
+
+        # group crane spec data for mobilization
+        mobilization_costs = project_data['crane_specs'].groupby(['Crane name', 'Boom system'])[
+            'Mobilization cost USD'].max().reset_index()
+        mobilization_costs['Mobilization cost USD'] = mobilization_costs['Mobilization cost USD'] * 2  # for mobilization and demobilizaton
+
+        return {
+            'equip_rates': equip_rates,
+            'crew_cost': crew_cost,
+            'crew_cost_grouped': crew_cost_grouped,
+            'mobilization_costs': mobilization_costs,
+        }
@@ -8,6 +8,7 @@ from scipy.optimize import root_scalar
 
 from .WeatherDelay import WeatherDelay as WD
 from .CostModule import CostModule
+from .RSMeansIndex import RSMeansIndex
 
 
 class FoundationCost(CostModule):
@@ -473,6 +474,7 @@ class FoundationCost(CostModule):
         foundation_construction_time = construction_time_input_data['construct_duration'] * 1 / 3
         #throughput_operations = construction_time_input_data['throughput_operations']
         throughput_operations = construction_time_input_data['rsmeans']
+        rsmeans_index = RSMeansIndex.from_input_dict(construction_time_input_data)
         material_needs_per_turbine = construction_time_output_data['material_needs_per_turbine']
         quantity_materials_entire_farm = material_needs_per_turbine['Quantity of material'] * construction_time_input_data['num_turbines']
 
@@ -482,12 +484,9 @@ class FoundationCost(CostModule):
         material_needs_entire_farm = construction_time_output_data['material_needs_entire_farm']
         material_needs_entire_farm['Quantity of material'] = quantity_materials_entire_farm
         if construction_time_input_data['turbine_rating_MW'] <= 0.1:
-            operation_data = throughput_operations.where(
-                throughput_operations['Module'] == 'Small DW Foundations').dropna(
-                thresh=4)
+            operation_data = rsmeans_index.operations(throughput_operations, 'Small DW Foundations')
         else:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Foundations').dropna(
-                thresh=4)
+            operation_data = rsmeans_index.operations(throughput_operations, 'Foundations')
 
         #operation data for entire wind farm:
         operation_data = pd.merge(material_needs_entire_farm, operation_data, on=['Material type ID'], how='outer')
@@ -588,6 +587,10 @@ class FoundationCost(CostModule):
 
         (pd.DataFrame) total_foundation_cost
 
+        The wind multiplier and the construction days the wind delays are
+        divided by are also stored under foundation_wind_multiplier and
+        foundation_wind_delay_construct_days. See StartDateSweep.
+
 
         """
 
@@ -604,18 +607,22 @@ class FoundationCost(CostModule):
 
         wind_delay = calculate_costs_output_dict['wind_delay_time']
 
-        wind_delay_fraction = (wind_delay / calculate_costs_input_dict['operational_hrs_per_day']) / operation_data['Time construct days'].max(skipna=True)
+        wind_delay_construct_days = operation_data['Time construct days'].max(skipna=True)
+        wind_delay_fraction = (wind_delay / calculate_costs_input_dict['operational_hrs_per_day']) / wind_delay_construct_days
         # check if wind_delay_fraction is greater than 1, which would mean weather delays are longer than they can possibily be for the input data
         if wind_delay_fraction > 1:
             raise ValueError('{}: Error: Wind delay greater than 100%'.format(type(self).__name__))
         wind_multiplier = 1 / (1 - wind_delay_fraction)
         calculate_costs_output_dict['wind_multiplier'] = wind_multiplier
+        calculate_costs_output_dict['foundation_wind_delay_construct_days'] = wind_delay_construct_days
+        calculate_costs_output_dict['foundation_wind_multiplier'] = wind_multiplier
 
         rsmeans = calculate_costs_input_dict['rsmeans']
+        rsmeans_index = RSMeansIndex.from_input_dict(calculate_costs_input_dict)
         if calculate_costs_input_dict['turbine_rating_MW'] > 0.1:
-            rsmeans = rsmeans.where(rsmeans['Module'] == 'Foundations').dropna(thresh=4)
+            rsmeans = rsmeans_index.operations(rsmeans, 'Foundations')
         else:
-            rsmeans = rsmeans.where(rsmeans['Module'] == 'Small DW Foundations').dropna(thresh=4)
+            rsmeans = rsmeans_index.operations(rsmeans, 'Small DW Foundations')
 
         labor_equip_data = pd.merge(material_vol_entire_farm, rsmeans, on=['Material type ID'])
 
@@ -860,7 +867,8 @@ class FoundationCost(CostModule):
 
             # pull only global inputs for weather delay from input_dict
             weather_data_keys = ('wind_shear_exponent',
-                                 'weather_window')
+                                 'weather_window',
+                                 'weather_index')
 
             # specify foundation-specific weather delay inputs
             self.weather_input_dict = dict(
@@ -883,6 +891,7 @@ class FoundationCost(CostModule):
             operational_hrs_per_day = self.input_dict['hour_day'][self.input_dict['time_construct']]
             mission_time_hrs = duration_construction * operational_hrs_per_day
             self.weather_input_dict['mission_time_hours'] = mission_time_hrs
+            self.output_dict['foundation_wind_delay_mission_hours'] = mission_time_hrs
             self.input_dict['operational_hrs_per_day'] = operational_hrs_per_day
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
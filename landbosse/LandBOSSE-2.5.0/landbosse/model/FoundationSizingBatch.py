@@ -0,0 +1,527 @@
+import math
+
+import numpy as np
+
+
+class FoundationSizingBatch:
+    """
+    This class sizes the foundations of many designs at once with NumPy. It
+    computes the same loads and radii as
+    FoundationCost.calculate_foundation_load(), which solves a cubic and
+    two root finding problems with SciPy for one project at a time.
+
+    The overturning radius is the real root of the cubic, found from the
+    eigenvalues of a stack of companion matrices, as numpy.roots() does for
+    one cubic. The gapping and bearing radii are found with a vectorized
+    Brent's method that takes the same steps as scipy.optimize.brentq(),
+    with the same brackets, tolerances and iteration limits. The radii are
+    therefore identical to those of FoundationCost, as long as the designs
+    of a batch have the same number of components.
+
+    The component arrays have one row for each design and one column for
+    each component, such as a tower section or a blade. Designs with fewer
+    components are padded with zeros, which add no load. The scalar inputs
+    are arrays with one value for each design, or scalars shared by all the
+    designs.
+    """
+
+    # The keys of the component columns used by the foundation load, as
+    # they are named in the master input dictionary.
+    component_keys = [
+        'Section height m',
+        'Surface area sq m',
+        'Coeff drag (installed)',
+        'Lever arm m',
+        'Multplier drag rotor',
+        'Multiplier tower drag',
+        'Mass tonne',
+    ]
+
+    # The keys of the scalar inputs in the master input dictionary.
+    scalar_keys = ['gust_velocity_m_per_s', 'rated_thrust_N', 'depth', 'bearing_pressure_n_m2']
+
+    # The default relative tolerance of scipy.optimize.brentq()
+    brentq_rtol = 4 * np.finfo(float).eps
+
+    _kg_per_tonne = 1000
+
+    # Foundation materials, as in FoundationCost.calculate_foundation_load()
+    vol_fraction_fill = 0.55
+    vol_fraction_concrete = 1 - vol_fraction_fill
+    unit_weight_fill = 17.3e3  # in N / m^3
+    unit_weight_concrete = 23.6e3  # in N / m^3
+
+    def __init__(self, components, gust_velocity_m_per_s, rated_thrust_N, depth, bearing_pressure_n_m2, project_names=None,
+                 exact=True):
+        """
+        Parameters
+        ----------
+        components : dict
+            Keys are the component_keys. Values are 2D arrays with one row
+            for each design, or lists with one 1D array for each design.
+
+        gust_velocity_m_per_s : np.ndarray
+            The 50 year gust velocity of each design.
+
+        rated_thrust_N : np.ndarray
+            The rated thrust of each design.
+
+        depth : np.ndarray
+            The foundation depth of each design, in m.
+
+        bearing_pressure_n_m2 : np.ndarray
+            The bearing pressure of the soil of each design.
+
+        project_names : list
+            Optional names of the designs, used in error messages.
+
+        exact : bool
+            If True, the results are identical to those of FoundationCost.
+            If False, squares and square roots are computed with NumPy's
+            vectorized functions, which are several times faster but may
+            differ in the last bit. See power()
+        """
+        self.components = {key: self.pad(components[key]) for key in self.component_keys}
+        number_of_designs = len(self.components['Mass tonne'])
+        self.gust_velocity_m_per_s = np.broadcast_to(np.asarray(gust_velocity_m_per_s, dtype=float), (number_of_designs,))
+        self.rated_thrust_N = np.broadcast_to(np.asarray(rated_thrust_N, dtype=float), (number_of_designs,))
+        self.depth = np.broadcast_to(np.asarray(depth, dtype=float), (number_of_designs,))
+        self.bearing_pressure_n_m2 = np.broadcast_to(np.asarray(bearing_pressure_n_m2, dtype=float), (number_of_designs,))
+        self.project_names = list(range(number_of_designs)) if project_names is None else list(project_names)
+        self.exact = exact
+
+    @classmethod
+    def from_input_dicts(cls, input_dicts):
+        """
+        Makes a batch from master input dictionaries.
+
+        Parameters
+        ----------
+        input_dicts : dict
+            Keys are project IDs with serial and values are master input
+            dictionaries.
+
+        Returns
+        -------
+        FoundationSizingBatch
+            The batch of the designs of the projects.
+        """
+        components = {key: [input_dict[key] for input_dict in input_dicts.values()] for key in cls.component_keys}
+        scalars = {key: [input_dict[key] for input_dict in input_dicts.values()] for key in cls.scalar_keys}
+        return cls(components, project_names=list(input_dicts.keys()), **scalars)
+
+    @staticmethod
+    def pad(rows):
+        """
+        Parameters
+        ----------
+        rows : np.ndarray or list
+            A 2D array, or a list of 1D arrays of any length.
+
+        Returns
+        -------
+        np.ndarray
+            A 2D float array, with shorter rows padded with zeros.
+        """
+        if isinstance(rows, np.ndarray) and rows.ndim == 2:
+            return rows.astype(float)
+        rows = [np.asarray(row, dtype=float) for row in rows]
+        result = np.zeros((len(rows), max(len(row) for row in rows)))
+        for index, row in enumerate(rows):
+            result[index, :len(row)] = row
+        return result
+
+    @staticmethod
+    def row_sum(a):
+        """
+        Sums each row of a 2D array in the same order as numpy sums a 1D
+        array of the same length, so that the sums are identical to those
+        of FoundationCost. Reducing a 2D array along its rows does not use
+        numpy's pairwise summation, which adds 8 partial sums for arrays of
+        8 or more elements.
+
+        Parameters
+        ----------
+        a : np.ndarray
+            A 2D array with at most 128 columns.
+
+        Returns
+        -------
+        np.ndarray
+            The sum of each row.
+        """
+        number_of_columns = a.shape[1]
+        if number_of_columns < 8:
+            result = np.zeros(len(a))
+            for column in a.T:
+                result = result + column
+            return result
+
+        partial_sums = a[:, :8].copy()
+        blocks_end = number_of_columns - number_of_columns % 8
+        for start in range(8, blocks_end, 8):
+            partial_sums = partial_sums + a[:, start:start + 8]
+        result = ((partial_sums[:, 0] + partial_sums[:, 1]) + (partial_sums[:, 2] + partial_sums[:, 3])) + \
+                 ((partial_sums[:, 4] + partial_sums[:, 5]) + (partial_sums[:, 6] + partial_sums[:, 7]))
+        for column in a[:, blocks_end:].T:
+            result = result + column
+        return result
+
+    def power(self, base, exponent):
+        """
+        FoundationCost raises scalars to powers, which calls the C library's
+        pow(). NumPy computes the squares and square roots of arrays with
+        multiplication and sqrt(), which can round differently in the last
+        bit. When exact is True, this method calls pow() for each design so
+        that the results are identical.
+
+        Parameters
+        ----------
+        base : np.ndarray
+            The values to raise to the power.
+
+        exponent : float
+            The exponent.
+
+        Returns
+        -------
+        np.ndarray
+            The powers. Negative values raised to a fractional power are NaN.
+        """
+        if not self.exact:
+            with np.errstate(invalid='ignore'):
+                return base ** exponent
+        return np.array([
+            math.pow(value, exponent) if value >= 0 or float(exponent).is_integer() else np.nan
+            for value in base.tolist()
+        ], dtype=float).reshape(np.shape(base))
+
+    @property
+    def unit_weight(self):
+        """
+        The weight of the fill and concrete mix of the foundation, in N / m^3
+        """
+        return self.vol_fraction_fill * self.unit_weight_fill + self.vol_fraction_concrete * self.unit_weight_concrete
+
+    def loads(self):
+        """
+        Returns
+        -------
+        dict
+            Keys are 'f_dead', 'f_lat', 'f_horiz' and 'm_tot', in N and
+            N * m. Values are arrays with the load on each design.
+        """
+        # set exposure constants
+        a = 9.5
+        z_g = 274.32
+
+        z = self.components['Section height m']
+        a_f = self.components['Surface area sq m']
+        c_d = self.components['Coeff drag (installed)']
+        l = self.components['Lever arm m']
+        multiplier_rotor = self.components['Multplier drag rotor']
+        multiplier_tower = self.components['Multiplier tower drag']
+        v_squared = self.power(self.gust_velocity_m_per_s, 2)[:, np.newaxis]
+
+        # calculate wind pressure
+        k_z = 2.01 * (z / z_g) ** (2 / a)  # exposure factor
+        k_d = 0.95  # wind directionality factor
+        k_zt = 1  # topographic factor
+        wind_pressure = 0.613 * k_z * k_zt * k_d * v_squared
+
+        # calculate wind loads on each tower component
+        g = 0.85  # gust factor
+        c_f = 0.6  # coefficient of force
+        f_t = (wind_pressure * g * c_f * a_f) * multiplier_tower
+
+        # calculate drag rotor
+        rho = 1.225  # air density in kg/m^3
+        f_r = (0.5 * rho * c_d * a_f * v_squared) * multiplier_rotor
+
+        f = (f_t + f_r)
+
+        # The dead load is summed one component at a time, like the built-in
+        # sum() in FoundationCost.
+        g = 9.8  # m / s ^ 2
+        mass_tonne = np.zeros(len(f))
+        for column in self.components['Mass tonne'].T:
+            mass_tonne = mass_tonne + column
+        f_dead = mass_tonne * g * self._kg_per_tonne / 1.15  # scaling factor to adjust dead load for uplift
+
+        f_lat = self.row_sum(f)
+        m_overturn = self.row_sum(f * l)
+
+        m_thrust = self.rated_thrust_N * l.max(axis=1)
+        return {
+            'f_dead': f_dead,
+            'f_lat': f_lat,
+            'f_horiz': np.maximum(f_lat, self.rated_thrust_N),
+            'm_tot': np.where(m_overturn > m_thrust, m_overturn, m_thrust),
+        }
+
+    def overturning_radius(self, f_dead, f_horiz, m_tot):
+        """
+        Parameters
+        ----------
+        f_dead : np.ndarray
+            The dead load of each design, in N
+
+        f_horiz : np.ndarray
+            The lateral load of each design, in N
+
+        m_tot : np.ndarray
+            The moment on each design, in N * m
+
+        Returns
+        -------
+        np.ndarray
+            The real root of the overturning cubic of each design.
+        """
+        safety_overturn = 1.5
+        p = np.column_stack([
+            np.pi * self.depth * self.unit_weight,
+            np.zeros(len(f_dead)),
+            f_dead,
+            - (safety_overturn * (m_tot + f_horiz * self.depth))
+        ])
+
+        # The companion matrices that numpy.roots() would build
+        companion = np.zeros((len(p), 3, 3))
+        companion[:, 1, 0] = 1
+        companion[:, 2, 1] = 1
+        companion[:, 0, :] = -p[:, 1:] / p[:, :1]
+        roots = np.linalg.eigvals(companion)
+
+        is_real = np.imag(roots) == 0
+        return np.real(roots[np.arange(len(roots)), is_real.argmax(axis=1)])
+
+    def slipping_radius(self, f_dead, f_lat):
+        """
+        Parameters
+        ----------
+        f_dead : np.ndarray
+            The dead load of each design, in N
+
+        f_lat : np.ndarray
+            The drag force on each design, in N
+
+        Returns
+        -------
+        np.ndarray
+            The foundation radius of each design based on slipping, which is
+            zero when the dead load alone prevents slipping.
+        """
+        safety_slipping = 1.5
+        friction_angle_soil = 25
+        tangent_slip_angle = math.tan((friction_angle_soil * math.pi) / 180)
+        slipping_force_with_sf = (safety_slipping * f_lat)
+        with np.errstate(invalid='ignore'):
+            r_slipping = self.power(((slipping_force_with_sf / tangent_slip_angle) - f_dead) /
+                                    (self.unit_weight * math.pi * self.depth), 0.5)
+        return np.where(slipping_force_with_sf < (f_dead * tangent_slip_angle), 0.0, r_slipping)
+
+    def radii(self):
+        """
+        Sizes the foundations.
+
+        Returns
+        -------
+        dict
+            Keys are the keys of FoundationCost's output dictionary, such as
+            'Radius_o_m' and 'F_dead_kN_per_turbine'. Values are arrays with
+            the value for each design.
+
+        Raises
+        ------
+        ValueError
+            If the gapping or bearing radius of a design cannot be found.
+        """
+        loads = self.loads()
+        f_dead = loads['f_dead']
+        m_tot = loads['m_tot']
+        depth = self.depth
+        unit_weight = self.unit_weight
+
+        r_overturn = self.overturning_radius(f_dead, loads['f_horiz'], m_tot)
+        r_slipping = self.slipping_radius(f_dead, loads['f_lat'])
+        r_test_gapping = np.maximum(r_overturn, r_slipping)
+
+        # calculate foundation radius based on gapping
+        # check if gapping constrain is already satisfied - r / 3 < e
+        foundation_vol = np.pi * self.power(r_test_gapping, 2) * depth
+        v_1 = (foundation_vol * unit_weight + f_dead)
+        e = m_tot / v_1
+        needs_gapping = ~((r_test_gapping / 3) < e)
+
+        def r_g(x, index):
+            foundation_vol = np.pi * self.power(x, 2) * depth[index]
+            v_1 = (foundation_vol * unit_weight + f_dead[index])
+            e = m_tot[index] / v_1
+            return (e * 3 - x)
+
+        r_gapping = np.zeros(len(f_dead))
+        gapping_index = np.flatnonzero(needs_gapping)
+        if len(gapping_index) > 0:
+            roots, converged = self.brentq(r_g, 0.9 * r_overturn[gapping_index], 50, gapping_index, xtol=1e-4, maxiter=50)
+            self.check_converged(converged, gapping_index, 'r_gapping')
+            r_gapping[gapping_index] = roots
+
+        r_test_bearing = np.maximum(r_test_gapping, r_gapping)
+
+        # calculate foundation radius based on bearing pressure
+        foundation_vol = np.pi * self.power(r_test_bearing, 2) * depth
+        v_1 = (foundation_vol * unit_weight + f_dead)
+        e_bearing = m_tot / v_1
+        a_eff = v_1 / self.bearing_pressure_n_m2
+
+        def r_b(x, index):
+            e = e_bearing[index]
+            x_squared = self.power(x, 2)
+            return (2 * (x_squared - e * self.power(x_squared - self.power(e, 2), 0.5)) - a_eff[index])
+
+        all_index = np.arange(len(f_dead))
+        r_bearing, converged = self.brentq(r_b, 0.9 * r_overturn, 50, all_index, xtol=1e-10, maxiter=50)
+        self.check_converged(converged, all_index, 'r_bearing')
+
+        # pick the largest foundation radius based on all 4 foundation design criteria: moment, gapping, bearing, slipping
+        r_choosen = np.maximum(np.maximum(r_bearing, r_overturn), np.maximum(r_slipping, r_gapping))
+
+        return {
+            'F_dead_kN_per_turbine': f_dead / 1e3,
+            'F_horiz_kN_per_turbine': loads['f_lat'] / 1e3,
+            'M_tot_kN_m_per_turbine': m_tot / 1e3,
+            'Radius_o_m': r_overturn,
+            'Radius_s_m': r_slipping,
+            'Radius_g_m': r_gapping,
+            'Radius_b_m': r_bearing,
+            'Radius_m': r_choosen,
+        }
+
+    def check_converged(self, converged, index, radius_name):
+        """
+        Parameters
+        ----------
+        converged : np.ndarray
+            True for each design whose root was found.
+
+        index : np.ndarray
+            The indices of the designs.
+
+        radius_name : str
+            The name of the radius, for the error message.
+
+        Raises
+        ------
+        ValueError
+            If a root was not found.
+        """
+        if not converged.all():
+            failed = [self.project_names[i] for i in index[~converged]]
+            raise ValueError(f'Warning {failed} calculate_foundation_load {radius_name} solve failed')
+
+    @classmethod
+    def brentq(cls, f, xa, xb, index, xtol, maxiter, rtol=None):
+        """
+        Finds a root of f in each bracket with Brent's method, taking the
+        same steps as scipy.optimize.brentq()
+
+        Parameters
+        ----------
+        f : callable
+            f(x, index) returns the value of the function of each design in
+            index at x.
+
+        xa : np.ndarray or float
+            The lower end of the bracket of each design.
+
+        xb : np.ndarray or float
+            The upper end of the bracket of each design.
+
+        index : np.ndarray
+            The indices of the designs, passed to f.
+
+        xtol : float
+            The absolute tolerance.
+
+        maxiter : int
+            The maximum number of iterations.
+
+        rtol : float
+            The relative tolerance. Defaults to that of scipy.
+
+        Returns
+        -------
+        np.ndarray, np.ndarray
+            The root of each design, and whether it converged. The root of a
+            design whose bracket does not change sign is 0 and did not
+            converge.
+        """
+        rtol = cls.brentq_rtol if rtol is None else rtol
+        xpre = np.broadcast_to(np.asarray(xa, dtype=float), np.shape(index)).copy()
+        xcur = np.broadcast_to(np.asarray(xb, dtype=float), np.shape(index)).copy()
+        fpre = f(xpre, index)
+        fcur = f(xcur, index)
+        xblk = np.zeros(xpre.shape)
+        fblk = np.zeros(xpre.shape)
+        spre = np.zeros(xpre.shape)
+        scur = np.zeros(xpre.shape)
+
+        root = np.zeros(xpre.shape)
+        converged = np.zeros(xpre.shape, dtype=bool)
+        done = np.zeros(xpre.shape, dtype=bool)
+
+        def finish(mask, value, is_converged):
+            nonlocal done
+            mask = mask & ~done
+            root[mask] = value[mask]
+            converged[mask] = is_converged
+            done = done | mask
+
+        finish(fpre == 0, xpre, True)
+        finish(fcur == 0, xcur, True)
+        finish(np.signbit(fpre) == np.signbit(fcur), np.zeros(xpre.shape), False)
+        finish(np.isnan(fpre) | np.isnan(fcur), np.zeros(xpre.shape), False)
+
+        for _ in range(maxiter):
+            if done.all():
+                break
+            active = ~done
+            with np.errstate(all='ignore'):
+                new_bracket = (fpre != 0) & (fcur != 0) & (np.signbit(fpre) != np.signbit(fcur))
+                xblk = np.where(new_bracket, xpre, xblk)
+                fblk = np.where(new_bracket, fpre, fblk)
+                spre = np.where(new_bracket, xcur - xpre, spre)
+                scur = np.where(new_bracket, xcur - xpre, scur)
+
+                swap = np.abs(fblk) < np.abs(fcur)
+                xpre, xcur, xblk = np.where(swap, xcur, xpre), np.where(swap, xblk, xcur), np.where(swap, xcur, xblk)
+                fpre, fcur, fblk = np.where(swap, fcur, fpre), np.where(swap, fblk, fcur), np.where(swap, fcur, fblk)
+
+                delta = (xtol + rtol * np.abs(xcur)) / 2
+                sbis = (xblk - xcur) / 2
+                finish(active & ((fcur == 0) | (np.abs(sbis) < delta)), xcur, True)
+
+                interpolate = (np.abs(spre) > delta) & (np.abs(fcur) < np.abs(fpre))
+                dpre = (fpre - fcur) / (xpre - xcur)
+                dblk = (fblk - fcur) / (xblk - xcur)
+                stry = np.where(
+                    xpre == xblk,
+                    -fcur * (xcur - xpre) / (fcur - fpre),
+                    -fcur * (fblk * dblk - fpre * dpre) / (dblk * dpre * (fblk - fpre))
+                )
+                good_step = interpolate & (2 * np.abs(stry) < np.minimum(np.abs(spre), 3 * np.abs(sbis) - delta))
+                spre = np.where(good_step, scur, sbis)
+                scur = np.where(good_step, stry, sbis)
+
+                xpre = np.where(done, xpre, xcur)
+                fpre = np.where(done, fpre, fcur)
+                step = np.where(np.abs(scur) > delta, scur, np.where(sbis > 0, delta, -delta))
+                xcur = np.where(done, xcur, xcur + step)
+
+            still_active = np.flatnonzero(~done)
+            if len(still_active) > 0:
+                fcur[still_active] = f(xcur[still_active], index[still_active])
+                finish(np.isnan(fcur), xcur, False)
+
+        finish(~done, xcur, False)
+        return root, converged
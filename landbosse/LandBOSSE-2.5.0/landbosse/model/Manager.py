@@ -10,8 +10,9 @@ from .SitePreparationCost import SitePreparationCost
 from .CollectionCost import ArraySystem
 from .ErectionCost import ErectionCost
 from .DevelopmentCost import DevelopmentCost
-
-import pandas as pd
+from .ProjectTotals import ProjectTotals
+from .CostModuleGraph import CostModuleGraph
+from .WeatherWindowIndex import WeatherWindowIndex
 
 class Manager:
     """
@@ -20,7 +21,7 @@ class Manager:
     structure.
     """
 
-    def __init__(self, input_dict, output_dict):
+    def __init__(self, input_dict, output_dict, result_cache=None, reuse_module_results=False):
         """
         This initializer sets up the instance variables of:
 
@@ -30,12 +31,71 @@ class Manager:
         self.input_dict: A placeholder for the inputs dictionary
 
         self.output_dict: A placeholder for the output dictionary
+
+        self.result_cache: An optional ResultCache. If it is given, the
+            cost and details rows are read from it when the inputs have
+            been run before, instead of running the cost modules. Only
+            those rows are in the output dictionary in that case.
+
+        reuse_module_results: If True, each cost module reuses the results
+            of an earlier project whose inputs to the module were the same.
+            See CostModuleGraph.
         """
         self.input_dict = input_dict
         self.output_dict = output_dict
+        self.result_cache = result_cache
+        self.cost_module_graph = self.create_cost_module_graph(reuse_module_results)
+
+    @staticmethod
+    def create_cost_module_graph(reuse_module_results=False):
+        """
+        Declares the cost modules and their dependencies.
+
+        SitePreparationCost and ArraySystem read 'operational_hrs_per_day',
+        which FoundationCost writes to the input dictionary. ProjectTotals
+        combines the results of all the other modules into the construction
+        time and project value, and adjusts the road costs, and
+        ManagementCost reads those totals. The other modules only read the
+        master input dictionary.
+
+        Parameters
+        ----------
+        reuse_module_results : bool
+            If True, the graph reuses the results of modules whose inputs
+            have not changed.
+
+        Returns
+        -------
+        CostModuleGraph
+            The graph of cost modules.
+        """
+        graph = CostModuleGraph(reuse_results=reuse_module_results)
+        graph.add_module('foundation', FoundationCost)
+        graph.add_module('site_preparation', SitePreparationCost, depends_on=['foundation'])
+        graph.add_module('substation', SubstationCost)
+        graph.add_module('transport', TransportCost)
+        graph.add_module('grid_connection', GridConnectionCost)
+        graph.add_module('collection', ArraySystem, depends_on=['foundation'])
+        graph.add_module('development', DevelopmentCost)
+        graph.add_module('erection', ErectionCost)
+        graph.add_module('project_totals', ProjectTotals, depends_on=[
+            'foundation', 'site_preparation', 'substation', 'transport',
+            'grid_connection', 'collection', 'development', 'erection'
+        ])
+        graph.add_module('management', ManagementCost, depends_on=['project_totals'])
+        return graph
 
     def execute_landbosse(self, project_name):
         try:
+            # The key must be computed before the modules modify the input dictionary.
+            result_cache_key = None
+            if self.result_cache is not None:
+                result_cache_key = self.result_cache.key(self.input_dict, project_name)
+                cached_rows = self.result_cache.get(result_cache_key) if result_cache_key is not None else None
+                if cached_rows is not None:
+                    self.output_dict.update(cached_rows)
+                    return 0
+
             # Create weather window that will be used for all tasks (window for entire project; selected to restrict to seasons and hours specified)
             weather_data_user_input = self.input_dict['weather_window']
             season_construct = self.input_dict['season_construct']
@@ -43,73 +103,21 @@ class Manager:
             daily_operational_hours = self.input_dict['hour_day'][time_construct]
 
             # Filtered window. Restrict to the seasons and hours specified.
-            filtered_weather_window = weather_data_user_input.loc[(weather_data_user_input['Season'].isin(season_construct)) & (weather_data_user_input['Time window'] == time_construct)]
-            filtered_weather_window = filtered_weather_window[0:(math.ceil(self.input_dict['construct_duration'] * 30 * daily_operational_hours))]
+            # The rows of each combination of seasons and hours are found
+            # once per weather window and shared by the projects that use it.
+            weather_window_index = WeatherWindowIndex.for_weather_window(weather_data_user_input)
+            filtered_weather_window = weather_window_index.filter(season_construct, time_construct,
+                                                                  math.ceil(self.input_dict['construct_duration'] * 30 * daily_operational_hours))
 
             # Rename weather data to specify types
             self.input_dict['weather_window'] = filtered_weather_window
+            self.input_dict['weather_index'] = weather_window_index.weather_index(season_construct, time_construct)
             self.input_dict['weather_data_user_input'] = weather_data_user_input
 
-            foundation_cost = FoundationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            foundation_cost.run_module()
-
-            roads_cost = SitePreparationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            roads_cost.run_module()
-
-            substation_cost = SubstationCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            substation_cost.run_module()
-
-            transport_cost = TransportCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            transport_cost.run_module()
-
-            transdist_cost = GridConnectionCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            transdist_cost.run_module()
-
-            collection_cost = ArraySystem(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            collection_cost.run_module()
-
-            development_cost = DevelopmentCost(input_dict=self.input_dict, output_dict=self.output_dict,
-                                          project_name=project_name)
-            development_cost.run_module()
-
-            erection_cost_output_dict = dict()
-            erection_cost = ErectionCost(
-                input_dict=self.input_dict,
-                output_dict=self.output_dict,
-                project_name=project_name
-            )
-            erection_cost.run_module()
-            self.output_dict['erection_cost'] = erection_cost_output_dict
-
-
-
-            self.output_dict['actual_construction_months'] = self.output_dict['siteprep_construction_months'] + \
-                                                             max(self.output_dict['erection_construction_months'],
-                                                             self.output_dict['foundation_construction_months'],
-                                                             self.output_dict['collection_construction_months']) + 1
-
-            if self.output_dict['actual_construction_months'] < self.input_dict['construct_duration']:
-                road_cost = self.output_dict['total_road_cost']
-                index = road_cost['Type of cost'] == 'Other'
-                other = road_cost[index]
-                amount_shorter_than_input_construction_time = (self.input_dict['construct_duration'] - self.output_dict['siteprep_construction_months'])
-                road_cost.loc[index, 'Cost USD'] = other['Cost USD'] - amount_shorter_than_input_construction_time * 55500
-                self.output_dict['total_road_cost'] = road_cost
-
-            total_costs = pd.concat((self.output_dict['total_collection_cost'],
-                                      self.output_dict['total_road_cost'],
-                                      self.output_dict['total_transdist_cost'],
-                                      self.output_dict['total_substation_cost'],
-                                      self.output_dict['total_transport_cost'],
-                                      self.output_dict['total_foundation_cost'], 
-                                      self.output_dict['total_erection_cost'], 
-                                      self.output_dict['total_development_cost'], 
-                                      ), sort=True)
-            self.input_dict['project_value_usd'] = float(total_costs['Cost USD'].sum())
-            self.input_dict['foundation_cost_usd'] = self.output_dict['total_foundation_cost']['Cost USD'].sum()
-
-            management_cost = ManagementCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name=project_name)
-            management_cost.run_module()
+            self.cost_module_graph.run(self.input_dict, self.output_dict, project_name)
+
+            if result_cache_key is not None:
+                self.result_cache.put(result_cache_key, self.output_dict)
 
             return 0
         except Exception:
@@ -0,0 +1,120 @@
+import pandas as pd
+
+
+class ProjectTotals:
+    """
+    **ProjectTotals.py**
+
+    Combines the results of the cost modules into the totals that
+    ManagementCost needs. It runs in the CostModuleGraph of Manager after
+    all the other cost modules and before ManagementCost.
+
+    The construction time of the project is the site preparation time plus
+    the longest of the erection, foundation and collection times, plus one
+    month. When it is shorter than the construction duration given as an
+    input, the 'Other' road costs are reduced by 55500 USD for each month
+    of the input duration after site preparation.
+
+    \n\n**Keys in the input dictionary are the following:**
+
+    construct_duration
+        (int) Construction duration given as an input [in months]
+
+    \n\n**Keys in the output dictionary read from the other modules:**
+
+    siteprep_construction_months, erection_construction_months,
+    foundation_construction_months, collection_construction_months
+        (float) Construction time of each module [in months]
+
+    total_collection_cost, total_road_cost, total_transdist_cost,
+    total_substation_cost, total_transport_cost, total_foundation_cost,
+    total_erection_cost, total_development_cost
+        (pd.DataFrame) Costs of each module, with a 'Cost USD' column
+
+    \n\n**Keys written to the input dictionary:**
+
+    project_value_usd
+        (float) Sum of the costs of all the modules except ManagementCost
+
+    foundation_cost_usd
+        (float) Sum of the foundation costs
+
+    \n\n**Keys written to the output dictionary:**
+
+    actual_construction_months
+        (float) Construction time of the project [in months]
+
+    total_road_cost
+        (pd.DataFrame) The road costs after the reduction above. The
+        dataframe written by SitePreparationCost is not modified, so the
+        result of SitePreparationCost can be reused by CostModuleGraph.
+
+    erection_cost
+        (dict) An empty dictionary, kept for compatibility.
+    """
+
+    def __init__(self, input_dict, output_dict, project_name):
+        """
+        Parameters
+        ----------
+        input_dict : dict
+            The input dictionary with key value pairs described in the
+            class documentation
+
+        output_dict : dict
+            The output dictionary with key value pairs as found on the
+            output documentation.
+
+        project_name : str
+            The project ID with serial.
+        """
+        self.input_dict = input_dict
+        self.output_dict = output_dict
+        self.project_name = project_name
+
+    def run_module(self):
+        """
+        Computes the totals.
+
+        Unlike the cost modules, errors are raised instead of returned, so
+        that ManagementCost does not run without the totals. The results of
+        a failed module are missing from the output dictionary, so this
+        raises KeyError when any other module failed. Manager reports the
+        error.
+
+        Returns
+        -------
+        tuple
+            (0, 0), since this method only returns when it succeeds.
+        """
+        self.output_dict['erection_cost'] = dict()
+
+        actual_construction_months = self.output_dict['siteprep_construction_months'] + \
+            max(self.output_dict['erection_construction_months'],
+                self.output_dict['foundation_construction_months'],
+                self.output_dict['collection_construction_months']) + 1
+        self.output_dict['actual_construction_months'] = actual_construction_months
+
+        road_cost = self.output_dict['total_road_cost']
+        if actual_construction_months < self.input_dict['construct_duration']:
+            road_cost = road_cost.copy()
+            index = road_cost['Type of cost'] == 'Other'
+            other = road_cost[index]
+            amount_shorter_than_input_construction_time = (self.input_dict['construct_duration'] -
+                                                           self.output_dict['siteprep_construction_months'])
+            road_cost.loc[index, 'Cost USD'] = other['Cost USD'] - amount_shorter_than_input_construction_time * 55500
+            self.output_dict['total_road_cost'] = road_cost
+
+        total_costs = pd.concat((self.output_dict['total_collection_cost'],
+                                 road_cost,
+                                 self.output_dict['total_transdist_cost'],
+                                 self.output_dict['total_substation_cost'],
+                                 self.output_dict['total_transport_cost'],
+                                 self.output_dict['total_foundation_cost'],
+                                 self.output_dict['total_erection_cost'],
+                                 self.output_dict['total_development_cost'],
+                                 ), sort=True)
+        self.input_dict['project_value_usd'] = float(total_costs['Cost USD'].sum())
+        self.input_dict['foundation_cost_usd'] = self.output_dict['total_foundation_cost']['Cost USD'].sum()
+
+        return 0, 0
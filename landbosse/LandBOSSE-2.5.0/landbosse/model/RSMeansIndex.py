@@ -0,0 +1,257 @@
+import numpy as np
+import pandas as pd
+
+from .ErectionPriceBook import dataframe_digest
+
+
+class RSMeansIndex:
+    """
+    This class holds the row positions of the rsmeans sheet grouped by
+    Module. SitePreparationCost,
+    CollectionCost and FoundationCost use it to select the rows of their
+    module with a gather instead of scanning the whole sheet with where()
+    and dropna() for every project.
+
+    An index is built from one rsmeans sheet, but it can gather rows from
+    any sheet with the same rows in the same order. The labor multiplier
+    only changes the 'Rate USD per unit' column, so XlsxReader builds the
+    index once from the rsmeans sheet shared by all the projects of a
+    project data file and every project gathers from its own copy with its
+    own labor rates.
+
+    Indices are cached by the identity of the sheet they are built from,
+    like the sheets of XlsxDataframeCache. Callers must treat the sheet as
+    read only once it is indexed.
+    """
+
+    # _cache is a class attribute that holds indices keyed by the id() of
+    # the sheet they were built from. Each index keeps a reference to its
+    # sheet, so the id cannot be reused while the index is cached.
+    _cache = {}
+
+    # The maximum number of indices held at once. When it is reached, the
+    # oldest index is evicted.
+    _max_entries = 32
+
+    # A row is an operation of its module if it has at least this many
+    # values that are not NaN. See operations()
+    operation_thresh = 4
+
+    def __init__(self, rsmeans):
+        """
+        Parameters
+        ----------
+        rsmeans : pd.DataFrame
+            The rsmeans sheet to index.
+        """
+        self.rsmeans = rsmeans
+        self.num_rows = len(rsmeans)
+        self._digest = None
+
+        modules = rsmeans['Module'].to_numpy()
+        num_values = rsmeans.notna().sum(axis=1).to_numpy()
+
+        # Keys are module names and values are the positions of the rows
+        # of each module.
+        self.module_positions = dict()
+
+        module_rows = dict()
+        for position, module in enumerate(modules):
+            if pd.isnull(module):
+                continue
+            module_rows.setdefault(module, []).append(position)
+
+        for module, rows in module_rows.items():
+            self.module_positions[module] = np.array(rows, dtype=np.intp)
+
+        # Keys are module names and values are the positions of the rows
+        # of each module with enough values to be an operation.
+        self.operation_positions = {
+            module: rows[num_values[rows] >= self.operation_thresh]
+            for module, rows in self.module_positions.items()
+        }
+
+    @staticmethod
+    def masked_dtype(dtype):
+        """
+        Parameters
+        ----------
+        dtype : np.dtype
+            The dtype of a column.
+
+        Returns
+        -------
+        np.dtype
+            The dtype of the column after where() masks out some of its rows.
+        """
+        if dtype.kind in 'iu':
+            return np.dtype('float64')
+        elif dtype.kind == 'b':
+            return np.dtype('object')
+        return dtype
+
+    @classmethod
+    def for_rsmeans(cls, rsmeans):
+        """
+        Returns the index of an rsmeans sheet, building and caching it if
+        the sheet has not been indexed before.
+
+        Parameters
+        ----------
+        rsmeans : pd.DataFrame
+            The rsmeans sheet.
+
+        Returns
+        -------
+        RSMeansIndex
+            The index of the sheet.
+        """
+        key = id(rsmeans)
+        if key in cls._cache:
+            return cls._cache[key]
+
+        index = cls(rsmeans)
+        if len(cls._cache) >= cls._max_entries:
+            cls._cache.pop(next(iter(cls._cache)))
+        cls._cache[key] = index
+        return index
+
+    @classmethod
+    def from_input_dict(cls, input_dict):
+        """
+        Parameters
+        ----------
+        input_dict : dict
+            The input dictionary of a cost module.
+
+        Returns
+        -------
+        RSMeansIndex
+            The index under the 'rsmeans_index' key, or the index of the
+            sheet under the 'rsmeans' key if there is no 'rsmeans_index' key.
+        """
+        if 'rsmeans_index' in input_dict:
+            return input_dict['rsmeans_index']
+        return cls.for_rsmeans(input_dict['rsmeans'])
+
+    def content_digest(self):
+        """
+        Returns
+        -------
+        str
+            The digest of the sheet the index was built from, so that
+            ResultCache can digest input dictionaries that hold an index.
+        """
+        if self._digest is None:
+            self._digest = dataframe_digest(self.rsmeans)
+        return self._digest
+
+    def check_rows(self, rsmeans):
+        """
+        Parameters
+        ----------
+        rsmeans : pd.DataFrame
+            A sheet to gather rows from.
+
+        Raises
+        ------
+        ValueError
+            If the sheet does not have the number of rows of the indexed
+            sheet.
+        """
+        if len(rsmeans) != self.num_rows:
+            raise ValueError(f'RSMeansIndex: rsmeans has {len(rsmeans)} rows but the index has {self.num_rows}')
+
+    def gather(self, rsmeans, positions):
+        """
+        Parameters
+        ----------
+        rsmeans : pd.DataFrame
+            A sheet with the same rows as the indexed sheet.
+
+        positions : np.ndarray
+            The positions of the rows to gather.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows at the positions, with their original index labels.
+        """
+        self.check_rows(rsmeans)
+        return rsmeans.take(positions)
+
+    def rows(self, rsmeans, module):
+        """
+        Selects the rows of a module. This is the same as
+        rsmeans[rsmeans['Module'] == module]
+
+        Parameters
+        ----------
+        rsmeans : pd.DataFrame
+            A sheet with the same rows as the indexed sheet.
+
+        module : str
+            The module name, such as 'Collection'.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows of the module.
+        """
+        return self.gather(rsmeans, self.module_positions.get(module, np.array([], dtype=np.intp)))
+
+    def operations(self, rsmeans, module):
+        """
+        Selects the operations of a module. This is the same as
+        rsmeans.where(rsmeans['Module'] == module).dropna(thresh=4)
+
+        Parameters
+        ----------
+        rsmeans : pd.DataFrame
+            A sheet with the same rows as the indexed sheet.
+
+        module : str
+            The module name, such as 'Roads'.
+
+        Returns
+        -------
+        pd.DataFrame
+            The operations of the module.
+        """
+        if module not in self.operation_positions:
+            return rsmeans.where(rsmeans['Module'] == module).dropna(thresh=self.operation_thresh)
+        operations = self.gather(rsmeans, self.operation_positions[module])
+
+        # where() turns integer columns into floats and boolean columns
+        # into objects when some rows of the sheet are masked out.
+        if len(self.module_positions[module]) < self.num_rows:
+            dtypes = operations.dtypes
+            if any(dtype.kind in 'iub' for dtype in dtypes):
+                operations = operations.astype(dtypes.map(self.masked_dtype))
+        return operations
+
+    def unique(self, rsmeans, module, column):
+        """
+        Finds the distinct values of a column among the rows of a module.
+        This is the same as
+        rsmeans[column].where(rsmeans['Module'] == module).dropna().unique()
+
+        Parameters
+        ----------
+        rsmeans : pd.DataFrame
+            A sheet with the same rows as the indexed sheet.
+
+        module : str
+            The module name.
+
+        column : str
+            The column name, such as 'Material type ID'.
+
+        Returns
+        -------
+        np.ndarray
+            The distinct values that are not NaN, in order of appearance.
+        """
+        self.check_rows(rsmeans)
+        positions = self.module_positions.get(module, np.array([], dtype=np.intp))
+        return rsmeans[column].take(positions).dropna().unique()
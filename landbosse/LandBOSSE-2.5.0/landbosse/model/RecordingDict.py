@@ -0,0 +1,199 @@
+import hashlib
+
+from .ResultCache import ResultCache
+
+
+class RecordingDict(dict):
+    """
+    This is a shallow copy of an input or output dictionary that records
+    which keys a cost module reads and writes. CostModuleGraph gives one to
+    each module it runs, then copies the written keys back to the original
+    dictionary.
+
+    A key counts as read when the module gets its value, with [] or get(),
+    or tests whether it is present with the in operator, before the module
+    has written it. Calling keys(), or iterating over the dictionary, reads
+    the set of keys, which is recorded under the key RecordingDict.key_set.
+    Calling items() or values() reads every key.
+
+    If digest_values is True, the digest of each value is computed when it
+    is first read, before the module has had a chance to modify it in
+    place. See ResultCache.digest_value()
+    """
+
+    # The key under which reading the set of keys is recorded.
+    key_set = '<keys>'
+
+    # The digest recorded for a key that is not present.
+    absent_digest = 'absent'
+
+    def __init__(self, original, digest_values=False):
+        """
+        Parameters
+        ----------
+        original : dict
+            The dictionary to copy.
+
+        digest_values : bool
+            If True, the digest of each value read is recorded.
+        """
+        super().__init__(original)
+        self.digest_values = digest_values
+
+        # The keys before the module wrote any. Keys the module adds do not
+        # depend on its inputs, so they are left out of the key set.
+        self.original_keys = list(original.keys())
+
+        # Keys are the keys read and values are the digests of the values
+        # when they were read, or None if values are not digested.
+        self.read_digests = dict()
+
+        # The keys written by the module.
+        self.written_keys = set()
+
+        # False if a value read cannot be digested.
+        self.digestable = True
+
+    def digest_of(self, key):
+        """
+        Parameters
+        ----------
+        key : object
+            A key of the dictionary, or RecordingDict.key_set
+
+        Returns
+        -------
+        str
+            The digest of the value of the key, or of the set of keys as they
+            were before the module wrote any.
+        """
+        if key == self.key_set:
+            return self.value_digest(sorted(self.original_keys, key=repr))
+        elif super().__contains__(key):
+            return self.value_digest(super().__getitem__(key))
+        else:
+            return self.absent_digest
+
+    @staticmethod
+    def value_digest(value):
+        """
+        Parameters
+        ----------
+        value : object
+            A value of the dictionary.
+
+        Returns
+        -------
+        str
+            The digest of the value. See ResultCache.digest_value()
+
+        Raises
+        ------
+        TypeError
+            If the value cannot be digested.
+        """
+        digest = hashlib.sha1()
+        ResultCache.digest_value(digest, value)
+        return digest.hexdigest()
+
+    def record_read(self, key):
+        """
+        Records a read of a key, unless the module has written the key or
+        has read it before.
+
+        Parameters
+        ----------
+        key : object
+            The key that is read.
+        """
+        if key in self.written_keys or key in self.read_digests:
+            return
+        digest = None
+        if self.digest_values:
+            try:
+                digest = self.digest_of(key)
+            except TypeError:
+                self.digestable = False
+        self.read_digests[key] = digest
+
+    def __getitem__(self, key):
+        self.record_read(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.record_read(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.record_read(key)
+        return super().__contains__(key)
+
+    def keys(self):
+        self.record_read(self.key_set)
+        return super().keys()
+
+    def __iter__(self):
+        self.record_read(self.key_set)
+        return super().__iter__()
+
+    def items(self):
+        for key in super().keys():
+            self.record_read(key)
+        return super().items()
+
+    def values(self):
+        for key in super().keys():
+            self.record_read(key)
+        return super().values()
+
+    def __setitem__(self, key, value):
+        self.written_keys.add(key)
+        super().__setitem__(key, value)
+
+    def setdefault(self, key, default=None):
+        if not self.__contains__(key):
+            self.__setitem__(key, default)
+        return super().__getitem__(key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self.__setitem__(key, value)
+
+    def written_values(self):
+        """
+        Returns
+        -------
+        dict
+            Keys are the keys written by the module and values are their
+            values now.
+        """
+        return {key: super(RecordingDict, self).__getitem__(key) for key in self.written_keys}
+
+    def modified_keys(self, original):
+        """
+        Finds the values the module read that it modified in place, such as
+        a dataframe it added a column to. Values are compared by digest, so
+        this only works when digest_values is True.
+
+        Parameters
+        ----------
+        original : dict
+            The dictionary this is a copy of, which still holds the values
+            that were read, even for the keys the module wrote.
+
+        Returns
+        -------
+        set
+            The keys whose values in the original dictionary have changed
+            since the module read them.
+        """
+        modified = set()
+        for key, digest in self.read_digests.items():
+            if key == self.key_set or digest is None or key not in original.keys():
+                continue
+            try:
+                if self.value_digest(original[key]) != digest:
+                    modified.add(key)
+            except TypeError:
+                modified.add(key)
+        return modified
@@ -0,0 +1,245 @@
+import glob
+import hashlib
+import numbers
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .ErectionPriceBook import dataframe_digest
+from .RSMeansIndex import RSMeansIndex
+from .WeatherIndex import WeatherIndex
+
+
+class ResultCache:
+    """
+    This class stores the cost and details rows computed by
+    Manager.execute_landbosse() on disk, keyed by a digest of everything
+    the result depends on:
+
+    - The project name, because it is written on every row.
+
+    - The master input dictionary, including the project data dataframes
+      and the weather window.
+
+    - The source code of the landbosse.model package, so that a change to
+      the model invalidates the whole cache.
+
+    A project whose inputs have not changed since it was last run is then
+    read from the cache instead of being computed again, which makes
+    repeated runs of nearly identical project lists, as in calibration,
+    much faster.
+
+    Each result is a pickle file named after its digest in the cache
+    folder. Files are written under a temporary name and then renamed, so
+    parallel processes can share a cache folder. Delete the folder to
+    clear the cache.
+    """
+
+    # Increment this when the format of the cache files changes, so that
+    # existing cache files are ignored.
+    version = 1
+
+    # The digest of the source code of the landbosse.model package. It is
+    # computed once per process.
+    _model_source_digest = None
+
+    def __init__(self, directory):
+        """
+        Parameters
+        ----------
+        directory : str
+            The folder that holds the cache files. It is created if it
+            does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        # The number of results found in and missing from the cache.
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def model_source_digest(cls):
+        """
+        Returns
+        -------
+        str
+            The hexadecimal SHA1 digest of the source code of every module
+            in the landbosse.model package.
+        """
+        if cls._model_source_digest is None:
+            digest = hashlib.sha1()
+            model_dir = os.path.dirname(os.path.abspath(__file__))
+            for filename in sorted(glob.glob(os.path.join(model_dir, '*.py'))):
+                digest.update(os.path.basename(filename).encode('utf-8'))
+                with open(filename, 'rb') as file:
+                    digest.update(file.read())
+            cls._model_source_digest = digest.hexdigest()
+        return cls._model_source_digest
+
+    @classmethod
+    def digest_value(cls, digest, value):
+        """
+        Updates a digest with a value of the master input dictionary.
+        Dictionaries, lists and tuples are digested recursively. Numbers
+        are digested by value, so that a NumPy float and a Python float
+        that are equal have the same digest. An RSMeansIndex is digested by
+        the sheet it was built from and a WeatherIndex by its wind speeds.
+
+        Parameters
+        ----------
+        digest : hashlib.sha1
+            The digest to update.
+
+        value : object
+            The value to digest.
+
+        Raises
+        ------
+        TypeError
+            If the value, or a value inside it, has a type that cannot be
+            digested.
+        """
+        if isinstance(value, pd.DataFrame):
+            digest.update(b'd' + dataframe_digest(value).encode('utf-8'))
+        elif isinstance(value, pd.Series):
+            digest.update(b'p' + repr(value.name).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        elif isinstance(value, np.ndarray):
+            digest.update(b'a' + f'{value.dtype.str}{value.shape}'.encode('utf-8'))
+            if value.dtype == object:
+                for item in value.ravel():
+                    cls.digest_value(digest, item)
+            else:
+                digest.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, dict):
+            digest.update(b'{')
+            for key in sorted(value.keys(), key=repr):
+                cls.digest_value(digest, key)
+                cls.digest_value(digest, value[key])
+            digest.update(b'}')
+        elif isinstance(value, (list, tuple)):
+            digest.update(b'[')
+            for item in value:
+                cls.digest_value(digest, item)
+            digest.update(b']')
+        elif isinstance(value, RSMeansIndex):
+            digest.update(b'i' + value.content_digest().encode('utf-8'))
+        elif isinstance(value, WeatherIndex):
+            digest.update(b'w' + value.content_digest().encode('utf-8'))
+        elif value is None:
+            digest.update(b'n')
+        elif isinstance(value, (bool, np.bool_)):
+            digest.update(b'b' + str(bool(value)).encode('utf-8'))
+        elif isinstance(value, numbers.Real):
+            digest.update(b'r' + repr(float(value)).encode('utf-8'))
+        elif isinstance(value, str):
+            digest.update(b's' + value.encode('utf-8') + b'\x00')
+        else:
+            raise TypeError(f'Cannot digest a value of type {type(value).__name__}')
+
+    def key(self, input_dict, project_name):
+        """
+        Computes the key of the result of a project.
+
+        Parameters
+        ----------
+        input_dict : dict
+            The master input dictionary, before Manager.execute_landbosse()
+            runs.
+
+        project_name : str
+            The project name given to Manager.execute_landbosse()
+
+        Returns
+        -------
+        str
+            The hexadecimal SHA1 key, or None if the input dictionary holds
+            a value that cannot be digested, in which case the result
+            cannot be cached.
+        """
+        digest = hashlib.sha1()
+        digest.update(self.model_source_digest().encode('utf-8'))
+        try:
+            self.digest_value(digest, project_name)
+            self.digest_value(digest, input_dict)
+        except TypeError:
+            return None
+        return digest.hexdigest()
+
+    def filename(self, key):
+        """
+        Parameters
+        ----------
+        key : str
+            The key of a result.
+
+        Returns
+        -------
+        str
+            The filename of the cache file of the result.
+        """
+        return os.path.join(self.directory, f'{key}.pkl')
+
+    def get(self, key):
+        """
+        Parameters
+        ----------
+        key : str
+            The key of a result, as returned by key()
+
+        Returns
+        -------
+        dict
+            The cached rows, to be added to the output dictionary, or None
+            if the result is not in the cache.
+        """
+        try:
+            with open(self.filename(key), 'rb') as file:
+                stored = pickle.load(file)
+        except Exception:
+            # A missing, unreadable or incompatible cache file is simply a
+            # cache miss.
+            stored = None
+
+        if stored is None or stored.get('version') != self.version:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return stored['rows']
+
+    def put(self, key, output_dict):
+        """
+        Stores the rows of an output dictionary in the cache. Only the
+        values under keys ending in '_csv' or '_module_type_operation', which
+        are the rows written to the output files, are stored. If the cache
+        cannot be written, nothing happens.
+
+        Parameters
+        ----------
+        key : str
+            The key of the result, as returned by key()
+
+        output_dict : dict
+            The output dictionary after Manager.execute_landbosse() has run.
+        """
+        stored = {
+            'version': self.version,
+            'rows': {
+                output_key: value
+                for output_key, value in output_dict.items()
+                if output_key.endswith('_csv') or output_key.endswith('_module_type_operation')
+            }
+        }
+        cache_filename = self.filename(key)
+        temporary_filename = f'{cache_filename}.{os.getpid()}.tmp'
+        try:
+            with open(temporary_filename, 'wb') as file:
+                pickle.dump(stored, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_filename, cache_filename)
+        except OSError:
+            if os.path.exists(temporary_filename):
+                os.remove(temporary_filename)
@@ -3,6 +3,7 @@ import math
 from .WeatherDelay import WeatherDelay as WD
 import traceback
 from .CostModule import CostModule
+from .RSMeansIndex import RSMeansIndex
 import pandas as pd
 
 class SitePreparationCost(CostModule):
@@ -125,6 +126,11 @@ class SitePreparationCost(CostModule):
 
     - total_road_cost
 
+    - siteprep_wind_delay_mission_hours, siteprep_wind_delay_construct_days
+      and siteprep_wind_multiplier: the mission time of the wind delays,
+      the construction days the delays are divided by and the resulting
+      wind multiplier. See StartDateSweep.
+
 
 
     """
@@ -278,6 +284,7 @@ class SitePreparationCost(CostModule):
 
         """
         throughput_operations = estimate_construction_time_input['rsmeans']
+        rsmeans_index = RSMeansIndex.from_input_dict(estimate_construction_time_input)
 
         #TODO: Figure out where 'construct_duration' gets read in.
         estimate_construction_time_output['road_construction_time'] = estimate_construction_time_input[
@@ -286,10 +293,9 @@ class SitePreparationCost(CostModule):
         # Main switch between small DW wind and (utility scale + distributed wind)
         # select operations for roads module that have data
         if estimate_construction_time_input['turbine_rating_MW'] >= 0.1:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Roads').dropna(thresh=4)
+            operation_data = rsmeans_index.operations(throughput_operations, 'Roads')
         else:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Small DW Roads').dropna(
-                thresh=4)
+            operation_data = rsmeans_index.operations(throughput_operations, 'Small DW Roads')
             operation_data = operation_data.dropna(subset=['Units'])
 
         # create list of unique material units for operations
@@ -476,7 +482,8 @@ class SitePreparationCost(CostModule):
         """
         rsmeans = calculate_cost_input_dict['rsmeans']
 
-        material_name = rsmeans['Material type ID'].where(rsmeans['Module'] == 'Roads').dropna().unique()
+        rsmeans_index = RSMeansIndex.from_input_dict(calculate_cost_input_dict)
+        material_name = rsmeans_index.unique(rsmeans, 'Roads', 'Material type ID')
 
         material_vol = pd.DataFrame(
             [[material_name[0], calculate_cost_output_dict['material_volume_cubic_yards'], 'Loose cubic yard']],
@@ -505,13 +512,16 @@ class SitePreparationCost(CostModule):
 
         operation_data = self.estimate_construction_time(calculate_cost_input_dict, calculate_cost_output_dict)
 
+        wind_delay_construct_days = operation_data['Time construct days'].max(skipna=True)
         wind_delay_fraction = (calculate_cost_output_dict['wind_delay_time'] / calculate_cost_input_dict[
-            'operational_hrs_per_day']) / operation_data['Time construct days'].max(skipna=True)
+            'operational_hrs_per_day']) / wind_delay_construct_days
         # check if wind_delay_fraction is greater than 1, which would mean weather delays are longer than they can possibily be for the input data
         if wind_delay_fraction > 1:
             raise ValueError('{}: Error: Wind delay greater than 100%'.format(type(self).__name__))
         calculate_cost_output_dict['wind_multiplier'] = 1 / (
                     1 - wind_delay_fraction)
+        calculate_cost_output_dict['siteprep_wind_delay_construct_days'] = wind_delay_construct_days
+        calculate_cost_output_dict['siteprep_wind_multiplier'] = calculate_cost_output_dict['wind_multiplier']
 
         per_diem = operation_data['Number of workers'] * operation_data['Number of crews'] * (operation_data['Time construct days'] + np.ceil(operation_data['Time construct days'] / 7)) * calculate_cost_input_dict['rsmeans_per_diem']
         labor_per_diem = per_diem.dropna()
@@ -847,7 +857,8 @@ class SitePreparationCost(CostModule):
 
             # pull only global inputs for weather delay from input_dict
             weather_data_keys = ('wind_shear_exponent',
-                                 'weather_window')
+                                 'weather_window',
+                                 'weather_index')
 
             # specify roads-specific weather delay inputs
             self.weather_input_dict = dict([(i, self.input_dict[i]) for i in self.input_dict if i in set(weather_data_keys)])
@@ -862,6 +873,7 @@ class SitePreparationCost(CostModule):
             operational_hrs_per_day = self.input_dict['hour_day'][self.input_dict['time_construct']]
             mission_time_hrs = duration_construction * operational_hrs_per_day
             self.weather_input_dict['mission_time_hours'] = mission_time_hrs
+            self.output_dict['siteprep_wind_delay_mission_hours'] = mission_time_hrs
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
@@ -0,0 +1,238 @@
+import numpy as np
+import pandas as pd
+
+from .WeatherIndex import WeatherIndex
+
+
+class StartDateSweep:
+    """
+    This class evaluates the wind delays of a project for every start date
+    of construction at once, instead of running the project once per start
+    date.
+
+    Manager runs a project as if construction starts at the first hour of
+    the filtered weather window (start_delay_hours is 0). Starting h hours
+    later shifts the hours of each module's mission by h. The foundation,
+    roads and collection modules share one critical wind speed and height,
+    so their delay hours are the same runs of a WeatherIndex. The wind
+    delays of every start are totalled from the prefix sums of those runs
+    with a few vectorized binary searches. See
+    WeatherIndex.delay_hours_of_runs()
+
+    Each swept module publishes the mission time it passes to WeatherDelay
+    and the construction days it divides the delay hours by, which are not
+    the same: roads and foundations use their longest operation for both,
+    collection divides by its trenching days. The wind multiplier of each
+    module and start follows from its delay hours as in the module. The
+    labor and equipment rental costs of a
+    module, which the modules multiply by the wind multiplier, are rescaled
+    by the ratio of the wind multiplier of each start to that of the first
+    hour. This is a first order estimate: fixed amounts inside those costs,
+    such as rental minimums, are rescaled as well. Erection delays, which
+    change the choice of cranes, are not swept.
+
+    The sweep is built from the input and output dictionaries of a project
+    after Manager.execute_landbosse() has run the cost modules.
+    """
+
+    # Keys are the labels of the swept modules. Values are the prefixes of
+    # the output keys of their wind delays, and the output keys of their
+    # costs.
+    swept_modules = {
+        'Foundation': ('foundation', 'total_foundation_cost'),
+        'Roads': ('siteprep', 'total_road_cost'),
+        'Collection': ('collection', 'total_collection_cost'),
+    }
+
+    # The types of cost that the modules multiply by the wind multiplier.
+    delay_cost_types = ['Labor', 'Equipment rental']
+
+    def __init__(self, input_dict, output_dict):
+        """
+        Parameters
+        ----------
+        input_dict : dict
+            The input dictionary of a project run by Manager.
+
+        output_dict : dict
+            The output dictionary of the project.
+        """
+        self.input_dict = input_dict
+        self.output_dict = output_dict
+        self.operational_hrs_per_day = input_dict['hour_day'][input_dict['time_construct']]
+
+        # The whole filtered weather window is available to later starts,
+        # not only the hours kept for the project.
+        if 'weather_index' in input_dict:
+            self.weather_index = input_dict['weather_index']
+        else:
+            self.weather_index = WeatherIndex(input_dict['weather_window']['Speed m per s'].values)
+
+        critical_wind_speed = input_dict['critical_speed_non_erection_wind_delays_m_per_s']
+        wind_height_of_interest_m = input_dict['critical_height_non_erection_wind_delays_m']
+        wind_shear_exponent = input_dict['wind_shear_exponent']
+        cutoff = self.weather_index.cutoff(critical_wind_speed, wind_height_of_interest_m, wind_shear_exponent)
+        if cutoff is not None:
+            self.runs = self.weather_index.runs(cutoff)
+        else:
+            wind_speed_at_height_m_s = self.weather_index.wind_speeds_m_s * \
+                (wind_height_of_interest_m / 100) ** wind_shear_exponent
+            self.runs = WeatherIndex.runs_of_mask(wind_speed_at_height_m_s > critical_wind_speed)
+
+    def mission_time_hours(self, label):
+        """
+        Parameters
+        ----------
+        label : str
+            The label of a swept module, such as 'Roads'.
+
+        Returns
+        -------
+        float
+            The mission time the module passes to WeatherDelay.
+        """
+        prefix, _ = self.swept_modules[label]
+        return self.output_dict[f'{prefix}_wind_delay_mission_hours']
+
+    def construct_days(self, label):
+        """
+        Parameters
+        ----------
+        label : str
+            The label of a swept module.
+
+        Returns
+        -------
+        float
+            The construction days the module divides its wind delay days by.
+        """
+        prefix, _ = self.swept_modules[label]
+        return self.output_dict[f'{prefix}_wind_delay_construct_days']
+
+    @classmethod
+    def required_output_keys(cls):
+        """
+        Returns
+        -------
+        list
+            The output keys the sweep reads. A project whose modules failed
+            does not have all of them.
+        """
+        return [
+            key
+            for prefix, cost_key in cls.swept_modules.values()
+            for key in [f'{prefix}_wind_delay_mission_hours', f'{prefix}_wind_delay_construct_days', cost_key]
+        ]
+
+    def start_hours(self, step_hours=None):
+        """
+        Parameters
+        ----------
+        step_hours : int
+            The number of hours between starts. Defaults to the operational
+            hours per day, which is one start per day of construction.
+
+        Returns
+        -------
+        np.ndarray
+            The start hours for which the missions of all the swept modules
+            fit in the weather window.
+        """
+        if step_hours is None:
+            step_hours = self.operational_hrs_per_day
+        step_hours = max(int(step_hours), 1)
+        longest_mission_hours = max(int(self.mission_time_hours(label)) for label in self.swept_modules)
+        last_start_hour = self.weather_index.num_hours - longest_mission_hours
+        return np.arange(0, max(last_start_hour + 1, 0), step_hours, dtype=np.int64)
+
+    def wind_delay_hours(self, mission_time_hours, start_hours):
+        """
+        Parameters
+        ----------
+        mission_time_hours : float
+            The length of the mission.
+
+        start_hours : np.ndarray
+            The start hours of the mission.
+
+        Returns
+        -------
+        np.ndarray, np.ndarray
+            The hours charged for the wind delays of each start, as in
+            WeatherDelay with start_delay_hours set to the start, and the
+            number of delays longer than WeatherIndex.long_delay_hours.
+        """
+        start_hours = np.asarray(start_hours, dtype=np.int64)
+        stops = np.minimum(start_hours + int(mission_time_hours) + 1, self.weather_index.num_hours)
+        return WeatherIndex.delay_hours_of_runs(self.runs, start_hours + 1, stops)
+
+    def wind_multipliers(self, label, start_hours):
+        """
+        Parameters
+        ----------
+        label : str
+            The label of a swept module.
+
+        start_hours : np.ndarray
+            The start hours.
+
+        Returns
+        -------
+        np.ndarray, np.ndarray, np.ndarray
+            The hours charged for wind delays, the number of long delays and
+            the wind multiplier of each start. The wind multiplier is NaN
+            for starts where the module would raise an error because the
+            delays are longer than the construction time.
+        """
+        charged_hours, long_delays = self.wind_delay_hours(self.mission_time_hours(label), start_hours)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wind_delay_fraction = (charged_hours / self.operational_hrs_per_day) / self.construct_days(label)
+            wind_multiplier = 1 / (1 - wind_delay_fraction)
+        return charged_hours, long_delays, np.where(wind_delay_fraction > 1, np.nan, wind_multiplier)
+
+    def run(self, start_hours=None):
+        """
+        Sweeps the start of construction.
+
+        Parameters
+        ----------
+        start_hours : np.ndarray
+            The start hours to evaluate. Defaults to start_hours()
+
+        Returns
+        -------
+        pd.DataFrame
+            One row for each start hour. For each swept module, the columns
+            hold the wind delay hours, the number of long wind delays, the
+            wind multiplier and the labor and equipment rental cost. The
+            'Project value USD' column holds the project value of Manager,
+            which is the total of all the module costs except management,
+            with the swept costs of the start. Use describe() on the result
+            for the distributions.
+        """
+        if start_hours is None:
+            start_hours = self.start_hours()
+        start_hours = np.asarray(start_hours, dtype=np.int64)
+
+        columns = {
+            'Start hour': start_hours,
+            'Start day': start_hours / self.operational_hrs_per_day,
+        }
+        project_value_usd = np.full(start_hours.shape, float(self.input_dict['project_value_usd']))
+
+        for label, (_, cost_key) in self.swept_modules.items():
+            charged_hours, long_delays, wind_multiplier = self.wind_multipliers(label, start_hours)
+            _, _, first_hour_wind_multiplier = self.wind_multipliers(label, np.zeros(1, dtype=np.int64))
+
+            costs = self.output_dict[cost_key]
+            delay_cost_usd = costs.loc[costs['Type of cost'].isin(self.delay_cost_types), 'Cost USD'].sum()
+            swept_delay_cost_usd = delay_cost_usd * (wind_multiplier / first_hour_wind_multiplier[0])
+            project_value_usd = project_value_usd + (swept_delay_cost_usd - delay_cost_usd)
+
+            columns[f'{label} wind delay hours'] = charged_hours
+            columns[f'{label} long wind delays'] = long_delays
+            columns[f'{label} wind multiplier'] = wind_multiplier
+            columns[f'{label} labor and equipment cost USD'] = swept_delay_cost_usd
+
+        columns['Project value USD'] = project_value_usd
+        return pd.DataFrame(columns)
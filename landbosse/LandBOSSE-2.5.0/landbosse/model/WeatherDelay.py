@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from .WeatherIndex import WeatherIndex
+
 
 class WeatherDelay:
     """
@@ -40,6 +42,11 @@ class WeatherDelay:
     wind_height_of_interest_m
         (float) Height used in wind shear calculations.
 
+    weather_index
+        (WeatherIndex) Optional. An index whose first hours are the hours of
+        the weather window. If it is given, the delays are looked up in the
+        index instead of scanning the weather window. See WeatherIndex.
+
     The OUTPUT keys are the following
 
     wind_delay
@@ -128,74 +135,27 @@ class WeatherDelay:
         # check if mission time exceeds size of weather window
         if mission_time > len(wind_speeds_m_s):
             raise ValueError('{}: Error: Mission time longer than weather window'.format(type(self).__name__))
-        wind_speeds_m_s_filtered = wind_speeds_m_s[(start_delay + 1):(int(mission_time) + 1)]
-
-        # Calculate the wind speed at the particular, given the wind shear exponent
-        wind_speed_at_height_m_s = wind_speeds_m_s_filtered * (wind_height_of_interest_m / 100) ** wind_shear_exponent
-
-        # wind_delays is an array of booleans. It is True if the critical
-        # wind speed is exceeded. False if the critical wind speed is not
-        # exceeded. Each element represents an hour of wind
+        start, stop, _ = slice(start_delay + 1, int(mission_time) + 1).indices(len(wind_speeds_m_s))
+
+        # The wind speed at the height of interest exceeds the critical wind
+        # speed for all the hours at or above a cutoff wind speed. The
+        # contiguous blocks of delay hours for each cutoff are found once by
+        # the weather index, and the durations of the delays are looked up
+        # from them. See WeatherIndex for details.
+        weather_index = self.input_dict.get('weather_index')
+        if weather_index is None:
+            weather_index = WeatherIndex(wind_speeds_m_s)
+        elif weather_index.num_hours < len(wind_speeds_m_s):
+            raise ValueError('{}: Error: Weather index shorter than weather window'.format(type(self).__name__))
+
+        cutoff = weather_index.cutoff(critical_wind_speed, wind_height_of_interest_m, wind_shear_exponent)
+        if cutoff is not None:
+            return weather_index.wind_delays(cutoff, start, stop)
+
+        # The wind shear scaling cannot be searched, so compare every hour.
+        wind_speed_at_height_m_s = wind_speeds_m_s[start:stop] * (wind_height_of_interest_m / 100) ** wind_shear_exponent
         wind_delays = wind_speed_at_height_m_s > critical_wind_speed
-
-        # If there are any wind delays found:
-        #
-        # Iterate over each of the wind_delays. Count for contiguous blocks of
-        # hours of wind delays. Add the length of each of these blocks to the
-        # delay_durations.
-        #
-        # This code snippet takes O(n) linear time. The trick in vectorizing it
-        # is that contiguous blocks of unknown length of True wind delays
-        # are needed to find durations. But linear time may not be a problem
-        # because the data we are iterating over has already been filtered down
-        # to a small set.
-
-        if np.any(wind_delays):
-
-            # Holds the list of delay durations
-            delay_durations = []
-
-            # As we go through each delay, this accumulates the duration of
-            # the current delay. Each True element of wind_delays increments
-            # this by one
-            current_delay_duration = 0
-
-            # The following variable is True if we are iterating through
-            # that are True, which means a weather delay.
-            iterating_through_wind_delay = False
-
-            # Iterate over each element of wind_delays. This is O(n) as
-            # noted above.
-            for wind_delay in np.nditer(wind_delays):
-                # If we are in a weather delay...
-                if wind_delay:
-                    # If we are not currently iterating over a weather delay
-                    # a new continuous sequence of delayed hours has started.
-                    if not iterating_through_wind_delay:
-                        current_delay_duration = 1
-                        iterating_through_wind_delay = True
-
-                    # While iterating over delay, increment counter.
-                    else:
-                        current_delay_duration += 1
-
-                # If we are NOT iterating through a wind delay
-                # And we were iterating through a wind delay, end that
-                # delay and record the duration.
-                elif iterating_through_wind_delay:
-                    delay_durations.append(current_delay_duration)
-                    iterating_through_wind_delay = False
-
-                # Otherwise we are not iterating through a wind delay and
-                # and did not finish a wind delay, so we do nothing with
-                # no need for an else.
-
-            # Finally return the durations we found.
-            return delay_durations
-
-        # If there are not wind delays, return a list with just 0 in it
-        else:
-            return [0]
+        return WeatherIndex.durations(WeatherIndex.runs_of_mask(wind_delays), 0, len(wind_delays))
 
     def run_module(self):
         """
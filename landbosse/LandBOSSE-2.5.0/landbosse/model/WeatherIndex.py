@@ -0,0 +1,304 @@
+import hashlib
+import numbers
+
+import numpy as np
+
+
+class WeatherIndex:
+    """
+    This class answers the wind delay queries of WeatherDelay for one
+    series of hourly wind speeds without rescanning the series.
+
+    A wind delay hour is an hour whose wind speed, scaled to the height of
+    interest with the wind shear power law, exceeds the critical wind
+    speed. Scaling is monotonic, so for any critical wind speed and height
+    the delay hours are the hours whose reference wind speed is at least
+    some cutoff, which is one of the distinct wind speeds of the series.
+    The cutoff is found by a binary search over the sorted distinct wind
+    speeds that evaluates the same floating point expression as
+    WeatherDelay, so the delay hours are exactly the same.
+
+    For each cutoff, the runs of contiguous delay hours are found once and
+    stored with prefix sums of their durations. The delays within any range
+    of hours are then found with two binary searches.
+
+    Manager builds one index for each combination of seasons and time
+    window of a weather window (see WeatherWindowIndex.weather_index()) and
+    passes it to the cost modules in the 'weather_index' key of the input
+    dictionary. The filtered weather window of a project holds the first
+    hours of the index.
+    """
+
+    # Delays longer than this many hours shut down construction for the day
+    long_delay_hours = 4
+
+    # The number of hours charged for a delay that shuts down construction
+    shutdown_hours = 10
+
+    # The maximum number of cutoffs whose runs are held at once. When it is
+    # reached, the runs of the oldest cutoff are evicted.
+    _max_cutoffs = 256
+
+    def __init__(self, wind_speeds_m_s):
+        """
+        Parameters
+        ----------
+        wind_speeds_m_s : np.ndarray
+            The hourly wind speeds at the reference height of 100 m, in the
+            order of the weather window.
+        """
+        self.wind_speeds_m_s = np.asarray(wind_speeds_m_s)
+        self.num_hours = len(self.wind_speeds_m_s)
+        self._digest = None
+
+        # The distinct wind speeds that are not NaN, in increasing order.
+        # NaN wind speeds never cause a delay.
+        self.sorted_speeds = np.unique(self.wind_speeds_m_s[~np.isnan(self.wind_speeds_m_s)])
+
+        # Keys are cutoffs and values are dicts of the runs of delay hours.
+        # See runs()
+        self._runs = dict()
+
+    def content_digest(self):
+        """
+        Returns
+        -------
+        str
+            The digest of the wind speeds, so that ResultCache can digest
+            input dictionaries that hold an index.
+        """
+        if self._digest is None:
+            digest = hashlib.sha1(self.wind_speeds_m_s.dtype.str.encode('utf-8'))
+            digest.update(np.ascontiguousarray(self.wind_speeds_m_s).tobytes())
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def cutoff(self, critical_wind_speed_m_per_s, wind_height_of_interest_m, wind_shear_exponent):
+        """
+        Finds the position in sorted_speeds of the smallest wind speed that
+        causes a delay.
+
+        Parameters
+        ----------
+        critical_wind_speed_m_per_s : float
+            Wind speed at the height of interest above which there is a
+            delay.
+
+        wind_height_of_interest_m : float
+            Height of interest.
+
+        wind_shear_exponent : float
+            Exponent of the wind shear power law.
+
+        Returns
+        -------
+        int
+            The cutoff. Hours with a wind speed of at least
+            sorted_speeds[cutoff] are delay hours. It is len(sorted_speeds)
+            if no hour is a delay hour. None if the scaling factor is not a
+            finite real number greater than zero, where the binary search
+            does not apply.
+        """
+        scaling = (wind_height_of_interest_m / 100) ** wind_shear_exponent
+        if not isinstance(scaling, numbers.Real) or not 0 < scaling < np.inf:
+            return None
+
+        # The comparison is made on one element arrays so that it has the
+        # dtype and rounding of the comparison in WeatherDelay.
+        low, high = 0, len(self.sorted_speeds)
+        while low < high:
+            middle = (low + high) // 2
+            if (self.sorted_speeds[middle:middle + 1] * scaling > critical_wind_speed_m_per_s)[0]:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def delay_mask(self, cutoff):
+        """
+        Parameters
+        ----------
+        cutoff : int
+            A cutoff returned by cutoff()
+
+        Returns
+        -------
+        np.ndarray
+            True for each delay hour.
+        """
+        if cutoff >= len(self.sorted_speeds):
+            return np.zeros(self.num_hours, dtype=bool)
+        return self.wind_speeds_m_s >= self.sorted_speeds[cutoff]
+
+    @classmethod
+    def runs_of_mask(cls, delay_mask):
+        """
+        Parameters
+        ----------
+        delay_mask : np.ndarray
+            True for each delay hour.
+
+        Returns
+        -------
+        dict
+            The runs of contiguous delay hours. 'starts' and 'ends' hold the
+            first hour of each run and the hour after it, in order.
+            'charged_hours' and 'long_delays' hold the cumulative sums of the
+            hours charged for each run and of the number of runs longer than
+            long_delay_hours, with a leading zero.
+        """
+        edges = np.diff(np.concatenate(([0], delay_mask.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        durations = ends - starts
+        is_long = durations > cls.long_delay_hours
+        charged_hours = np.where(is_long, cls.shutdown_hours, durations)
+        return {
+            'starts': starts,
+            'ends': ends,
+            'charged_hours': np.concatenate(([0], np.cumsum(charged_hours))),
+            'long_delays': np.concatenate(([0], np.cumsum(is_long))),
+        }
+
+    def runs(self, cutoff):
+        """
+        Returns the runs of delay hours for a cutoff, finding and caching
+        them the first time the cutoff is used. See runs_of_mask()
+        """
+        if cutoff not in self._runs:
+            if len(self._runs) >= self._max_cutoffs:
+                self._runs.pop(next(iter(self._runs)))
+            self._runs[cutoff] = self.runs_of_mask(self.delay_mask(cutoff))
+        return self._runs[cutoff]
+
+    @staticmethod
+    def counted_runs(runs, start, stop):
+        """
+        Finds the runs that WeatherDelay counts within the hours
+        [start, stop). A run that is still going on at the last hour is not
+        counted, and the first run is cut at the first hour.
+
+        Parameters
+        ----------
+        runs : dict
+            The runs of delay hours. See runs_of_mask()
+
+        start : int
+            The first hour.
+
+        stop : int
+            The hour after the last hour.
+
+        Returns
+        -------
+        int, int, bool
+            The positions of the first counted run and of the run after the
+            last counted run, and True if there is any delay hour within
+            the hours.
+        """
+        if start >= stop:
+            return 0, 0, False
+        first = int(np.searchsorted(runs['ends'], start, side='right'))
+        after = int(np.searchsorted(runs['starts'], stop, side='left'))
+        if first >= after:
+            return 0, 0, False
+        if runs['ends'][after - 1] >= stop:
+            after -= 1
+        return first, max(first, after), True
+
+    def wind_delays(self, cutoff, start, stop):
+        """
+        Finds the durations of the wind delays within the hours
+        [start, stop). The result is the same as the wind_delays output of
+        WeatherDelay.
+
+        Parameters
+        ----------
+        cutoff : int
+            A cutoff returned by cutoff()
+
+        start : int
+            The first hour.
+
+        stop : int
+            The hour after the last hour.
+
+        Returns
+        -------
+        list
+            The duration in hours of each delay, or [0] if there is no delay
+            hour.
+        """
+        return self.durations(self.runs(cutoff), start, stop)
+
+    @classmethod
+    def durations(cls, runs, start, stop):
+        """
+        Parameters
+        ----------
+        runs : dict
+            The runs of delay hours. See runs_of_mask()
+
+        start : int
+            The first hour.
+
+        stop : int
+            The hour after the last hour.
+
+        Returns
+        -------
+        list
+            The duration in hours of each delay counted within the hours
+            [start, stop), or [0] if there is no delay hour.
+        """
+        first, after, any_delay = cls.counted_runs(runs, start, stop)
+        if not any_delay:
+            return [0]
+        starts = np.maximum(runs['starts'][first:after], start)
+        return (runs['ends'][first:after] - starts).tolist()
+
+    @classmethod
+    def delay_hours_of_runs(cls, runs, starts, stops):
+        """
+        Parameters
+        ----------
+        runs : dict
+            The runs of delay hours. See runs_of_mask()
+
+        starts : np.ndarray
+            The first hour of each range.
+
+        stops : np.ndarray
+            The hour after the last hour of each range.
+
+        Returns
+        -------
+        np.ndarray, np.ndarray
+            The hours charged for the delays counted within each range and
+            the number of delays longer than long_delay_hours.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        stops = np.asarray(stops, dtype=np.int64)
+        charged_hours = np.zeros(starts.shape, dtype=np.int64)
+        long_delays = np.zeros(starts.shape, dtype=np.int64)
+        num_runs = len(runs['starts'])
+        if num_runs == 0:
+            return charged_hours, long_delays
+
+        # The same steps as counted_runs(), for every range.
+        first = np.searchsorted(runs['ends'], starts, side='right')
+        after = np.searchsorted(runs['starts'], stops, side='left')
+        any_delay = (starts < stops) & (first < after)
+        last_run = np.clip(after - 1, 0, num_runs - 1)
+        after = np.where(any_delay & (runs['ends'][last_run] >= stops), after - 1, after)
+        counted = any_delay & (after > first)
+
+        # Only the first run can be cut short by the first hour.
+        first_run = np.minimum(first, num_runs - 1)
+        duration = runs['ends'][first_run] - np.maximum(runs['starts'][first_run], starts)
+        is_long = duration > cls.long_delay_hours
+        next_run = np.minimum(first + 1, num_runs)
+        charged_hours = np.where(is_long, cls.shutdown_hours, duration) + \
+            runs['charged_hours'][np.maximum(after, next_run)] - runs['charged_hours'][next_run]
+        long_delays = is_long + runs['long_delays'][np.maximum(after, next_run)] - runs['long_delays'][next_run]
+        return np.where(counted, charged_hours, 0), np.where(counted, long_delays, 0)
@@ -0,0 +1,153 @@
+import numpy as np
+
+from .WeatherIndex import WeatherIndex
+
+
+class WeatherWindowIndex:
+    """
+    This class holds the row positions of a weather window that fall in the
+    seasons and time window of construction. Manager uses it to filter the
+    weather window of each project with a gather instead of comparing the
+    Season and Time window columns of every row.
+
+    The projects of a sweep share a few extended weather windows (see
+    XlsxReader.create_master_input_dictionaries()) and a few combinations of
+    season_construct and time_construct, so the positions of each
+    combination are found once per weather window. The filtered window of a
+    project is the first rows at those positions.
+
+    Indices are cached by the identity of the weather window they are built
+    from, like RSMeansIndex. Callers must treat the weather window as read
+    only once it is indexed.
+    """
+
+    # _cache is a class attribute that holds indices keyed by the id() of
+    # the weather window they were built from. Each index keeps a reference
+    # to its weather window, so the id cannot be reused while the index is
+    # cached.
+    _cache = {}
+
+    # The maximum number of indices held at once. When it is reached, the
+    # oldest index is evicted.
+    _max_entries = 32
+
+    def __init__(self, weather_window):
+        """
+        Parameters
+        ----------
+        weather_window : pd.DataFrame
+            The weather window to index, with Season and Time window columns.
+        """
+        self.weather_window = weather_window
+
+        # Keys are tuples of the seasons and the time window. Values are the
+        # positions of the rows in one of the seasons and in the time window.
+        self.positions = dict()
+
+        # Keys are tuples of the seasons and the time window. Values are the
+        # WeatherIndex of the wind speeds at the positions.
+        self.weather_indices = dict()
+
+    @classmethod
+    def for_weather_window(cls, weather_window):
+        """
+        Returns the index of a weather window, creating and caching it if
+        the weather window has not been indexed before.
+
+        Parameters
+        ----------
+        weather_window : pd.DataFrame
+            The weather window.
+
+        Returns
+        -------
+        WeatherWindowIndex
+            The index of the weather window.
+        """
+        key = id(weather_window)
+        if key in cls._cache:
+            return cls._cache[key]
+
+        index = cls(weather_window)
+        if len(cls._cache) >= cls._max_entries:
+            cls._cache.pop(next(iter(cls._cache)))
+        cls._cache[key] = index
+        return index
+
+    def season_positions(self, season_construct, time_construct):
+        """
+        Parameters
+        ----------
+        season_construct : list
+            The seasons of construction, such as ['spring', 'summer'].
+
+        time_construct : str
+            The time window of construction, 'normal' or 'long'.
+
+        Returns
+        -------
+        np.ndarray
+            The positions of the rows in one of the seasons and in the time
+            window, in order.
+        """
+        key = (tuple(season_construct), time_construct)
+        if key not in self.positions:
+            weather_window = self.weather_window
+            # The time windows are compared as a NumPy array, because pandas
+            # cannot compare the read only object arrays of a cached weather
+            # window.
+            mask = weather_window['Season'].isin(season_construct).to_numpy() & \
+                (weather_window['Time window'].to_numpy() == time_construct)
+            self.positions[key] = np.flatnonzero(mask)
+        return self.positions[key]
+
+    def filter(self, season_construct, time_construct, num_hours):
+        """
+        Filters the weather window to the seasons and time window of
+        construction and keeps the first hours. This is the same as
+
+        weather_window.loc[(weather_window['Season'].isin(season_construct)) &
+                           (weather_window['Time window'] == time_construct)][0:num_hours]
+
+        Parameters
+        ----------
+        season_construct : list
+            The seasons of construction.
+
+        time_construct : str
+            The time window of construction.
+
+        num_hours : int
+            The number of hours to keep.
+
+        Returns
+        -------
+        pd.DataFrame
+            The filtered weather window, with the index labels of the rows
+            of the weather window.
+        """
+        positions = self.season_positions(season_construct, time_construct)
+        return self.weather_window.take(positions[0:num_hours])
+
+    def weather_index(self, season_construct, time_construct):
+        """
+        Parameters
+        ----------
+        season_construct : list
+            The seasons of construction.
+
+        time_construct : str
+            The time window of construction.
+
+        Returns
+        -------
+        WeatherIndex
+            The index of the wind speeds of the rows in one of the seasons
+            and in the time window. The filtered weather windows returned by
+            filter() hold the first hours of the index.
+        """
+        key = (tuple(season_construct), time_construct)
+        if key not in self.weather_indices:
+            positions = self.season_positions(season_construct, time_construct)
+            self.weather_indices[key] = WeatherIndex(self.weather_window['Speed m per s'].to_numpy()[positions])
+        return self.weather_indices[key]
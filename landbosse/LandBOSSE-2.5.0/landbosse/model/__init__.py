@@ -3,9 +3,21 @@ from .Manager import Manager
 from .WeatherDelay import WeatherDelay
 from .FoundationCost import FoundationCost
 from .ErectionCost import ErectionCost
+from .ErectionPriceBook import ErectionPriceBook
+from .RSMeansIndex import RSMeansIndex
+from .WeatherIndex import WeatherIndex
+from .WeatherWindowIndex import WeatherWindowIndex
+from .StartDateSweep import StartDateSweep
 from .SitePreparationCost import SitePreparationCost
 from .SubstationCost import SubstationCost
 from .GridConnectionCost import GridConnectionCost
 from .CollectionCost import Cable, Array, ArraySystem
 from .DevelopmentCost import DevelopmentCost
 from .DefaultMasterInputDict import DefaultMasterInputDict
+from .ResultCache import ResultCache
+from .RecordingDict import RecordingDict
+from .CostModuleGraph import CostModuleGraph
+from .ProjectTotals import ProjectTotals
+from .ClosedFormCostBatch import ClosedFormCostBatch
+from .FoundationSizingBatch import FoundationSizingBatch
+from .CollectionLayoutBatch import CollectionLayoutBatch
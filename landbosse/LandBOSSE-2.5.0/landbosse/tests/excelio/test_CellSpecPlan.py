@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import CellSpecPlan, CopyOnWriteSheets
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestCellSpecPlan(TestCase):
+    def setUp(self):
+        CellSpecPlan._cache = {}
+        self.shared = {
+            'crew_price': pd.DataFrame({
+                'Labor type ID': ['Rigger', 'Oiler', 'Rigger'],
+                'Hourly rate USD per hour': [80.0, 60.0, 85.0],
+            }),
+        }
+        self.parameter_names = ['Project ID', 'Turbine rating MW', 'crew_price/Rigger/Hourly rate USD per hour',
+                                'project list/x/Turbine rating MW', 'crew_price/Welder/Hourly rate USD per hour']
+
+    def project_parameters(self, rigger_rate, turbine_rating=None, welder_rate=None):
+        return pd.Series([
+            'a', 2.0, rigger_rate, turbine_rating, welder_rate
+        ], index=self.parameter_names, dtype=object)
+
+    def test_apply_writes_every_matching_row(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        project_parameters = self.project_parameters(90.0, turbine_rating=3.0)
+        CellSpecPlan.for_project(sheets, project_parameters.index).apply(sheets, project_parameters)
+        self.assertEqual(list(sheets['crew_price']['Hourly rate USD per hour']), [90.0, 60.0, 90.0])
+        self.assertEqual(list(self.shared['crew_price']['Hourly rate USD per hour']), [80.0, 60.0, 85.0])
+        self.assertEqual(project_parameters['Turbine rating MW'], 3.0)
+
+    def test_plans_are_reused_for_equivalent_sheets(self):
+        plan = CellSpecPlan.for_project(CopyOnWriteSheets(self.shared), self.parameter_names)
+        copies = {'crew_price': self.shared['crew_price'].copy()}
+        self.assertIs(CellSpecPlan.for_project(copies, self.parameter_names), plan)
+        copies['crew_price'].loc[1, 'Labor type ID'] = 'Welder'
+        self.assertIsNot(CellSpecPlan.for_project(copies, self.parameter_names), plan)
+
+    def test_errors_only_for_cells_with_values(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        plan = CellSpecPlan.for_project(sheets, self.parameter_names)
+        plan.apply(sheets, self.project_parameters(90.0))
+        with self.assertRaises(XlsxOperationException):
+            plan.apply(sheets, self.project_parameters(90.0, welder_rate=70.0))
+        with self.assertRaises(XlsxOperationException):
+            plan.validate()
+        plan.validate(['crew_price/Rigger/Hourly rate USD per hour'])
+
+    def test_missing_sheet_and_column(self):
+        plan = CellSpecPlan(self.shared, ['equip_price/Crane/Price', 'crew_price/Rigger/Per diem USD per day'])
+        self.assertEqual(set(plan.errors), {'equip_price/Crane/Price', 'crew_price/Rigger/Per diem USD per day'})
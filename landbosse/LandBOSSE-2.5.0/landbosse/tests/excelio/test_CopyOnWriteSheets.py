@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import CopyOnWriteSheets
+from landbosse.excelio import XlsxReader
+
+
+class TestCopyOnWriteSheets(TestCase):
+    def setUp(self):
+        """
+        Makes shared sheets, as they would be held by XlsxDataframeCache.
+        """
+        self.shared = {
+            'crew_price': CopyOnWriteSheets.read_only(
+                pd.DataFrame({'Labor type ID': ['Rigger', 'Oiler'], 'Hourly rate USD per hour': [80.0, 60.0]})
+            ),
+            'equip_price': CopyOnWriteSheets.read_only(
+                pd.DataFrame({'Equipment name': ['Crawler crane'], 'Equipment price USD per hour': [100.0]})
+            ),
+        }
+
+    def test_only_written_sheets_are_copied(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        project_parameters = pd.Series({
+            'crew_price/Oiler/Hourly rate USD per hour': 65.0,
+            'equip_price/Crawler crane/Equipment price USD per hour': None,
+        }, dtype=object)
+        XlsxReader().modify_project_data_and_project_list(sheets, project_parameters)
+
+        self.assertEqual(sheets.copied_sheet_names, {'crew_price'})
+        self.assertIs(sheets['equip_price'], self.shared['equip_price'])
+        self.assertEqual(sheets['crew_price']['Hourly rate USD per hour'].iloc[1], 65.0)
+        self.assertEqual(self.shared['crew_price']['Hourly rate USD per hour'].iloc[1], 60.0)
+
+    def test_writable_returns_the_same_copy(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        first = sheets.writable('crew_price')
+        self.assertIsNot(first, self.shared['crew_price'])
+        self.assertIs(first, sheets.writable('crew_price'))
+        self.assertIs(first, sheets['crew_price'])
+
+    def test_shared_sheets_cannot_be_written(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        with self.assertRaises(ValueError):
+            sheets['crew_price'].loc[1, 'Hourly rate USD per hour'] = 65.0
+        with self.assertRaises(ValueError):
+            sheets['crew_price'].iloc[0, 0] = 'Operator'
+        self.assertEqual(list(self.shared['crew_price']['Labor type ID']), ['Rigger', 'Oiler'])
+
+        sheets.writable('crew_price').loc[1, 'Hourly rate USD per hour'] = 65.0
+        self.assertEqual(sheets['crew_price']['Hourly rate USD per hour'].iloc[1], 65.0)
+
+    def test_read_only_keeps_the_values(self):
+        df = pd.DataFrame({
+            'Name': ['a', None],
+            'Value': [1.5, 2.5],
+            'Count': [1, 2],
+            'Date': pd.to_datetime(['2020-01-01', None]),
+        }, index=[3, 7])
+        pd.testing.assert_frame_equal(CopyOnWriteSheets.read_only(df), df)
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import CsvGenerator
+from landbosse.excelio import CsvResultSink
+
+
+class FileOperations:
+    """
+    Stands in for XlsxFileOperations with an output folder.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+
+    def landbosse_output_dir(self):
+        return self.output_dir
+
+
+class TestCsvResultSink(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.file_ops = FileOperations(self.temporary_directory.name)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def project_result(self, project_id_with_serial, cost):
+        return {
+            'project_series': pd.Series({'Project ID with serial': project_id_with_serial}),
+            'module_type_operation_list': [{
+                'project_id_with_serial': project_id_with_serial,
+                'num_turbines': 10,
+                'turbine_rating_MW': 2.0,
+                'rotor_diameter_m': 100.0,
+                'module': 'ErectionCost',
+                'type_of_cost': 'Labor',
+                'cost_per_turbine': cost / 10,
+                'cost_per_project': cost,
+                'usd_per_kw_per_project': cost / 20000,
+            }],
+            'details_list': [
+                {
+                    'project_id_with_serial': project_id_with_serial,
+                    'module': 'ErectionCost',
+                    'variable_df_key_col_name': 'Crane',
+                    'unit': 'unitless',
+                    'value': 'Crawler crane',
+                },
+                {
+                    'project_id_with_serial': project_id_with_serial,
+                    'module': 'ErectionCost',
+                    'variable_df_key_col_name': 'Total cost',
+                    'unit': 'usd',
+                    'value': cost,
+                },
+            ],
+        }
+
+    def test_rows_match_the_csv_generator(self):
+        project_results = [self.project_result('a', 100.0), self.project_result('b', 200.0)]
+        with CsvResultSink(self.file_ops) as sink:
+            for project_result in project_results:
+                sink.add_project(project_result)
+
+        self.assertEqual(sink.details_row_count, 4)
+        self.assertEqual(len(sink.module_type_operation_list), 2)
+
+        csv_generator = CsvGenerator(self.file_ops)
+        expected_costs = csv_generator.create_costs_dataframe(
+            [row for result in project_results for row in result['module_type_operation_list']])
+        expected_details = csv_generator.create_details_dataframe(
+            [row for result in project_results for row in result['details_list']])
+
+        costs = pd.read_csv(os.path.join(self.temporary_directory.name, 'landbosse-costs.csv'))
+        details = pd.read_csv(os.path.join(self.temporary_directory.name, 'landbosse-details.csv'))
+        pd.testing.assert_frame_equal(costs, expected_costs, check_dtype=False)
+        pd.testing.assert_frame_equal(details, expected_details, check_dtype=False)
+
+    def test_no_projects_writes_headers(self):
+        with CsvResultSink(self.file_ops):
+            pass
+        details = pd.read_csv(os.path.join(self.temporary_directory.name, 'landbosse-details.csv'))
+        self.assertEqual(list(details.columns), CsvGenerator.details_columns)
+        self.assertEqual(len(details), 0)
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import ParametricGrid
+from landbosse.excelio import XlsxReader
+
+
+class TestParametricGrid(TestCase):
+    def setUp(self):
+        """
+        Makes the parametric list from the XlsxReader.create_parametric_value_list()
+        docstring.
+        """
+        self.parametric_list = pd.DataFrame({
+            'Project ID': ['project1', 'project1', 'project2'],
+            'Dataframe name': ['alpha', 'beta', 'gamma'],
+            'Row name': ['fizz', 'foo', 'dogs'],
+            'Column name': ['buzz', 'bar', 'cats'],
+            'Min': [0, 0, 21],
+            'Max': [12, 12, 27],
+            'Step': [6, 6, 3],
+        })
+
+    def test_grid_points_in_depth_first_order(self):
+        grid = ParametricGrid(self.parametric_list[self.parametric_list['Project ID'] == 'project1'])
+        self.assertEqual(len(grid), 9)
+        self.assertEqual(grid.grid_point(0), {'alpha/fizz/buzz': 0, 'beta/foo/bar': 0})
+        self.assertEqual(grid.grid_point(5), {'alpha/fizz/buzz': 6, 'beta/foo/bar': 12})
+        self.assertEqual(list(grid.grid_points(7)), [grid.grid_point(7), grid.grid_point(8)])
+        self.assertEqual(list(grid.grid_values(3, 5)['beta/foo/bar']), [0, 6])
+        with self.assertRaises(IndexError):
+            grid.grid_point(9)
+
+    def test_generated_extended_project_list_matches_join(self):
+        project_list = pd.DataFrame({
+            'Project ID': ['project1', 'project2', 'project3'],
+            'Project data file': ['project1_data', 'project2_data', 'project3_data'],
+        })
+        xlsx_reader = XlsxReader()
+        parametric_value_list = xlsx_reader.create_parametric_value_list(self.parametric_list)
+        self.assertEqual(list(parametric_value_list['Project ID with serial'][[0, 9, 11]]),
+                         ['project1_00', 'project2_09', 'project2_11'])
+
+        extended_project_list = xlsx_reader.outer_join_projects_to_parametric_values(project_list, parametric_value_list)
+        self.assertEqual(xlsx_reader.count_extended_project_list(project_list, self.parametric_list), 13)
+
+        generated = pd.DataFrame(list(xlsx_reader.generate_extended_project_list(
+            project_list, self.parametric_list, chunk_size=4)))
+        expected = pd.DataFrame([row for _, row in extended_project_list.iterrows()])
+        pd.testing.assert_frame_equal(generated, expected)
+
+        generated = list(xlsx_reader.generate_extended_project_list(project_list, self.parametric_list, 8, 10))
+        self.assertEqual([row['Project ID with serial'] for row in generated], ['project1_08', 'project2_09'])
@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import ParametricSample
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+from landbosse.excelio import XlsxReader
+
+
+class TestParametricSample(TestCase):
+    def setUp(self):
+        """
+        Makes a parametric list where project1 is sampled and project2 is
+        a grid.
+        """
+        self.parametric_list = pd.DataFrame({
+            'Project ID': ['project1', 'project1', 'project2'],
+            'Dataframe name': ['alpha', 'beta', 'gamma'],
+            'Row name': ['fizz', 'foo', 'dogs'],
+            'Column name': ['buzz', 'bar', 'cats'],
+            'Min': [0, None, 21],
+            'Max': [12, None, 27],
+            'Step': [6, None, 3],
+            'Value list': [None, '1, 2, 3', None],
+            'Sampling': ['latin hypercube', None, None],
+            'Sample count': [10, None, None],
+        })
+
+    def test_sample_values(self):
+        sample = ParametricSample(self.parametric_list[self.parametric_list['Project ID'] == 'project1'])
+        self.assertEqual(len(sample), 10)
+        values = sample.grid_values()
+        self.assertTrue(((values['alpha/fizz/buzz'] >= 0) & (values['alpha/fizz/buzz'] <= 12)).all())
+        self.assertTrue(set(values['beta/foo/bar']) <= {1.0, 2.0, 3.0})
+
+        # Latin hypercube samples put exactly one point in each tenth of the range.
+        self.assertEqual(sorted((values['alpha/fizz/buzz'] // 1.2).astype(int)), list(range(10)))
+        self.assertEqual(sample.grid_point(4), {key: value[4] for key, value in values.items()})
+
+    def test_samples_are_numbered_like_grids(self):
+        parametric_value_list = XlsxReader().create_parametric_value_list(self.parametric_list)
+        self.assertEqual(len(parametric_value_list), 13)
+        self.assertEqual(list(parametric_value_list['Project ID with serial'][[0, 9, 10]]),
+                         ['project1_00', 'project1_09', 'project2_10'])
+
+        # The same seed gives the same sample.
+        again = XlsxReader().create_parametric_value_list(self.parametric_list)
+        pd.testing.assert_frame_equal(parametric_value_list, again)
+
+    def test_sample_count_is_required(self):
+        self.parametric_list['Sample count'] = None
+        with self.assertRaises(XlsxOperationException):
+            XlsxReader().create_parametric_value_list(self.parametric_list)
+
+    def test_sobol_sample_count_is_a_power_of_two(self):
+        self.parametric_list['Sampling'] = ['sobol', None, None]
+        with self.assertRaises(XlsxOperationException):
+            XlsxReader().create_parametric_value_list(self.parametric_list)
+
+        self.parametric_list['Sample count'] = [16, None, None]
+        sample = ParametricSample(self.parametric_list[self.parametric_list['Project ID'] == 'project1'])
+        self.assertEqual(len(sample), 16)
@@ -0,0 +1,38 @@
+from unittest import TestCase
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import SharedDataFrame
+
+
+class TestSharedDataFrame(TestCase):
+    def setUp(self):
+        """
+        Shares a small dataframe with one column of each kind that
+        SharedDataFrame stores.
+        """
+        self.df = pd.DataFrame({
+            'Speed m per s': np.array([1.5, 2.5, 3.5, 4.5], dtype=np.float32),
+            'Hour': [7, 8, 9, 10],
+            'Season': pd.Categorical(['winter', 'winter', 'spring', 'fall']),
+            'Date': pd.date_range('2020-01-01', periods=4, freq='H', tz='America/Denver'),
+            'Temp C': ['1', np.nan, '3', '1'],
+        })
+        self.shared_dataframe = SharedDataFrame(self.df)
+
+    def tearDown(self):
+        self.shared_dataframe.close()
+
+    def test_attach_round_trip(self):
+        attached = SharedDataFrame.attach(self.shared_dataframe.descriptor)
+        pd.testing.assert_frame_equal(attached, self.df)
+
+    def test_attached_values_are_read_only(self):
+        attached = SharedDataFrame.attach(self.shared_dataframe.descriptor)
+        with self.assertRaises(ValueError):
+            attached['Speed m per s'].values[0] = 0.0
+
+        # Replacing a column only affects the caller's dataframe.
+        attached['Speed m per s'] = 0.0
+        reattached = SharedDataFrame.attach(self.shared_dataframe.descriptor)
+        self.assertEqual(reattached['Speed m per s'].iloc[0], 1.5)
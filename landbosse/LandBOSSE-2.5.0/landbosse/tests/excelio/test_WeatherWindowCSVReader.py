@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio.WeatherWindowCSVReader import parse_weather_window, read_weather_window, extend_weather_window
+
+
+class TestWeatherWindowCSVReader(TestCase):
+    def setUp(self):
+        """
+        Makes a weather_window sheet in the wind toolkit format, as parsed
+        from the project data .xlsx: four header rows, then hourly rows.
+        """
+        dates = pd.date_range('2012-01-01 00:00', periods=48 * 100, freq='H')
+        header = pd.DataFrame({'Date': [pd.NaT] * 4, 'Temp': ['WTK', 'Temperature', 'C', 100],
+                               'Pressure': ['', 'Pressure', 'atm', 0], 'Direction': ['', '', '', 0],
+                               'Speed': ['', '', '', 0]})
+        rows = pd.DataFrame({'Date': dates, 'Temp': np.linspace(-5, 30, len(dates)),
+                             'Pressure': [0.95] * len(dates), 'Direction': np.arange(len(dates)) % 360,
+                             'Speed': np.linspace(0, 20, len(dates))})
+        self.weather_data = pd.concat([header, rows.astype(object)], ignore_index=True)
+
+    def expected_labels(self, local_dates):
+        seasons = {1: 'winter', 2: 'winter', 3: 'winter', 4: 'spring', 5: 'spring', 6: 'spring',
+                   7: 'summer', 8: 'summer', 9: 'summer', 10: 'fall', 11: 'fall', 12: 'fall'}
+        time_windows = ['normal' if 8 <= date.hour <= 18 else 'long' for date in local_dates]
+        return time_windows, [seasons[date.month] for date in local_dates]
+
+    def test_local_fields_and_labels(self):
+        weather_window = parse_weather_window(self.weather_data)
+        local_dates = list(weather_window['Date'])
+        self.assertEqual(str(weather_window['Date UTC'].dt.tz), 'UTC')
+        self.assertEqual(list(weather_window['Month']), [date.month for date in local_dates])
+        self.assertEqual(list(weather_window['Day']), [date.day for date in local_dates])
+        self.assertEqual(list(weather_window['Hour']), [date.hour for date in local_dates])
+        self.assertEqual(weather_window['Hour'].dtype, np.int64)
+        time_windows, seasons = self.expected_labels(local_dates)
+        self.assertEqual(list(weather_window['Time window']), time_windows)
+        self.assertEqual(list(weather_window['Season']), seasons)
+
+    def test_missing_dates(self):
+        self.weather_data.iloc[10, 0] = pd.NaT
+        weather_window = parse_weather_window(self.weather_data)
+        self.assertTrue(np.isnan(weather_window['Month'].iloc[6]))
+        self.assertEqual(weather_window['Month'].iloc[7], weather_window['Date'].iloc[7].month)
+        self.assertEqual(weather_window['Hour'].iloc[7], weather_window['Date'].iloc[7].hour)
+
+    def test_weather_windows_are_cached(self):
+        weather_window = read_weather_window(self.weather_data)
+        self.assertIs(read_weather_window(self.weather_data), weather_window)
+        self.assertIsNot(read_weather_window(self.weather_data.copy()), weather_window)
+
+    def test_cached_weather_windows_are_read_only(self):
+        weather_window = read_weather_window(self.weather_data)
+        with self.assertRaises(ValueError):
+            weather_window.loc[0, 'Speed m per s'] = 100.0
+        with self.assertRaises(ValueError):
+            weather_window.loc[0, 'Season'] = 'summer'
+        pd.testing.assert_frame_equal(weather_window, parse_weather_window(self.weather_data))
+
+    def test_dates_as_text(self):
+        expected = parse_weather_window(self.weather_data)
+        self.weather_data['Date'] = [
+            date if pd.isnull(date) else date.strftime('%Y-%m-%d %H:%M:%S') for date in self.weather_data['Date']
+        ]
+        pd.testing.assert_frame_equal(parse_weather_window(self.weather_data), expected)
+
+        self.weather_data['Date'] = [
+            date if pd.isnull(date) else f'{date}+00:00' for date in self.weather_data['Date']
+        ]
+        pd.testing.assert_frame_equal(parse_weather_window(self.weather_data), expected)
+
+    def test_extend_weather_window(self):
+        weather_window = parse_weather_window(self.weather_data)
+        self.assertIs(extend_weather_window(weather_window, 6), weather_window)
+        extended = extend_weather_window(weather_window, 14)
+        self.assertEqual(len(extended), 3 * len(weather_window))
+        self.assertEqual(list(extended.index), list(range(len(extended))))
+        self.assertEqual(extended['Speed m per s'].dtype, np.float64)
+        self.assertEqual(extended['Date'].dtype, weather_window['Date'].dtype)
+        tail = extended.iloc[2 * len(weather_window):].reset_index(drop=True)
+        self.assertEqual(list(tail['Season']), list(weather_window['Season']))
+        self.assertEqual(list(tail['Date UTC']), list(weather_window['Date UTC']))
+        np.testing.assert_array_equal(tail['Speed m per s'], weather_window['Speed m per s'].astype(np.float64))
@@ -0,0 +1,138 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from landbosse.excelio import XlsxDataframeCache
+from landbosse.excelio import XlsxReader
+from landbosse.model import Manager
+
+
+project_input_template = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'project_input_template')
+
+
+class TestXlsxDataframeCache(TestCase):
+    def setUp(self):
+        """
+        Writes a small project data .xlsx into a temporary folder, enables
+        the disk cache in another temporary folder and empties the in memory
+        cache.
+        """
+        XlsxDataframeCache._cache = {}
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.xlsx_path = self.temporary_directory.name
+        self.write_xlsx(hourly_rate=80.0)
+        self.cache_directory = tempfile.TemporaryDirectory()
+        self.environ = mock.patch.dict(os.environ, {'LANDBOSSE_CACHE_DIR': self.cache_directory.name})
+        self.environ.start()
+
+    def tearDown(self):
+        XlsxDataframeCache._cache = {}
+        self.environ.stop()
+        self.temporary_directory.cleanup()
+        self.cache_directory.cleanup()
+
+    def write_xlsx(self, hourly_rate):
+        df = pd.DataFrame({'Labor type ID': ['Rigger'], 'Hourly rate USD per hour': [hourly_rate]})
+        with pd.ExcelWriter(os.path.join(self.xlsx_path, 'project_data.xlsx')) as writer:
+            df.to_excel(writer, sheet_name='crew_price', index=False)
+
+    def read_hourly_rate(self):
+        sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('project_data', self.xlsx_path)
+        return sheets['crew_price']['Hourly rate USD per hour'].iloc[0]
+
+    def test_disk_cache_is_used_by_new_processes(self):
+        self.assertEqual(self.read_hourly_rate(), 80.0)
+        cache_filename = XlsxDataframeCache.persistent_cache_filename(os.path.join(self.xlsx_path, 'project_data.xlsx'))
+        self.assertTrue(os.path.isfile(cache_filename))
+        self.assertEqual(os.path.dirname(cache_filename), os.path.realpath(self.cache_directory.name))
+        self.assertEqual(os.listdir(self.xlsx_path), ['project_data.xlsx'])
+
+        # Emptying the in memory cache simulates a new process.
+        XlsxDataframeCache._cache = {}
+        entry = XlsxDataframeCache.read_persistent_cache(
+            os.path.join(self.xlsx_path, 'project_data.xlsx'),
+            XlsxDataframeCache.file_signature(os.path.join(self.xlsx_path, 'project_data.xlsx'))
+        )
+        self.assertIsNotNone(entry)
+        self.assertEqual(self.read_hourly_rate(), 80.0)
+
+    def test_cached_sheets_are_read_only(self):
+        sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('project_data', self.xlsx_path)
+        with self.assertRaises(ValueError):
+            sheets['crew_price'].loc[0, 'Hourly rate USD per hour'] = 1.0
+
+        # Sheets loaded from the disk cache are read only too.
+        XlsxDataframeCache._cache = {}
+        sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('project_data', self.xlsx_path)
+        with self.assertRaises(ValueError):
+            sheets['crew_price'].loc[0, 'Hourly rate USD per hour'] = 1.0
+        self.assertEqual(self.read_hourly_rate(), 80.0)
+
+    def test_changed_xlsx_invalidates_caches(self):
+        self.assertEqual(self.read_hourly_rate(), 80.0)
+        self.write_xlsx(hourly_rate=90.0)
+
+        # The in memory cache notices the change.
+        self.assertEqual(self.read_hourly_rate(), 90.0)
+
+        # So does the disk cache.
+        XlsxDataframeCache._cache = {}
+        self.assertEqual(self.read_hourly_rate(), 90.0)
+
+    def test_disk_cache_is_disabled_by_default(self):
+        with mock.patch.dict(os.environ, {'LANDBOSSE_CACHE_DIR': ''}):
+            self.assertIsNone(XlsxDataframeCache.persistent_cache_filename(os.path.join(self.xlsx_path, 'project_data.xlsx')))
+            self.assertEqual(self.read_hourly_rate(), 80.0)
+        self.assertEqual(os.listdir(self.cache_directory.name), [])
+        self.assertEqual(os.listdir(self.xlsx_path), ['project_data.xlsx'])
+
+    def test_disk_cache_is_never_in_the_input_folder(self):
+        cache_dir = os.path.join(self.xlsx_path, '.landbosse_cache')
+        with mock.patch.dict(os.environ, {'LANDBOSSE_CACHE_DIR': cache_dir}):
+            self.assertIsNone(XlsxDataframeCache.persistent_cache_filename(os.path.join(self.xlsx_path, 'project_data.xlsx')))
+            self.assertEqual(self.read_hourly_rate(), 80.0)
+        self.assertFalse(os.path.exists(cache_dir))
+
+
+class TestXlsxDataframeCacheIsolation(TestCase):
+    """
+    The sheets held by the cache are shared by every project, so modifying
+    a sheet for one project must not change what the next project reads.
+    """
+
+    def setUp(self):
+        XlsxDataframeCache._cache = {}
+        argv = ['main.py', '--input', project_input_template]
+        self.patches = [mock.patch('sys.argv', argv), mock.patch.dict(os.environ, {}, clear=True)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        XlsxDataframeCache._cache = {}
+
+    def test_projects_see_the_original_sheets(self):
+        sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('ge15_public_dist')
+        original_sheets = {sheet_name: df.copy(deep=True) for sheet_name, df in sheets.items()}
+
+        # Run a project the way XlsxSerialManagerRunner does, with a
+        # parametric value that modifies the crew_price sheet.
+        project_list = pd.read_excel(os.path.join(project_input_template, 'project_list.xlsx'))
+        project_parameters = project_list.iloc[0].astype(object)
+        project_parameters['crew_price/Rigger/Hourly rate USD per hour'] = 1000.0
+        project_parameters['Labor cost multiplier'] = 1.5
+        xlsx_reader = XlsxReader()
+        xlsx_reader.modify_project_data_and_project_list(sheets, project_parameters)
+        self.assertIn('crew_price', sheets.copied_sheet_names)
+        master_input_dict = xlsx_reader.create_master_input_dictionary(sheets, project_parameters)
+        Manager(input_dict=master_input_dict, output_dict=dict()).execute_landbosse(project_name='modified')
+
+        next_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('ge15_public_dist')
+        self.assertEqual(next_sheets.copied_sheet_names, set())
+        self.assertEqual(set(next_sheets), set(original_sheets))
+        for sheet_name, original_sheet in original_sheets.items():
+            assert_frame_equal(next_sheets[sheet_name], original_sheet, check_exact=True, obj=sheet_name)
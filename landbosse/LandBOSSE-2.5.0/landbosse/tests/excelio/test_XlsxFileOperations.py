@@ -0,0 +1,35 @@
+import os
+from unittest import TestCase
+from unittest import mock
+
+from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestParallelExecutorOptions(TestCase):
+    def options(self, argv, environ=None):
+        with mock.patch('sys.argv', ['main.py'] + argv), mock.patch.dict(os.environ, environ or {}, clear=True):
+            return XlsxFileOperations().parallel_executor_options()
+
+    def test_defaults(self):
+        with mock.patch('os.cpu_count', return_value=8):
+            options = self.options([])
+        self.assertEqual(options, {'max_workers': None, 'chunk_size': 1, 'max_in_flight': 32, 'start_method': None})
+
+    def test_command_line_overrides_environment(self):
+        options = self.options(
+            ['--workers', '3', '--chunk-size', '10', '--start-method', 'spawn'],
+            {'LANDBOSSE_WORKERS': '16', 'LANDBOSSE_MAX_IN_FLIGHT': '5'},
+        )
+        self.assertEqual(options, {'max_workers': 3, 'chunk_size': 10, 'max_in_flight': 5, 'start_method': 'spawn'})
+
+    def test_in_flight_defaults_to_multiple_of_workers(self):
+        self.assertEqual(self.options(['--workers', '2'])['max_in_flight'], 8)
+
+    def test_invalid_values(self):
+        with self.assertRaises(XlsxOperationException):
+            self.options(['--workers', '0'])
+        with self.assertRaises(XlsxOperationException):
+            self.options([], {'LANDBOSSE_CHUNK_SIZE': 'many'})
+        with self.assertRaises(XlsxOperationException):
+            self.options(['--start-method', 'thread'])
@@ -0,0 +1,143 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from landbosse.excelio import XlsxDataframeCache
+from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio import XlsxManagerRunner
+from landbosse.excelio import XlsxReader
+from landbosse.excelio import XlsxSerialManagerRunner
+from landbosse.excelio import XlsxParallelManagerRunner
+
+
+project_input_template = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'project_input_template')
+
+
+class TestRunnerOutputDirectory(TestCase):
+    """
+    Every file of a run must be written to the timestamped output folder of
+    the XlsxFileOperations given to the runner.
+    """
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.output_dir = self.temporary_directory.name
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def run_projects(self, runner_class, argv):
+        argv = ['main.py', '--input', project_input_template, '--output', self.output_dir,
+                '--project-range', '0:2'] + argv
+        with mock.patch('sys.argv', argv), mock.patch.dict(os.environ, {}, clear=True):
+            file_ops = XlsxFileOperations()
+            # A timestamp no other instance can have, so output written
+            # through another instance lands in another folder.
+            file_ops.timestamp = 'runner-test'
+            runner = runner_class(file_ops)
+            final_result = runner.run_from_project_list_xlsx(os.path.join(project_input_template, 'project_list.xlsx'))
+            final_result['extended_project_list'].to_csv(
+                os.path.join(file_ops.extended_project_list_path(), 'extended_project_list.csv'), index=False)
+        return final_result
+
+    def assert_one_output_folder(self, expected_files):
+        self.assertEqual(os.listdir(self.output_dir), ['landbosse-runner-test'])
+        run_dir = os.path.join(self.output_dir, 'landbosse-runner-test')
+        for expected_file in expected_files:
+            self.assertTrue(os.path.exists(os.path.join(run_dir, expected_file)), expected_file)
+
+    def test_serial_runner(self):
+        self.run_projects(XlsxSerialManagerRunner, ['--project-data-export', 'xlsx'])
+        self.assert_one_output_folder([
+            'landbosse-costs.csv',
+            'landbosse-details.csv',
+            os.path.join('calculated_parametric_inputs', 'extended_project_list.csv'),
+            os.path.join('calculated_parametric_inputs', 'parametric_project_data'),
+        ])
+
+    def test_parallel_runner(self):
+        self.run_projects(XlsxParallelManagerRunner, ['--project-data-export', 'deltas', '--workers', '1'])
+        self.assert_one_output_folder([
+            'landbosse-costs.csv',
+            'landbosse-details.csv',
+            os.path.join('calculated_parametric_inputs', 'extended_project_list.csv'),
+            os.path.join('calculated_parametric_inputs', 'parametric_project_data_deltas.csv'),
+        ])
+
+
+class TestMasterInputDictionaries(TestCase):
+    """
+    The master input dictionaries created together for the projects with
+    unmodified project data must be the same as those created one project
+    at a time.
+    """
+
+    def setUp(self):
+        XlsxDataframeCache._cache = {}
+        argv = ['main.py', '--input', project_input_template]
+        self.patches = [mock.patch('sys.argv', argv), mock.patch.dict(os.environ, {}, clear=True)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        XlsxDataframeCache._cache = {}
+
+    def projects(self):
+        """
+        Prepares the first three projects of the template, with a labor
+        cost multiplier on the second and a modified crew_price sheet on
+        the third.
+        """
+        xlsx_reader = XlsxReader()
+        project_list = pd.read_excel(os.path.join(project_input_template, 'project_list.xlsx'))
+        projects = []
+        for index in range(3):
+            project_parameters = project_list.iloc[index].astype(object)
+            project_parameters['crew_price/Rigger/Hourly rate USD per hour'] = 1000.0 if index == 2 else np.nan
+            if index == 1:
+                project_parameters['Labor cost multiplier'] = 1.5
+            project_data_basename = project_parameters['Project data file']
+            project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+            xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_parameters)
+            projects.append((project_data_basename, project_data_sheets, project_parameters, None))
+        return projects
+
+    def assert_same_value(self, actual, expected, key):
+        if isinstance(expected, pd.DataFrame):
+            assert_frame_equal(actual, expected, check_exact=True, obj=key)
+        elif isinstance(expected, pd.Series):
+            assert_series_equal(actual, expected, check_exact=True, obj=key)
+        elif isinstance(expected, np.ndarray):
+            np.testing.assert_array_equal(actual, expected, err_msg=key)
+        elif isinstance(expected, dict):
+            self.assertEqual(set(actual), set(expected), key)
+            for inner_key, inner_expected in expected.items():
+                self.assert_same_value(actual[inner_key], inner_expected, f'{key}/{inner_key}')
+        else:
+            self.assertEqual(type(actual), type(expected), key)
+            self.assertEqual(actual, expected, key)
+
+    def test_batch_matches_single_projects(self):
+        xlsx_reader = XlsxReader()
+        actual = XlsxManagerRunner.master_input_dictionaries(self.projects())
+        expected = [
+            xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
+            for _, project_data_sheets, project_parameters, _ in self.projects()
+        ]
+        self.assertEqual(len(actual), 3)
+        for actual_dict, expected_dict in zip(actual, expected):
+            self.assert_same_value(actual_dict, expected_dict, 'master_input_dict')
+
+        crew_cost = actual[2]['crew_cost']
+        self.assertEqual(set(crew_cost.loc[crew_cost['Labor type ID'] == 'Rigger', 'Hourly rate USD per hour']),
+                         {1000.0})
+
+        # Each project has its own components sheet, which ErectionCost modifies.
+        self.assertIsNot(actual[0]['component_data'], actual[1]['component_data'])
@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+from landbosse.excelio import XlsxReader
+from landbosse.excelio.CopyOnWriteSheets import CopyOnWriteSheets
+
+
+class TestXlsxReaderLaborMultiplier(TestCase):
+    def setUp(self):
+        self.rsmeans = pd.DataFrame({
+            'Operation ID': ['Excavation', 'Excavation', 'Survey', 'Trenching'],
+            'Type of cost': ['Labor', 'Equipment rental', 'Labor', np.nan],
+            'Rate USD per unit': [2.5, 1.5, 900.0, 4000.0],
+            'Module': ['Roads', 'Roads', 'Roads', 'Collection'],
+        })
+        self.crew_price = pd.DataFrame({
+            'Labor type ID': ['Rigger'],
+            'Hourly rate USD per hour': [80.0],
+            'Per diem USD per day': [150.0],
+        })
+
+    def test_labor_rows_are_multiplied(self):
+        project_data = CopyOnWriteSheets({'rsmeans': self.rsmeans, 'crew_price': self.crew_price})
+        XlsxReader().apply_labor_multiplier_to_project_data_dict(project_data, 1.1)
+        expected = self.rsmeans.drop(columns=['Rate USD per unit'])
+        expected['Rate USD per unit'] = [2.5 * 1.1, 1.5, 900.0 * 1.1, 4000.0]
+        assert_frame_equal(project_data['rsmeans'], expected, check_exact=True)
+        self.assertEqual(self.rsmeans['Rate USD per unit'][0], 2.5)
+        self.assertEqual(project_data['crew_price']['Hourly rate USD per hour'][0], 80.0 * 1.1)
+
+    def test_batched_rates_match_single_multipliers(self):
+        multipliers = pd.Series([0.9, 1.0, 1.25], index=['a', 'b', 'c'])
+        rates = XlsxReader.rsmeans_labor_rates(self.rsmeans, multipliers)
+        self.assertEqual(list(rates.columns), ['a', 'b', 'c'])
+        for project, multiplier in multipliers.items():
+            single = XlsxReader.rsmeans_labor_rates(self.rsmeans, [multiplier])[0]
+            assert_series_equal(rates[project], single, check_names=False, check_exact=True)
+        assert_series_equal(rates['b'], self.rsmeans['Rate USD per unit'], check_names=False, check_exact=True)
+
+
+class TestXlsxReaderProjectListInputs(TestCase):
+    def setUp(self):
+        reader = XlsxReader()
+        column_names = [column_name for _, column_name in reader.project_list_input_columns + reader.markup_input_columns]
+        rows = []
+        for number_of_turbines, override in [(10, 0.0), (3, 25000.0), (50, np.nan)]:
+            row = {column_name: 1.5 for column_name in column_names}
+            row['Project ID'] = f'project {number_of_turbines}'
+            row['Number of turbines'] = number_of_turbines
+            row['Turbine rating MW'] = 2.3
+            row['Calculate road cost for distributed wind? (y/n)'] = 'y' if number_of_turbines < 10 else 'n'
+            row['New Switchyard (y/n)'] = 'y'
+            row['Allow same flag'] = 'n'
+            row[XlsxReader.override_total_mgmt_cost_col_name] = override
+            rows.append(row)
+        self.project_list = pd.DataFrame(rows)
+
+    def test_rows_match_single_projects(self):
+        reader = XlsxReader()
+        project_inputs = reader.project_list_inputs(self.project_list)
+        for index, (_, project_parameters) in enumerate(self.project_list.astype(object).iterrows()):
+            expected = reader.project_list_inputs(project_parameters)[0]
+            self.assertEqual(project_inputs[index], expected)
+            self.assertEqual([type(value) for value in project_inputs[index].values()],
+                             [type(value) for value in expected.values()])
+
+    def test_derived_inputs(self):
+        project_inputs = XlsxReader().project_list_inputs(self.project_list)
+        self.assertEqual(project_inputs[0]['project_size_megawatts'], 10 * 2.3)
+        self.assertEqual([inputs['road_distributed_wind'] for inputs in project_inputs], [False, True, False])
+        self.assertEqual(project_inputs[1]['override_total_management_cost'], 25000.0)
+        self.assertNotIn('markup_profit_margin', project_inputs[1])
+        self.assertNotIn('override_total_management_cost', project_inputs[2])
+        self.assertEqual(project_inputs[2]['markup_profit_margin'], 1.5)
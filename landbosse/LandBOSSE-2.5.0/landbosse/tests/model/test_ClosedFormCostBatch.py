@@ -0,0 +1,128 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model import ClosedFormCostBatch, DevelopmentCost, GridConnectionCost, ManagementCost, SubstationCost
+from landbosse.model.TransportCost import TransportCost
+
+
+class TestClosedFormCostBatch(TestCase):
+    def setUp(self):
+        """
+        Projects that cover the utility and distributed branches of each
+        closed form module.
+        """
+        site_facility_building_area_df = pd.DataFrame({
+            'Size Min (MW)': [0, 200, 500],
+            'Size Max (MW)': [200, 500, 1e6],
+            'Building area (sq. ft.)': [3000, 5000, 8000],
+        })
+        parameters = [
+            # num_turbines, turbine_rating_MW, rotor_diameter_m, distance_to_interconnect_mi, new_switchyard, hub_height_meters, actual_construction_months
+            (100, 2.0, 120.0, 5.0, True, 80.0, 9.0),
+            (5, 1.5, 77.0, 1.0, False, 90.0, 30.0),
+            (250, 3.0, 170.0, 0.0, True, 110.0, 14.0),
+            (40, 2.5, 130.0, 12.0, False, 85.0, 27.0),
+        ]
+        self.input_dicts = dict()
+        for index, (num_turbines, turbine_rating_MW, rotor_diameter_m, distance, new_switchyard, hub_height, months) in enumerate(parameters):
+            self.input_dicts[f'project_{index}'] = {
+                'num_turbines': num_turbines,
+                'turbine_rating_MW': turbine_rating_MW,
+                'rotor_diameter_m': rotor_diameter_m,
+                'project_size_megawatts': num_turbines * turbine_rating_MW,
+                'interconnect_voltage_kV': 137.0,
+                'distance_to_interconnect_mi': distance,
+                'new_switchyard': new_switchyard,
+                'development_labor_cost_usd': 1e5 * (index + 1),
+                'project_value_usd': 1e8 * (index + 1),
+                'foundation_cost_usd': 1e6 * (index + 1),
+                'actual_construction_months': months,
+                'num_hwy_permits': 10,
+                'num_access_roads': 2,
+                'construct_duration': 9,
+                'hub_height_meters': hub_height,
+                'markup_contingency': 0.03,
+                'markup_warranty_management': 0.0002,
+                'markup_sales_and_use_tax': 0,
+                'markup_overhead': 0.05,
+                'markup_profit_margin': 0.05,
+                'site_facility_building_area_df': site_facility_building_area_df,
+            }
+        self.batch = ClosedFormCostBatch.from_input_dicts(self.input_dicts)
+
+    def module_rows(self, module_class, key):
+        """
+        Runs a module for every project and returns its cost rows.
+        """
+        rows = []
+        for project_name, input_dict in self.input_dicts.items():
+            output_dict = {'actual_construction_months': input_dict['actual_construction_months']}
+            module = module_class(input_dict=dict(input_dict), output_dict=output_dict, project_name=project_name)
+            self.assertEqual(module.run_module()[0], 0)
+            rows.extend(output_dict[key])
+        return pd.DataFrame(rows, columns=ClosedFormCostBatch.module_type_operation_columns)
+
+    def test_rows_match_the_modules(self):
+        expected = pd.concat([
+            self.module_rows(SubstationCost, 'substation_module_type_operation'),
+            self.module_rows(GridConnectionCost, 'trans_dist_cost_module_type_operation'),
+            self.module_rows(TransportCost, 'transport_module_type_operation'),
+            self.module_rows(DevelopmentCost, 'development_module_type_operation'),
+            self.module_rows(ManagementCost, 'mangement_module_type_operation'),
+        ], ignore_index=True)
+        actual = self.batch.module_type_operation_frames(include_management=True)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False, check_exact=True)
+
+    def test_distributed_management(self):
+        # Projects in distributed mode have none of the inputs that only
+        # utility scale projects need.
+        self.input_dicts['project_1']['override_total_management_cost'] = 12345.0
+        for key in ['markup_contingency', 'markup_warranty_management', 'markup_sales_and_use_tax',
+                    'markup_overhead', 'markup_profit_margin', 'project_value_usd', 'foundation_cost_usd',
+                    'num_hwy_permits', 'site_facility_building_area_df']:
+            del self.input_dicts['project_1'][key]
+        batch = ClosedFormCostBatch.from_input_dicts(self.input_dicts)
+
+        costs = batch.management_costs_usd()
+        self.assertEqual(costs['total_management_cost'][1], 12345.0)
+        self.assertEqual(costs['insurance_usd'][1], 0.0)
+        self.assertEqual(costs['total_management_cost'][0], self.batch.management_costs_usd()['total_management_cost'][0])
+
+        expected = self.module_rows(ManagementCost, 'mangement_module_type_operation')
+        pd.testing.assert_frame_equal(batch.management_module_type_operation_frame(), expected, check_dtype=False, check_exact=True)
+
+    def test_all_projects_in_distributed_mode(self):
+        input_dicts = dict()
+        for project_name, input_dict in self.input_dicts.items():
+            input_dicts[project_name] = {
+                key: input_dict[key]
+                for key in ['num_turbines', 'turbine_rating_MW', 'rotor_diameter_m', 'project_size_megawatts',
+                            'hub_height_meters', 'actual_construction_months']
+            }
+            input_dicts[project_name]['override_total_management_cost'] = 1000.0
+        costs = ClosedFormCostBatch.from_input_dicts(input_dicts).management_costs_usd()
+        self.assertEqual(list(costs['total_management_cost']), [1000.0] * len(input_dicts))
+        self.assertEqual(list(costs['site_facility_usd']), [0.0] * len(input_dicts))
+
+    def test_different_building_areas_raise(self):
+        self.input_dicts['project_2']['site_facility_building_area_df'] = \
+            self.input_dicts['project_2']['site_facility_building_area_df'].iloc[:2]
+        with self.assertRaises(ValueError):
+            ClosedFormCostBatch.from_input_dicts(self.input_dicts)
+
+    def test_equal_building_areas_are_the_same(self):
+        self.input_dicts['project_2']['site_facility_building_area_df'] = \
+            self.input_dicts['project_2']['site_facility_building_area_df'].copy()
+        batch = ClosedFormCostBatch.from_input_dicts(self.input_dicts)
+        self.assertIs(batch.site_facility_building_area_df, self.input_dicts['project_0']['site_facility_building_area_df'])
+
+    def test_project_size_outside_of_building_areas_raises(self):
+        self.batch.site_facility_building_area_df = self.batch.site_facility_building_area_df.iloc[:1]
+        with self.assertRaises(ValueError):
+            self.batch.management_costs_usd()
+
+    def test_missing_development_labor_cost_raises(self):
+        del self.input_dicts['project_0']['development_labor_cost_usd']
+        with self.assertRaises(ValueError):
+            ClosedFormCostBatch.from_input_dicts(self.input_dicts).development_cost_usd()
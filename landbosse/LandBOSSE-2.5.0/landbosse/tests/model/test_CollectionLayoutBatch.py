@@ -0,0 +1,90 @@
+import itertools
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import ArraySystem, Cable, CollectionLayoutBatch
+
+
+class TestCollectionLayoutBatch(TestCase):
+    def setUp(self):
+        self.cable_specs_pd = pd.DataFrame({
+            'Array Cable': ['AWG 1/0', 'AWG 4/0', 'MCM 500', 'MCM1000', 'MCM1250'],
+            'Current Capacity (A)': [300, 440, 640, 830, 935],
+            'Rated Voltage (V)': [36, 36, 36, 36, 36],
+            'AC Resistance (Ohms/km)': [0.253, 0.125, 0.0605, 0.0367, 0.0291],
+            'Inductance (mH/km)': [0.398, 0.359, 0.317, 0.291, 0.284],
+            'Capacitance (nF/km)': [0.179, 0.223, 0.293, 0.375, 0.411],
+            'Cost (USD/LF)': [6, 9, 13, 16, 17],
+        })
+
+        # num_turbines, turbine_rating_MW, turbine_spacing_rotor_diameters,
+        # user_defined_distance_to_grid_connection. These cover distributed
+        # wind, odd and even string counts and partial strings.
+        self.cases = list(itertools.product([1, 3, 10, 40, 67, 100], [0.02, 1.5, 3.6], [4, 7], [0, 1]))
+
+    def array_system(self, num_turbines, turbine_rating_MW, turbine_spacing_rotor_diameters, user_defined_distance):
+        input_dict = {
+            'cable_specs_pd': self.cable_specs_pd,
+            'line_frequency_hz': 60,
+            'num_turbines': num_turbines,
+            'turbine_rating_MW': turbine_rating_MW,
+            'turbine_spacing_rotor_diameters': turbine_spacing_rotor_diameters,
+            'row_spacing_rotor_diameters': 10,
+            'rotor_diameter_m': 130.0,
+            'user_defined_distance_to_grid_connection': user_defined_distance,
+            'distance_to_grid_connection_km': 2.5,
+        }
+        array_system = ArraySystem(input_dict=input_dict, output_dict=dict(), project_name='project')
+        array_system.create_ArraySystem()
+        return array_system
+
+    def test_layout_matches_array_system(self):
+        cases = np.array(self.cases, dtype=float)
+        layout = CollectionLayoutBatch(self.cable_specs_pd, 60, cases[:, 0], cases[:, 1], cases[:, 2], 10, 130.0,
+                                       cases[:, 3], 2.5).layout()
+        for index, case in enumerate(self.cases):
+            array_system = self.array_system(*case)
+            output_dict = array_system.output_dict
+            for key in ['num_full_strings', 'num_partial_strings', 'num_strings', 'distance_to_grid_connection_km',
+                        'total_cable_len_km', 'total_turb_per_string', 'num_turb_per_cable', 'perc_partial_string']:
+                np.testing.assert_allclose(layout[key][index], np.asarray(output_dict[key], dtype=float), rtol=1e-12,
+                                           err_msg=f'{case} {key}')
+            cable_len_km = [cable.total_length for cable in array_system.cables.values()]
+            np.testing.assert_allclose(layout['cable_len_km'][index], cable_len_km, rtol=1e-12, err_msg=f'{case}')
+
+    def test_electrical_properties_are_cached(self):
+        Cable._electrical_properties_cache = {}
+        self.array_system(40, 3.6, 7, 0)
+        self.assertEqual(len(Cable._electrical_properties_cache), len(self.cable_specs_pd))
+        first = self.array_system(40, 3.6, 7, 0).cables['MCM 500']
+        self.array_system(10, 1.5, 4, 1)
+        self.assertEqual(len(Cable._electrical_properties_cache), len(self.cable_specs_pd))
+
+        specs = self.cable_specs_pd.T.to_dict()[2]
+        uncached = Cable.__new__(Cable)
+        uncached.ac_resistance = specs['AC Resistance (Ohms/km)']
+        uncached.inductance = specs['Inductance (mH/km)']
+        uncached.capacitance = specs['Capacitance (nF/km)']
+        uncached.rated_voltage = specs['Rated Voltage (V)']
+        uncached.current_capacity = specs['Current Capacity (A)']
+        uncached.calc_char_impedance(60)
+        uncached.calc_power_factor()
+        uncached.calc_cable_power()
+        self.assertEqual(first.cable_power, uncached.cable_power)
+
+    def test_electrical_properties_cache_is_bounded(self):
+        Cable._electrical_properties_cache = {}
+        specs = self.cable_specs_pd.T.to_dict()[0]
+        for line_frequency_hz in range(1, Cable._max_entries + 10):
+            Cable(specs, {'line_frequency_hz': line_frequency_hz})
+        self.assertEqual(len(Cable._electrical_properties_cache), Cable._max_entries)
+
+    def test_nan_specifications_are_cached(self):
+        Cable._electrical_properties_cache = {}
+        specs = dict(self.cable_specs_pd.T.to_dict()[0])
+        specs['Capacitance (nF/km)'] = np.nan
+        Cable(specs, {'line_frequency_hz': 60})
+        Cable(dict(specs, **{'Capacitance (nF/km)': float('nan')}), {'line_frequency_hz': 60})
+        self.assertEqual(len(Cable._electrical_properties_cache), 1)
@@ -0,0 +1,120 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model import CostModuleGraph
+
+
+class HoursModule:
+    """
+    Writes an input read by RoadsModule, like FoundationCost.
+    """
+    runs = 0
+
+    def __init__(self, input_dict, output_dict, project_name):
+        self.input_dict = input_dict
+        self.output_dict = output_dict
+
+    def run_module(self):
+        HoursModule.runs += 1
+        self.input_dict['operational_hrs_per_day'] = self.input_dict['hour_day']
+        return 0, 0
+
+
+class RoadsModule:
+    runs = 0
+
+    def __init__(self, input_dict, output_dict, project_name):
+        self.input_dict = input_dict
+        self.output_dict = output_dict
+        self.project_name = project_name
+
+    def run_module(self):
+        RoadsModule.runs += 1
+        cost = self.input_dict['operational_hrs_per_day'] * self.input_dict['road_length']
+        self.output_dict['roads_csv'] = [{'project_id_with_serial': self.project_name, 'value': cost}]
+        return 0, 0
+
+
+class ComponentsModule:
+    """
+    Adds a column to the components dataframe in place, like ErectionCost.
+    """
+    runs = 0
+
+    def __init__(self, input_dict, output_dict, project_name):
+        self.input_dict = input_dict
+        self.output_dict = output_dict
+
+    def run_module(self):
+        ComponentsModule.runs += 1
+        components = self.input_dict['components']
+        components['Mass tonne'] = components['Mass kg'] / 1000
+        self.output_dict['total_mass_tonne'] = components['Mass tonne'].sum()
+        return 0, 0
+
+
+class TestCostModuleGraph(TestCase):
+    def setUp(self):
+        CostModuleGraph._results = {}
+        HoursModule.runs = 0
+        RoadsModule.runs = 0
+        ComponentsModule.runs = 0
+        self.graph = CostModuleGraph(reuse_results=True)
+        self.graph.add_module('roads', RoadsModule, depends_on=['hours'])
+        self.graph.add_module('hours', HoursModule)
+
+    def tearDown(self):
+        CostModuleGraph._results = {}
+
+    def test_dependencies_run_first(self):
+        self.assertEqual(self.graph.execution_order(), ['hours', 'roads'])
+
+    def test_cycle_raises(self):
+        self.graph.add_module('hours', HoursModule, depends_on=['roads'])
+        with self.assertRaises(ValueError):
+            self.graph.execution_order()
+
+    def test_consumed_inputs(self):
+        self.graph.run({'hour_day': 10, 'road_length': 2, 'unused': 1}, dict(), 'a')
+        self.assertEqual(self.graph.consumed_inputs['hours'], {'hour_day'})
+        self.assertEqual(self.graph.consumed_inputs['roads'], {'operational_hrs_per_day', 'road_length'})
+
+    def test_only_modules_with_changed_inputs_run(self):
+        self.graph.run({'hour_day': 10, 'road_length': 2}, dict(), 'a')
+        output_dict = dict()
+        self.graph.run({'hour_day': 10, 'road_length': 3}, output_dict, 'b')
+        self.assertEqual((HoursModule.runs, RoadsModule.runs), (1, 2))
+        self.assertEqual(self.graph.reused_module_names, ['hours'])
+        self.assertEqual(output_dict['roads_csv'], [{'project_id_with_serial': 'b', 'value': 30}])
+
+    def test_reused_rows_have_the_project_name(self):
+        self.graph.run({'hour_day': 10, 'road_length': 2}, dict(), 'a')
+        input_dict = {'hour_day': 10, 'road_length': 2}
+        output_dict = dict()
+        self.graph.run(input_dict, output_dict, 'b')
+        self.assertEqual((HoursModule.runs, RoadsModule.runs), (1, 1))
+        self.assertEqual(input_dict['operational_hrs_per_day'], 10)
+        self.assertEqual(output_dict['roads_csv'], [{'project_id_with_serial': 'b', 'value': 20}])
+
+    def test_reuse_is_off_by_default(self):
+        graph = CostModuleGraph()
+        graph.add_module('roads', RoadsModule, depends_on=['hours'])
+        graph.add_module('hours', HoursModule)
+        graph.run({'hour_day': 10, 'road_length': 2}, dict(), 'a')
+        graph.run({'hour_day': 10, 'road_length': 2}, dict(), 'b')
+        self.assertEqual((HoursModule.runs, RoadsModule.runs), (2, 2))
+        self.assertEqual(CostModuleGraph._results, {})
+
+    def test_modules_that_modify_inputs_in_place_are_not_reused(self):
+        graph = CostModuleGraph(reuse_results=True)
+        graph.add_module('components', ComponentsModule)
+        for project_name in ['a', 'b']:
+            input_dict = {'components': pd.DataFrame({'Mass kg': [1000.0, 2000.0]})}
+            output_dict = dict()
+            graph.run(input_dict, output_dict, project_name)
+            self.assertEqual(list(input_dict['components'].columns), ['Mass kg', 'Mass tonne'])
+            self.assertEqual(output_dict['total_mass_tonne'], 3)
+        self.assertEqual(ComponentsModule.runs, 2)
+        self.assertEqual(graph.modified_inputs, {'components': {'components'}})
+        self.assertEqual(graph.reused_module_names, [])
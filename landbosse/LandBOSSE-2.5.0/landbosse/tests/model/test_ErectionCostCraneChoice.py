@@ -0,0 +1,68 @@
+from unittest import TestCase
+import pandas as pd
+
+from landbosse.model import ErectionCost
+
+
+class TestErectionCostCraneChoice(TestCase):
+    def setUp(self):
+        """
+        Creates an ErectionCost instance whose output dictionary already has
+        the aggregated separate and same crane costs, as if
+        aggregate_erection_costs() had run.
+        """
+        self.input_dict = dict()
+        self.input_dict['allow_same_flag'] = False
+        self.output_dict = dict()
+        self.output_dict['separate_basetop'] = pd.DataFrame({
+            'Operation': ['Base', 'Base', 'Base', 'Offload', 'Offload', 'Top', 'Top'],
+            'Crane name': ['A', 'B', 'C', 'LB 75', 'LB 258', 'A', 'B'],
+            'Boom system': ['SL', 'SL', 'SL', 'Hydraulic', 'Hydraulic', 'SL', 'SL'],
+            'Labor cost USD without management': [10.0, 5.0, 7.0, 1.0, 2.0, 20.0, 25.0],
+            'Total cost USD': [100.0, 80.0, 90.0, 10.0, 20.0, 200.0, 250.0],
+        })
+        self.output_dict['same_basetop'] = pd.DataFrame({
+            'Crane name': ['A', 'B'],
+            'Boom system': ['SL', 'SL'],
+            'Labor cost USD without management': [30.0, 30.0],
+            'Total cost USD': [300.0, 330.0],
+            'Operation': ['Base + Top', 'Base + Top'],
+        })
+        self.instance = ErectionCost(input_dict=self.input_dict, output_dict=self.output_dict, project_name='foo')
+
+    def test_separate_cranes_chosen(self):
+        cost_chosen = self.instance.find_minimum_cost_cranes().reset_index()
+        chosen = cost_chosen.set_index('Operation')
+        self.assertEqual(chosen.loc['Base', 'Crane name'], 'B')
+        self.assertEqual(chosen.loc['Top', 'Crane name'], 'A')
+
+        # Two offload cranes are on site, so their costs are doubled.
+        self.assertEqual(chosen.loc['Offload', 'Total cost USD'], 20.0)
+        self.assertEqual(cost_chosen['Total cost USD'].sum(), 300.0)
+
+    def test_separate_cranes_are_on_the_index(self):
+        cost_chosen = self.instance.find_minimum_cost_cranes()
+        self.assertEqual(list(cost_chosen.index.names), ['Boom system', 'Crane name', 'Operation'])
+        self.assertEqual(list(cost_chosen.columns), ['Labor cost USD without management', 'Total cost USD'])
+
+    def test_same_crane_chosen_when_cheaper(self):
+        self.input_dict['allow_same_flag'] = True
+        self.output_dict['same_basetop'].loc[0, 'Total cost USD'] = 250.0
+        cost_chosen = self.instance.find_minimum_cost_cranes()
+        self.assertEqual(list(cost_chosen['Crane name']), ['A'])
+        self.assertEqual(list(cost_chosen['Operation']), ['Base + Top'])
+
+        # The same crane row keeps the columns and index label of same_basetop.
+        self.assertEqual(list(cost_chosen.index), [0])
+        self.assertEqual(list(cost_chosen.columns), list(self.output_dict['same_basetop'].columns))
+
+    def test_rank_crane_alternatives(self):
+        alternatives = self.instance.rank_crane_alternatives(number_of_alternatives=2)
+        base = alternatives[(alternatives['Option type'] == 'Separate') & (alternatives['Operation'] == 'Base')]
+        self.assertEqual(list(base['Crane name']), ['B', 'C'])
+        self.assertEqual(list(base['Rank']), [1, 2])
+        self.assertEqual(list(base['Cost above minimum USD']), [0.0, 10.0])
+
+        same = alternatives[alternatives['Option type'] == 'Same']
+        self.assertEqual(list(same['Crane name']), ['A', 'B'])
+        self.assertEqual(len(alternatives), 8)
@@ -0,0 +1,73 @@
+from unittest import TestCase
+import pandas as pd
+
+from landbosse.model import ErectionPriceBook
+
+
+class TestErectionPriceBook(TestCase):
+    def setUp(self):
+        """
+        Creates a minimal set of project_data sheets for the price book and
+        empties the cache so each test starts cold.
+        """
+        ErectionPriceBook._cache = {}
+        self.project_data = dict()
+        self.project_data['equip'] = pd.DataFrame({
+            'Equipment ID': ['E1', 'E1', 'E1'],
+            'Operation': ['Base', 'Base', 'Top'],
+            'Equipment name': ['Crawler crane', 'Truck crane', 'Crawler crane'],
+            'Crane capacity tonne': [500, 50, 500],
+            'Number of equipment': [1, 2, 1],
+        })
+        self.project_data['equip_price'] = pd.DataFrame({
+            'Equipment name': ['Crawler crane', 'Truck crane'],
+            'Crane capacity tonne': [500, 50],
+            'Equipment price USD per hour': [100.0, 10.0],
+            'Fuel consumption gal per day': [80.0, 20.0],
+        })
+        self.project_data['crew'] = pd.DataFrame({
+            'Crew type ID': ['C1', 'C1', 'M0'],
+            'Operation': ['Base', 'Base', 'Management'],
+            'Crew name': ['Base crew', 'Base crew', 'Management - project size'],
+            'Labor type ID': ['Rigger', 'Oiler', 'Site manager'],
+            'Number of workers': [4, 1, 1],
+        })
+        self.project_data['crew_price'] = pd.DataFrame({
+            'Labor type ID': ['Rigger', 'Oiler', 'Site manager'],
+            'Hourly rate USD per hour': [80.0, 60.0, 100.0],
+            'Per diem USD per day': [150.0, 150.0, 150.0],
+        })
+        self.project_data['crane_specs'] = pd.DataFrame({
+            'Crane name': ['LR1500', 'LR1500'],
+            'Boom system': ['SL3F', 'SL3F'],
+            'Mobilization cost USD': [100000.0, 120000.0],
+        })
+
+    def test_equip_rates(self):
+        price_book = ErectionPriceBook.price_book_for_project_data(self.project_data)
+        equip_rates = price_book['equip_rates'].set_index(['Equipment ID', 'Operation'])
+        self.assertEqual(equip_rates.loc[('E1', 'Base'), 'Equipment price USD per hour x number'], 120.0)
+        self.assertEqual(equip_rates.loc[('E1', 'Base'), 'Fuel consumption gal per day'], 100.0)
+        self.assertEqual(equip_rates.loc[('E1', 'Top'), 'Number of equipment'], 1)
+
+    def test_crew_and_mobilization(self):
+        price_book = ErectionPriceBook.price_book_for_project_data(self.project_data)
+        crew_cost_grouped = price_book['crew_cost_grouped'].set_index(['Crew type ID', 'Operation'])
+        self.assertEqual(crew_cost_grouped.loc[('C1', 'Base'), 'Hourly rate for all workers'], 380.0)
+        self.assertEqual(crew_cost_grouped.loc[('C1', 'Base'), 'Per diem all workers'], 750.0)
+        self.assertEqual(crew_cost_grouped.loc[('M0', 'Management'), 'Hourly rate for all workers'], 0.0)
+        self.assertEqual(price_book['mobilization_costs']['Mobilization cost USD'].iloc[0], 240000.0)
+
+    def test_cache_is_keyed_by_sheet_contents(self):
+        first = ErectionPriceBook.price_book_for_project_data(self.project_data)
+
+        # Equal copies of the sheets hit the cache.
+        copied_project_data = {name: df.copy() for name, df in self.project_data.items()}
+        self.assertIs(first, ErectionPriceBook.price_book_for_project_data(copied_project_data))
+
+        # A labor multiplier changes crew_price, so a new price book is built.
+        copied_project_data['crew_price']['Hourly rate USD per hour'] *= 2
+        second = ErectionPriceBook.price_book_for_project_data(copied_project_data)
+        self.assertIsNot(first, second)
+        crew_cost_grouped = second['crew_cost_grouped'].set_index(['Crew type ID', 'Operation'])
+        self.assertEqual(crew_cost_grouped.loc[('C1', 'Base'), 'Hourly rate for all workers'], 760.0)
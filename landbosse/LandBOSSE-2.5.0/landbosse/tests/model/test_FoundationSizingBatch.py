@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import FoundationCost, FoundationSizingBatch
+
+
+class TestFoundationSizingBatch(TestCase):
+    def setUp(self):
+        """
+        Designs of a 3.6 MW turbine with four tower sections, with the hub
+        height, gust velocity and soil varied.
+        """
+        self.components = pd.DataFrame({
+            'Mass tonne': [80, 80, 35, 17, 17, 17, 100, 100, 70, 70],
+            'Surface area sq m': [32.0, 20.0, 12.16, 68.8, 68.8, 68.8, 155.0, 155.0, 150.0, 140.0],
+            'Coeff drag (installed)': [0.7, 0.9, 1.1, 1.4, 1.4, 1.4, 1.1, 1.1, 1.1, 1.1],
+            'Section height m': [0, 0, 0, 0, 0, 0, 25, 25, 35, 35],
+            'Lever arm m': [120.0, 120.0, 120.0, 120.0, 120.0, 120.0, 12.5, 42.5, 75.0, 105.0],
+            'Multplier drag rotor': [1.0, 0.0, 0.0, 2 / 3, 2 / 3, 2 / 3, 0.0, 0.0, 0.0, 0.0],
+            'Multiplier tower drag': [0, 0, 0, 0, 0, 0, 1, 1, 1, 1],
+        })
+        self.input_dicts = dict()
+        designs = [
+            # hub height scale, gust velocity, rated thrust, depth, bearing pressure
+            (1.0, 59.5, 589000, 2.36, 191521),
+            (0.7, 45.0, 400000, 3.0, 250000),
+            (1.3, 70.0, 900000, 2.5, 150000),
+            (1.1, 65.0, 1200000, 3.5, 300000),
+        ]
+        for index, (scale, gust_velocity, rated_thrust, depth, bearing_pressure) in enumerate(designs):
+            input_dict = {key: np.array(self.components[key]) for key in self.components.columns}
+            input_dict['Section height m'] = input_dict['Section height m'] * scale
+            input_dict['Lever arm m'] = input_dict['Lever arm m'] * scale
+            input_dict['gust_velocity_m_per_s'] = gust_velocity
+            input_dict['rated_thrust_N'] = rated_thrust
+            input_dict['depth'] = depth
+            input_dict['bearing_pressure_n_m2'] = bearing_pressure
+            self.input_dicts[f'design_{index}'] = input_dict
+
+    def test_radii_match_foundation_cost(self):
+        radii = FoundationSizingBatch.from_input_dicts(self.input_dicts).radii()
+        for index, (project_name, input_dict) in enumerate(self.input_dicts.items()):
+            expected = dict()
+            FoundationCost(input_dict=input_dict, output_dict=expected, project_name=project_name) \
+                .calculate_foundation_load(input_dict, expected)
+            for key, value in expected.items():
+                self.assertEqual(radii[key][index], value, f'{project_name} {key}')
+
+    def test_inexact_radii_are_close(self):
+        batch = FoundationSizingBatch.from_input_dicts(self.input_dicts)
+        exact = batch.radii()
+        batch.exact = False
+        inexact = batch.radii()
+        np.testing.assert_allclose(inexact['Radius_m'], exact['Radius_m'], rtol=1e-9)
+
+    def test_padded_components_add_no_load(self):
+        shorter = dict(self.input_dicts['design_0'])
+        for key in FoundationSizingBatch.component_keys:
+            shorter[key] = shorter[key][:-1]
+        padded = FoundationSizingBatch.from_input_dicts({'full': self.input_dicts['design_0'], 'shorter': shorter}).loads()
+        alone = FoundationSizingBatch.from_input_dicts({'shorter': shorter}).loads()
+        self.assertEqual(padded['f_dead'][1], alone['f_dead'][0])
+        self.assertAlmostEqual(padded['m_tot'][1], alone['m_tot'][0], delta=1e-6 * alone['m_tot'][0])
+
+    def test_bracket_without_sign_change_raises(self):
+        self.input_dicts['design_0']['bearing_pressure_n_m2'] = 1e9
+        with self.assertRaises(ValueError):
+            FoundationSizingBatch.from_input_dicts(self.input_dicts).radii()
+
+    def test_brentq_matches_scipy(self):
+        from scipy.optimize import root_scalar
+        offsets = np.array([0.5, 2.0, 7.5])
+
+        def f(x, index):
+            return x ** 3 - offsets[index]
+
+        roots, converged = FoundationSizingBatch.brentq(f, 0.1, 5, np.arange(3), xtol=1e-10, maxiter=50)
+        self.assertTrue(converged.all())
+        for offset, root in zip(offsets, roots):
+            self.assertEqual(root, root_scalar(lambda x: x ** 3 - offset, method='brentq', bracket=[0.1, 5], xtol=1e-10, maxiter=50).root)
@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model import CostModuleGraph, Manager, ProjectTotals
+
+
+class TestProjectTotals(TestCase):
+    def setUp(self):
+        """
+        Makes the outputs of the other cost modules for a project whose
+        construction takes 1 + 4 + 1 = 6 months.
+        """
+        CostModuleGraph._results = {}
+        self.input_dict = {'construct_duration': 9}
+        self.output_dict = {
+            'siteprep_construction_months': 1.0,
+            'erection_construction_months': 4.0,
+            'foundation_construction_months': 3.0,
+            'collection_construction_months': 2.0,
+            'total_road_cost': pd.DataFrame({'Type of cost': ['Labor', 'Other'], 'Cost USD': [1e5, 1e6]}),
+        }
+        for key in ['total_collection_cost', 'total_transdist_cost', 'total_substation_cost', 'total_transport_cost',
+                    'total_foundation_cost', 'total_erection_cost', 'total_development_cost']:
+            self.output_dict[key] = pd.DataFrame({'Type of cost': ['Other'], 'Cost USD': [1e6]})
+
+    def tearDown(self):
+        CostModuleGraph._results = {}
+
+    def test_shorter_construction_reduces_road_costs(self):
+        road_cost = self.output_dict['total_road_cost']
+        ProjectTotals(self.input_dict, self.output_dict, 'project').run_module()
+        self.assertEqual(self.output_dict['actual_construction_months'], 6.0)
+
+        # The input duration is 8 months longer than site preparation.
+        self.assertEqual(list(self.output_dict['total_road_cost']['Cost USD']), [1e5, 1e6 - 8 * 55500])
+        self.assertEqual(list(road_cost['Cost USD']), [1e5, 1e6])
+        self.assertEqual(self.input_dict['project_value_usd'], 7e6 + 1e5 + 1e6 - 8 * 55500)
+        self.assertEqual(self.input_dict['foundation_cost_usd'], 1e6)
+
+    def test_longer_construction_keeps_road_costs(self):
+        self.input_dict['construct_duration'] = 6
+        road_cost = self.output_dict['total_road_cost']
+        ProjectTotals(self.input_dict, self.output_dict, 'project').run_module()
+        self.assertIs(self.output_dict['total_road_cost'], road_cost)
+        self.assertEqual(self.input_dict['project_value_usd'], 7e6 + 1e5 + 1e6)
+
+    def test_missing_module_results_raise(self):
+        del self.output_dict['erection_construction_months']
+        with self.assertRaises(KeyError):
+            ProjectTotals(self.input_dict, self.output_dict, 'project').run_module()
+
+    def test_totals_are_reused_by_the_graph(self):
+        graph = CostModuleGraph(reuse_results=True)
+        graph.add_module('project_totals', ProjectTotals)
+        for project_name in ['a', 'b']:
+            input_dict = dict(self.input_dict)
+            output_dict = dict(self.output_dict)
+            graph.run(input_dict, output_dict, project_name)
+            self.assertEqual(list(output_dict['total_road_cost']['Cost USD']), [1e5, 1e6 - 8 * 55500])
+        self.assertEqual(graph.modified_inputs, {})
+        self.assertEqual(graph.reused_module_names, ['project_totals'])
+
+    def test_management_runs_after_the_totals(self):
+        order = Manager.create_cost_module_graph().execution_order()
+        self.assertEqual(order[-2:], ['project_totals', 'management'])
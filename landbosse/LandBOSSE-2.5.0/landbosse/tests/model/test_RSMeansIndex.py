@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from landbosse.model import RSMeansIndex
+
+
+class TestRSMeansIndex(TestCase):
+    def setUp(self):
+        RSMeansIndex._cache = {}
+        self.rsmeans = pd.DataFrame({
+            'Operation ID': ['Excavation', 'Excavation', 'Survey', 'Backfill', 'Trenching', 'Trenching', 'Notes only'],
+            'Type of cost': ['Labor', 'Equipment rental', 'Labor', 'Labor', 'Labor', 'Equipment rental', np.nan],
+            'Material type ID': ['Excavate', 'Excavate', np.nan, 'Backfill', np.nan, np.nan, np.nan],
+            'Units': ['cubic yards', 'cubic yards', np.nan, 'cubic yards', 'Mile', 'Mile', np.nan],
+            'Daily output': [500.0, 500.0, 1.0, 700.0, 0.5, 0.5, np.nan],
+            'Module': ['Roads', 'Roads', 'Roads', 'Foundations', 'Collection', 'Collection', 'Roads'],
+            'Number of workers': [3, 3, 2, 4, 6, 6, 0],
+            'Rate USD per unit': [2.5, 1.5, 900.0, 3.0, 8000.0, 4000.0, np.nan],
+        })
+        self.rsmeans.index = [10, 11, 12, 13, 14, 15, 16]
+        self.index = RSMeansIndex.for_rsmeans(self.rsmeans)
+
+    def test_operations_match_where_dropna(self):
+        for module in ['Roads', 'Foundations', 'Collection', 'Small DW Roads']:
+            expected = self.rsmeans.where(self.rsmeans['Module'] == module).dropna(thresh=4)
+            assert_frame_equal(self.index.operations(self.rsmeans, module), expected, check_exact=True)
+
+    def test_rows_match_boolean_mask(self):
+        for module in ['Roads', 'Collection', 'Small DW Collection']:
+            expected = self.rsmeans[self.rsmeans['Module'] == module]
+            assert_frame_equal(self.index.rows(self.rsmeans, module), expected, check_exact=True)
+
+    def test_unique(self):
+        expected = self.rsmeans['Material type ID'].where(self.rsmeans['Module'] == 'Roads').dropna().unique()
+        np.testing.assert_array_equal(self.index.unique(self.rsmeans, 'Roads', 'Material type ID'), expected)
+
+    def test_gathers_from_a_copy_with_new_rates(self):
+        labor_rates = self.rsmeans.copy()
+        labor_rates['Rate USD per unit'] = labor_rates['Rate USD per unit'] * 2
+        expected = labor_rates.where(labor_rates['Module'] == 'Roads').dropna(thresh=4)
+        assert_frame_equal(self.index.operations(labor_rates, 'Roads'), expected, check_exact=True)
+
+    def test_sheets_with_other_rows_raise(self):
+        with self.assertRaises(ValueError):
+            self.index.operations(self.rsmeans.iloc[:3], 'Roads')
+
+    def test_cache_and_input_dict(self):
+        self.assertIs(RSMeansIndex.for_rsmeans(self.rsmeans), self.index)
+        self.assertIs(RSMeansIndex.from_input_dict({'rsmeans': self.rsmeans}), self.index)
+        other = RSMeansIndex(self.rsmeans)
+        self.assertIs(RSMeansIndex.from_input_dict({'rsmeans': self.rsmeans, 'rsmeans_index': other}), other)
@@ -0,0 +1,63 @@
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import ResultCache
+
+
+class TestResultCache(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.result_cache = ResultCache(self.temporary_directory.name)
+        self.input_dict = {
+            'num_turbines': 10,
+            'turbine_rating_MW': 2.0,
+            'season_construct': ['spring', 'summer'],
+            'hour_day': {'normal': 10, 'long': 24},
+            'crew_price': pd.DataFrame({'Labor type ID': ['Rigger'], 'Hourly rate USD per hour': [80.0]}),
+            'Lift height m': np.array([30.0, 60.0]),
+        }
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_equal_inputs_have_equal_keys(self):
+        other_input_dict = dict(self.input_dict)
+        other_input_dict['num_turbines'] = np.float64(10)
+        other_input_dict['crew_price'] = self.input_dict['crew_price'].copy()
+        self.assertEqual(self.result_cache.key(self.input_dict, 'a'), self.result_cache.key(other_input_dict, 'a'))
+
+    def test_changes_change_the_key(self):
+        key = self.result_cache.key(self.input_dict, 'a')
+        self.assertNotEqual(key, self.result_cache.key(self.input_dict, 'b'))
+
+        other_input_dict = dict(self.input_dict)
+        other_input_dict['crew_price'] = self.input_dict['crew_price'].copy()
+        other_input_dict['crew_price'].loc[0, 'Hourly rate USD per hour'] = 81.0
+        self.assertNotEqual(key, self.result_cache.key(other_input_dict, 'a'))
+
+        other_input_dict = dict(self.input_dict)
+        other_input_dict['hour_day'] = {'normal': 12, 'long': 24}
+        self.assertNotEqual(key, self.result_cache.key(other_input_dict, 'a'))
+
+    def test_undigestable_input_has_no_key(self):
+        self.input_dict['callback'] = lambda: None
+        self.assertIsNone(self.result_cache.key(self.input_dict, 'a'))
+
+    def test_put_and_get_rows(self):
+        key = self.result_cache.key(self.input_dict, 'a')
+        self.assertIsNone(self.result_cache.get(key))
+
+        output_dict = {
+            'erection_module_type_operation': [{'project_id_with_serial': 'a', 'cost_per_project': 1.0}],
+            'erection_cost_csv': [{'project_id_with_serial': 'a', 'value': 2.0}],
+            'total_erection_cost': pd.DataFrame({'Cost USD': [1.0]}),
+        }
+        self.result_cache.put(key, output_dict)
+
+        rows = ResultCache(self.temporary_directory.name).get(key)
+        self.assertEqual(set(rows.keys()), {'erection_module_type_operation', 'erection_cost_csv'})
+        self.assertEqual(rows['erection_cost_csv'], output_dict['erection_cost_csv'])
+        self.assertEqual((self.result_cache.hits, self.result_cache.misses), (0, 1))
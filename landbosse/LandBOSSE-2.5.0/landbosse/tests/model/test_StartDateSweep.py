@@ -0,0 +1,114 @@
+import os
+from unittest import TestCase, mock
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import XlsxDataframeCache, XlsxReader
+from landbosse.model import Manager, StartDateSweep, WeatherDelay, WeatherIndex
+
+
+project_input_template = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'project_input_template')
+
+
+class TestStartDateSweep(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        wind_speeds_m_s = rng.gamma(2, 3, 3000).astype(np.float32)
+        self.input_dict = {
+            'hour_day': {'normal': 10, 'long': 24},
+            'time_construct': 'normal',
+            'weather_window': pd.DataFrame({'Speed m per s': wind_speeds_m_s[:1000]}),
+            'weather_index': WeatherIndex(wind_speeds_m_s),
+            'critical_speed_non_erection_wind_delays_m_per_s': 11.0,
+            'critical_height_non_erection_wind_delays_m': 80.0,
+            'wind_shear_exponent': 0.2,
+            'project_value_usd': 1e7,
+        }
+
+        def costs(labor, equipment):
+            return pd.DataFrame({'Type of cost': ['Labor', 'Equipment rental', 'Materials'],
+                                 'Cost USD': [labor, equipment, 5e5]})
+
+        self.output_dict = {
+            'foundation_wind_delay_mission_hours': 600.0,
+            'foundation_wind_delay_construct_days': 60.0,
+            'siteprep_wind_delay_mission_hours': 450.0,
+            'siteprep_wind_delay_construct_days': 45.0,
+            'collection_wind_delay_mission_hours': 900,
+            'collection_wind_delay_construct_days': 80.0,
+            'total_foundation_cost': costs(1e6, 2e5),
+            'total_road_cost': costs(3e5, 1e5),
+            'total_collection_cost': costs(4e5, 1e5),
+        }
+        self.sweep = StartDateSweep(self.input_dict, self.output_dict)
+
+    def test_delays_match_weather_delay(self):
+        result = self.sweep.run()
+        self.assertEqual(list(result['Start hour'][:3]), [0, 10, 20])
+        full_window = pd.DataFrame({'Speed m per s': self.input_dict['weather_index'].wind_speeds_m_s})
+        for label in self.sweep.swept_modules:
+            mission_time_hours = self.sweep.mission_time_hours(label)
+            for start_hour in [0, 10, 500, int(result['Start hour'].iloc[-1])]:
+                output_dict = dict()
+                WeatherDelay({
+                    'weather_window': full_window,
+                    'start_delay_hours': start_hour,
+                    'mission_time_hours': start_hour + mission_time_hours,
+                    'critical_wind_speed_m_per_s': 11.0,
+                    'wind_height_of_interest_m': 80.0,
+                    'wind_shear_exponent': 0.2,
+                }, output_dict)
+                expected = sum(10 if delay > 4 else delay for delay in output_dict['wind_delays'])
+                row = result[result['Start hour'] == start_hour].iloc[0]
+                self.assertEqual(row[f'{label} wind delay hours'], expected)
+
+    def test_costs_at_first_hour_are_unchanged(self):
+        result = self.sweep.run()
+        first = result.iloc[0]
+        self.assertAlmostEqual(first['Foundation labor and equipment cost USD'], 1.2e6)
+        self.assertAlmostEqual(first['Roads labor and equipment cost USD'], 4e5)
+        self.assertAlmostEqual(first['Project value USD'], 1e7)
+        self.assertGreater(result['Project value USD'].max(), result['Project value USD'].min())
+
+    def test_starts_fit_in_weather_window(self):
+        start_hours = self.sweep.start_hours(step_hours=1)
+        self.assertEqual(start_hours[-1], 3000 - 900)
+
+
+class TestStartDateSweepOfProject(TestCase):
+    """
+    At the first hour, the sweep must reproduce the wind multiplier of each
+    module of a project run by Manager.
+    """
+
+    def setUp(self):
+        XlsxDataframeCache._cache = {}
+        argv = ['main.py', '--input', project_input_template]
+        self.patches = [mock.patch('sys.argv', argv), mock.patch.dict(os.environ, {}, clear=True)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        XlsxDataframeCache._cache = {}
+
+    def test_first_hour_matches_modules(self):
+        xlsx_reader = XlsxReader()
+        project_list = pd.read_excel(os.path.join(project_input_template, 'project_list.xlsx'))
+        project_parameters = project_list[project_list['Project ID'] == 'foundation_validation_ge15'].iloc[0]
+        project_parameters = project_parameters.astype(object)
+
+        # A low critical wind speed, so that every module has wind delays.
+        project_parameters['Non-Erection Wind Delay Critical Speed (m/s)'] = 7.0
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_parameters['Project data file'])
+        master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
+        output_dict = dict()
+        Manager(input_dict=master_input_dict, output_dict=output_dict).execute_landbosse(project_name='sweep')
+
+        sweep = StartDateSweep(master_input_dict, output_dict)
+        for label, (prefix, _) in sweep.swept_modules.items():
+            _, _, wind_multiplier = sweep.wind_multipliers(label, np.zeros(1, dtype=np.int64))
+            self.assertGreater(output_dict[f'{prefix}_wind_multiplier'], 1, label)
+            self.assertAlmostEqual(wind_multiplier[0], output_dict[f'{prefix}_wind_multiplier'], places=12, msg=label)
@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+import numpy as np
+
+from landbosse.model import WeatherIndex
+
+
+def scan_wind_delays(wind_delays):
+    """
+    Counts the delays like the loop WeatherDelay used to run: contiguous
+    blocks of delay hours, without the block still going on at the end.
+    """
+    durations = []
+    current = 0
+    for wind_delay in wind_delays:
+        if wind_delay:
+            current += 1
+        elif current > 0:
+            durations.append(current)
+            current = 0
+    return durations if np.any(wind_delays) else [0]
+
+
+class TestWeatherIndex(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.wind_speeds_m_s = rng.gamma(2, 3, 2000).astype(np.float32)
+        self.wind_speeds_m_s[[5, 600]] = np.nan
+        self.index = WeatherIndex(self.wind_speeds_m_s)
+
+    def delay_hours(self, cutoff, start, stop):
+        """
+        Totals the wind delays of one range of hours with
+        delay_hours_of_runs()
+        """
+        charged_hours, long_delays = WeatherIndex.delay_hours_of_runs(self.index.runs(cutoff), [start], [stop])
+        return int(charged_hours[0]), int(long_delays[0])
+
+    def test_cutoff_matches_scaled_comparison(self):
+        for critical_wind_speed in [0.0, 5.5, 9.0, 12.25, 100.0]:
+            for height, shear in [(100, 0.2), (87.5, 0.14), (140.0, np.float64(0.25))]:
+                cutoff = self.index.cutoff(critical_wind_speed, height, shear)
+                expected = self.wind_speeds_m_s * (height / 100) ** shear > critical_wind_speed
+                np.testing.assert_array_equal(self.index.delay_mask(cutoff), expected)
+
+    def test_cutoff_of_scaling_that_cannot_be_searched(self):
+        self.assertIsNone(self.index.cutoff(10.0, 0.0, 0.2))
+
+    def test_wind_delays_match_scan(self):
+        cutoff = self.index.cutoff(9.0, 90.0, 0.2)
+        mask = self.index.delay_mask(cutoff)
+        for start, stop in [(1, 2000), (1, 1500), (37, 38), (250, 251), (300, 200), (0, 0)]:
+            expected = scan_wind_delays(mask[start:stop])
+            self.assertEqual(self.index.wind_delays(cutoff, start, stop), expected)
+
+            charged_hours = sum(10 if duration > 4 else duration for duration in expected)
+            long_delays = sum(1 for duration in expected if duration > 4)
+            self.assertEqual(self.delay_hours(cutoff, start, stop), (charged_hours, long_delays))
+
+    def test_no_delays(self):
+        cutoff = self.index.cutoff(1000.0, 100, 0.2)
+        self.assertEqual(cutoff, len(self.index.sorted_speeds))
+        self.assertEqual(self.index.wind_delays(cutoff, 1, 2000), [0])
+        self.assertEqual(self.delay_hours(cutoff, 1, 2000), (0, 0))
+
+    def test_content_digest(self):
+        self.assertEqual(self.index.content_digest(), WeatherIndex(self.wind_speeds_m_s.copy()).content_digest())
+        self.assertNotEqual(self.index.content_digest(),
+                            WeatherIndex(self.wind_speeds_m_s.astype(np.float64)).content_digest())
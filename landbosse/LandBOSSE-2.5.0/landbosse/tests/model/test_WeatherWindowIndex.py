@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from landbosse.model import WeatherWindowIndex
+
+
+class TestWeatherWindowIndex(TestCase):
+    def setUp(self):
+        WeatherWindowIndex._cache = {}
+        num_rows = 500
+        seasons = np.array(['winter', 'spring', 'summer', 'fall'], dtype=object)
+        self.weather_window = pd.DataFrame({
+            'Hour': np.arange(num_rows) % 24,
+            'Speed m per s': np.linspace(0, 20, num_rows).astype(np.float32),
+            'Time window': np.where(np.arange(num_rows) % 24 < 12, 'normal', 'long').astype(object),
+            'Season': seasons[(np.arange(num_rows) // 50) % 4],
+        })
+        self.weather_window.index = np.arange(num_rows) + 7
+
+    def expected(self, season_construct, time_construct, num_hours):
+        weather_window = self.weather_window
+        mask = (weather_window['Season'].isin(season_construct)) & (weather_window['Time window'] == time_construct)
+        return weather_window.loc[mask][0:num_hours]
+
+    def test_filter_matches_boolean_mask(self):
+        index = WeatherWindowIndex.for_weather_window(self.weather_window)
+        for season_construct in [['spring'], ['spring', 'summer'], ['winter', 'spring', 'summer', 'fall'], []]:
+            for time_construct in ['normal', 'long']:
+                for num_hours in [0, 10, 100, 1000]:
+                    assert_frame_equal(index.filter(season_construct, time_construct, num_hours),
+                                       self.expected(season_construct, time_construct, num_hours),
+                                       check_exact=True)
+
+    def test_positions_are_shared(self):
+        index = WeatherWindowIndex.for_weather_window(self.weather_window)
+        self.assertIs(WeatherWindowIndex.for_weather_window(self.weather_window), index)
+        positions = index.season_positions(['spring', 'summer'], 'normal')
+        self.assertIs(index.season_positions(('spring', 'summer'), 'normal'), positions)
+        self.assertIsNot(WeatherWindowIndex.for_weather_window(self.weather_window.copy()), index)
+
+    def test_weather_index_holds_filtered_wind_speeds(self):
+        index = WeatherWindowIndex.for_weather_window(self.weather_window)
+        weather_index = index.weather_index(['spring', 'summer'], 'long')
+        self.assertIs(index.weather_index(['spring', 'summer'], 'long'), weather_index)
+        filtered = index.filter(['spring', 'summer'], 'long', 40)
+        np.testing.assert_array_equal(weather_index.wind_speeds_m_s[:40], filtered['Speed m per s'].to_numpy())
+        self.assertEqual(weather_index.wind_speeds_m_s.dtype, np.float32)
@@ -7,7 +7,6 @@ from landbosse.excelio import XlsxSerialManagerRunner
 from landbosse.excelio import XlsxParallelManagerRunner
 from landbosse.excelio import XlsxGenerator
 from landbosse.excelio import XlsxValidator
-from landbosse.excelio import CsvGenerator
 
 # LandBOSSE, small utility functions
 from landbosse.excelio import XlsxFileOperations
@@ -77,7 +76,7 @@ if __name__ == '__main__':
     print('Writing final output folder')
 
     max_number_of_excel_rows = 1048576
-    if len(final_result['details_list']) > max_number_of_excel_rows:
+    if final_result['details_row_count'] > max_number_of_excel_rows:
         print('WARNING: Details sheet in .xlsx has too many rows for Excel. Please use landbosse-details.csv instead.')
         print('Writing .xlsx file for backwards compatability.')
 
@@ -85,15 +84,8 @@ if __name__ == '__main__':
         xlsx.tab_costs_by_module_type_operation(rows=final_result['module_type_operation_list'])
     file_ops.copy_input_data()
 
-    # Always write .csv versions of the output
-    csv_generator = CsvGenerator(file_ops)
-
-    costs = csv_generator.create_costs_dataframe(final_result['module_type_operation_list'])
-    details = csv_generator.create_details_dataframe(final_result['details_list'])
-    costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
-    details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
-    costs.to_csv(costs_csv_filename, index=False)
-    details.to_csv(details_csv_filename, index=False)
+    # The runners have already written the .csv versions of the output,
+    # landbosse-costs.csv and landbosse-details.csv, as each project finished.
 
     # Print end timestamp
     print(f'>>>>>>>> End run {datetime.now()} <<<<<<<<<<')
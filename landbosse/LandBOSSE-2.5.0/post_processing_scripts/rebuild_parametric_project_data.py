@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pandas as pd
+
+from landbosse.excelio import XlsxDataframeCache
+from landbosse.excelio import XlsxGenerator
+from landbosse.excelio import XlsxReader
+
+# Rebuilds the parametrically modified project data .xlsx of one project
+# from a run with --project-data-export deltas. Usage:
+#
+# python rebuild_parametric_project_data.py [deltas csv] [project data dir] [project ID with serial] [output xlsx]
+#
+# [deltas csv] is calculated_parametric_inputs/parametric_project_data_deltas.csv
+# in the output folder of the run. [project data dir] is the folder with the
+# unmodified project data .xlsx files, such as the inputs/project_data folder
+# in the output folder of the run.
+
+if len(sys.argv) != 5:
+    print("Usage: python rebuild_parametric_project_data.py [deltas csv] [project data dir] [project ID with serial] [output xlsx]")
+    exit(1)
+
+deltas_path, project_data_path, project_id_with_serial, output_xlsx = sys.argv[1:]
+
+print("Reading deltas...")
+deltas = pd.read_csv(deltas_path, dtype={'Value': object})
+project_deltas = deltas[deltas['Project ID with serial'] == project_id_with_serial]
+
+# Projects without any modification of the project data have no rows in the
+# deltas, so the project data file cannot be found from them.
+if len(project_deltas) == 0:
+    print(f"{project_id_with_serial} has no project data modifications. Its project data is the unmodified project data file.")
+    exit(1)
+
+project_data_basename = project_deltas['Project data file'].iloc[0]
+print(f"Reading {project_data_basename}...")
+project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename, project_data_path)
+
+print(f"Applying {len(project_deltas)} modifications...")
+XlsxReader().apply_parametric_project_data_deltas(project_data_sheets, project_deltas)
+
+print(f"Writing {os.path.abspath(output_xlsx)}...")
+XlsxGenerator.write_project_data(project_data_sheets, output_xlsx)
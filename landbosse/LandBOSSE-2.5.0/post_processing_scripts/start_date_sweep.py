@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pandas as pd
+
+from landbosse.excelio import XlsxDataframeCache
+from landbosse.excelio import XlsxReader
+from landbosse.model import Manager
+from landbosse.model import StartDateSweep
+
+# Runs each project of an input folder and sweeps the start date of its
+# construction with StartDateSweep. Usage:
+#
+# python start_date_sweep.py [input dir] [output dir] [step hours]
+#
+# [input dir] is a folder with project_list.xlsx and the project_data folder,
+# as given to main.py with --input. Projects of the Parametric list are swept
+# too, but the cost and scaling modifications of --scaling are not applied.
+# [step hours] is optional and defaults to one start per day of construction.
+#
+# Two files are written to [output dir]. start_date_sweep.csv has one row for
+# each project and start. start_date_sweep_summary.csv has the distribution of
+# each column over the starts of each project, as given by describe().
+
+if len(sys.argv) not in [3, 4]:
+    print("Usage: python start_date_sweep.py [input dir] [output dir] [step hours]")
+    exit(1)
+
+input_path, output_path = sys.argv[1:3]
+step_hours = int(sys.argv[3]) if len(sys.argv) == 4 else None
+
+print("Reading project list...")
+sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('project_list', input_path)
+if len(sheets) == 1:
+    project_list = list(sheets.values())[0]
+    parametric_list = pd.DataFrame()
+else:
+    project_list = sheets['Project list']
+    parametric_list = sheets['Parametric list']
+
+xlsx_reader = XlsxReader()
+sweeps = []
+summaries = []
+for project_parameters in xlsx_reader.generate_extended_project_list(project_list, parametric_list):
+    if pd.isnull(project_parameters['Project ID with serial']):
+        project_id_with_serial = project_parameters['Project ID']
+    else:
+        project_id_with_serial = project_parameters['Project ID with serial']
+
+    print(f"Running {project_id_with_serial}...")
+    project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_parameters['Project data file'],
+                                                                       os.path.join(input_path, 'project_data'))
+    xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_parameters)
+    master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
+    output_dict = dict()
+    Manager(input_dict=master_input_dict, output_dict=output_dict).execute_landbosse(project_name=project_id_with_serial)
+
+    # A project whose modules failed has no costs to sweep.
+    if any(key not in output_dict for key in StartDateSweep.required_output_keys()):
+        print(f"{project_id_with_serial} did not run, so it is not swept.")
+        continue
+
+    sweep = StartDateSweep(master_input_dict, output_dict)
+    result = sweep.run(sweep.start_hours(step_hours))
+    result.insert(0, 'Project ID with serial', project_id_with_serial)
+    sweeps.append(result)
+
+    summary = result.drop(columns=['Project ID with serial']).describe().transpose()
+    summary = summary.rename_axis('Column').reset_index()
+    summary.insert(0, 'Project ID with serial', project_id_with_serial)
+    summaries.append(summary)
+
+if len(sweeps) == 0:
+    print("No project could be swept.")
+    exit(1)
+
+os.makedirs(output_path, exist_ok=True)
+sweep_csv = os.path.join(output_path, 'start_date_sweep.csv')
+summary_csv = os.path.join(output_path, 'start_date_sweep_summary.csv')
+
+print(f"Writing {os.path.abspath(sweep_csv)}...")
+pd.concat(sweeps, ignore_index=True).to_csv(sweep_csv, index=False)
+
+print(f"Writing {os.path.abspath(summary_csv)}...")
+pd.concat(summaries, ignore_index=True).to_csv(summary_csv, index=False)